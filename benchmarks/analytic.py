@@ -0,0 +1,76 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Compares the construction of `Disk` and `Hemisphere` tessellations with the
+closed-form solver of the rings and with the recurrence.
+
+Run as
+
+    python benchmarks/analytic.py [N ...] [--aspect ASPECT] [--repeats REPEATS]
+
+to print, for every number of patches N, the number of rings and the best
+construction time over the repeats with `analytic=True` and with
+`analytic=False`, along with the speedup of the closed-form solver. Both give
+the same tessellation, which is checked as well.
+
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from spheal.disk import Disk
+from spheal.hemisphere import Hemisphere
+
+
+def _time(cls, N, patch_aspect, analytic, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        tessellation = cls(1.0, N, patch_aspect, analytic=analytic)
+        times.append(time.perf_counter() - start)
+    return min(times), tessellation
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("N",
+                        nargs="*",
+                        type=int,
+                        default=[10**4, 10**5, 10**6, 10**7],
+                        help="Numbers of patches.")
+    parser.add_argument("--aspect",
+                        type=float,
+                        default=1.0,
+                        help="Aspect ratio of the patches.")
+    parser.add_argument("--repeats",
+                        type=int,
+                        default=3,
+                        help="Number of constructions per measurement.")
+    args = parser.parse_args()
+
+    header = "{:>10} {:>12} {:>8} {:>14} {:>14} {:>9}".format(
+        "N", "tessellation", "rings", "analytic [s]", "iterative [s]",
+        "speedup")
+    print(header)
+    print("-" * len(header))
+
+    for N in args.N:
+        for cls in (Disk, Hemisphere):
+            analytic, closed_form = _time(cls, N, args.aspect, True,
+                                          args.repeats)
+            iterative, recurrence = _time(cls, N, args.aspect, False,
+                                          args.repeats)
+            if not (np.array_equal(closed_form.numbers, recurrence.numbers)
+                    and np.array_equal(closed_form.outer, recurrence.outer)):
+                msg = ("The closed-form and iterative " + cls.__name__ +
+                       " differ with " + str(N) + " patches.")
+                raise RuntimeError(msg)
+            print("{:>10} {:>12} {:>8} {:>14.4e} {:>14.4e} {:>9.2f}".format(
+                N, cls.__name__, closed_form.numbers.size, analytic, iterative,
+                iterative / analytic))
+
+
+if __name__ == "__main__":
+    main()
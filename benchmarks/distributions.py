@@ -0,0 +1,84 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Compares the distributions of `spheal.distributions` by the time taken to
+generate them and by the quality of the resulting points.
+
+Run as
+
+    python benchmarks/distributions.py [N ...] [--seed SEED]
+
+to print, for every number of points N, the generation time, the minimum
+separation and the mean nearest-neighbor distance (both in units of the
+side of a square patch of area 4 pi / N), the estimated Riesz 1-energy
+relative to the one of the continuous uniform distribution, N^2, and the
+estimated spherical cap discrepancy.
+
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from spheal import distributions
+from spheal.distributions import metrics
+
+
+def _distributions(N, rng):
+    return {
+        "GeneralizedSpiral":
+        lambda: distributions.GeneralizedSpiral(N),
+        "FibonacciLattice":
+        lambda: distributions.FibonacciLattice(N),
+        "RandomizedFibonacciLattice":
+        lambda: distributions.RandomizedFibonacciLattice(N, rng),
+        "PatchCenters":
+        lambda: distributions.PatchCenters(N),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("N",
+                        nargs="*",
+                        type=int,
+                        default=[10**3, 10**4, 10**5, 10**6],
+                        help="Numbers of points.")
+    parser.add_argument("--seed",
+                        type=int,
+                        default=0,
+                        help="Seed of the random number generator.")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    header = "{:>10} {:>28} {:>10} {:>10} {:>10} {:>12} {:>12}".format(
+        "N", "distribution", "time [s]", "min sep", "mean nn", "energy - 1",
+        "discrepancy")
+    print(header)
+    print("-" * len(header))
+
+    for N in args.N:
+        spacing = np.sqrt(4.0 * np.pi / N)
+        centers = rng.normal(size=(16, 3))
+        centers /= np.sqrt(np.sum(centers**2, axis=1))[:, np.newaxis]
+
+        for name, generate in _distributions(N, rng).items():
+            start = time.perf_counter()
+            dis = generate()
+            elapsed = time.perf_counter() - start
+
+            distances = np.empty(N)
+            metrics.nearest_neighbor_distances(distances, dis.theta, dis.phi)
+            energy = metrics.riesz_energy(dis.theta, dis.phi) / N**2
+            discrepancy = metrics.cap_discrepancy(dis.theta, dis.phi, centers)
+
+            print("{:>10} {:>28} {:>10.4f} {:>10.4f} {:>10.4f} {:>12.4e} "
+                  "{:>12.4e}".format(N, name, elapsed,
+                                     np.min(distances) / spacing,
+                                     np.mean(distances) / spacing,
+                                     energy - 1.0, discrepancy))
+
+
+if __name__ == "__main__":
+    main()
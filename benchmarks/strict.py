@@ -0,0 +1,73 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Compares the construction of `Disk` and `Hemisphere` tessellations with and
+without `strict=True`.
+
+Run as
+
+    python benchmarks/strict.py [N ...] [--samples SAMPLES] [--seed SEED]
+
+to print, for every number of patches N, the mean construction time of the
+closed-form tessellations over random aspect ratios in [0.1, 50], with and
+without strict mode, and the fraction of plain tessellations containing rings
+without patches, which strict mode corrects.
+
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+
+from spheal.disk import Disk
+from spheal.hemisphere import Hemisphere
+
+
+def _time(cls, N, aspects, strict):
+    invalid = 0
+    start = time.perf_counter()
+    for patch_aspect in aspects:
+        tessellation = cls(1.0, N, patch_aspect, analytic=True, strict=strict)
+        invalid += np.any(tessellation.numbers < 1)
+    return (time.perf_counter() - start) / aspects.size, invalid / aspects.size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("N",
+                        nargs="*",
+                        type=int,
+                        default=[10**2, 10**3, 10**4, 10**5],
+                        help="Numbers of patches.")
+    parser.add_argument("--samples",
+                        type=int,
+                        default=32,
+                        help="Number of aspect ratios per number of patches.")
+    parser.add_argument("--seed",
+                        type=int,
+                        default=0,
+                        help="Seed of the random number generator.")
+    args = parser.parse_args()
+
+    # Plain tessellations with rings past the center warn about them.
+    warnings.simplefilter("ignore", RuntimeWarning)
+
+    rng = np.random.default_rng(args.seed)
+    header = "{:>10} {:>12} {:>14} {:>14} {:>10}".format(
+        "N", "tessellation", "plain [s]", "strict [s]", "invalid")
+    print(header)
+    print("-" * len(header))
+
+    for N in args.N:
+        aspects = np.exp(rng.uniform(np.log(0.1), np.log(50.0), args.samples))
+        for cls in (Disk, Hemisphere):
+            plain, invalid = _time(cls, N, aspects, False)
+            strict, _ = _time(cls, N, aspects, True)
+            print("{:>10} {:>12} {:>14.4e} {:>14.4e} {:>10.2f}".format(
+                N, cls.__name__, plain, strict, invalid))
+
+
+if __name__ == "__main__":
+    main()
@@ -20,5 +20,6 @@ setup(
     ],
     keywords='spherical',
     packages=find_packages(),
+    entry_points={'console_scripts': ['spheal=spheal.cli:main']},
     install_requires=['matplotlib>=3.6.0', 'numpy>=1.23.0'],
     python_requires='>=3.10')
@@ -4,12 +4,24 @@
 Imports the classes related to spherical elements and algorithms.
 
 - `Annulus`
+- `CSRMatrix`
 - `Disk`
 - `Hemisphere`
+- `Hierarchy`
+- `OrientedHemispheres`
+- `ParticleIndex`
+- `PatchQuadrature`
+- `PatchSampler`
+- `Remapper`
+- `SharedTessellation`
 - `Zone`
 
 It also imports functions related to vector algebra in Euclidean geometry via
-the module `euclidean`.
+the module `euclidean`, and functions controlling the floating-point type of
+computed arrays via the module `precision`. Coroutines building tessellations
+and distributions without blocking an event loop are defined in the module
+`aio`, and the closed-form solid angles and view factors of the patches of a
+hemisphere in the module `integration`.
 
 """
 
@@ -17,4 +29,13 @@ from .annulus import Annulus
 from .disk import Disk
 from .euclidean import *
 from .hemisphere import Hemisphere
+from .hierarchy import Hierarchy
+from .index import ParticleIndex
+from .integration import PatchQuadrature
+from .oriented import OrientedHemispheres
+from .precision import *
+from .remap import Remapper
+from .sampling import PatchSampler
+from .shared import SharedTessellation
+from .sparse import CSRMatrix
 from .zone import Zone
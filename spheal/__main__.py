@@ -0,0 +1,12 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Runs the `spheal` command as `python -m spheal`.
+
+"""
+
+import sys
+
+from spheal.cli import main
+
+sys.exit(main())
@@ -0,0 +1,186 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines the following coroutines, which build tessellations and distributions
+in an executor so that they do not block the running event loop:
+
+- `disk(radius, n_patches, patch_aspect, executor=None, **kwargs)`
+  Builds a `Disk`.
+
+- `hemisphere(radius, n_patches, patch_aspect, executor=None, **kwargs)`
+  Builds a `Hemisphere`.
+
+- `distribution(cls, N, executor=None, **kwargs)`
+  Builds a distribution of `spheal.distributions`.
+
+- `run(func, *args, executor=None, **kwargs)`
+  Calls any function.
+
+Concurrent calls with the same arguments, which should be hashable, share a
+single computation and receive the same object, so the result should be
+treated as read-only. Once the computation finishes, a new call starts a new
+one.
+
+It also defines the following asynchronous generators, which yield a large
+result in chunks and let other tasks run in between:
+
+- `stream_angles(dis, chunk=2**16)`
+  Yields the angles of a distribution.
+
+- `stream_points(dis, r=1.0, chunk=2**16, executor=None)`
+  Yields the Cartesian coordinates of a distribution.
+
+"""
+
+import asyncio
+import functools
+
+import numpy as np
+
+from spheal.disk import Disk
+from spheal.euclidean import cartesian_from_spherical
+from spheal.hemisphere import Hemisphere
+
+# The computations in progress, by event loop and arguments.
+_pending = {}
+
+
+async def run(func, *args, executor=None, **kwargs):
+    """
+    Call a function in an executor, sharing the computation with concurrent
+    calls with the same arguments.
+
+    Parameters
+    ----------
+
+    `func` : callable
+    The function to call.
+
+    `args`, `kwargs`
+    The hashable arguments of the function.
+
+    `executor` : concurrent.futures.Executor (optional, default: None)
+    The executor to run the function in. If not given, the default executor of
+    the event loop is used.
+
+    Returns
+    -------
+
+    The result of the function.
+
+    """
+    loop = asyncio.get_running_loop()
+    key = (loop, func, args, tuple(sorted(kwargs.items())))
+
+    future = _pending.get(key)
+    if future is None:
+        future = loop.run_in_executor(executor,
+                                      functools.partial(func, *args, **kwargs))
+        _pending[key] = future
+        future.add_done_callback(lambda _: _pending.pop(key, None))
+
+    # A cancelled caller should not cancel the computation for the others.
+    return await asyncio.shield(future)
+
+
+async def disk(radius, n_patches, patch_aspect, executor=None, **kwargs):
+    """
+    Build a `Disk` in an executor. The arguments are the ones of `Disk`, and
+    `executor` is the one of `run`.
+
+    """
+    return await run(Disk,
+                     radius,
+                     n_patches,
+                     patch_aspect,
+                     executor=executor,
+                     **kwargs)
+
+
+async def hemisphere(radius, n_patches, patch_aspect, executor=None, **kwargs):
+    """
+    Build a `Hemisphere` in an executor. The arguments are the ones of
+    `Hemisphere`, and `executor` is the one of `run`.
+
+    """
+    return await run(Hemisphere,
+                     radius,
+                     n_patches,
+                     patch_aspect,
+                     executor=executor,
+                     **kwargs)
+
+
+async def distribution(cls, N, executor=None, **kwargs):
+    """
+    Build a distribution in an executor. `cls` is a class of
+    `spheal.distributions`, the other arguments are the ones of `cls`, and
+    `executor` is the one of `run`.
+
+    """
+    return await run(cls, N, executor=executor, **kwargs)
+
+
+async def stream_angles(dis, chunk=2**16):
+    """
+    Yield the angles of a distribution in chunks.
+
+    Parameters
+    ----------
+
+    `dis` : spheal.distributions.Distribution
+    The distribution.
+
+    `chunk` : int (optional, default: 2**16)
+    The number of particles in every chunk.
+
+    Yields
+    ------
+
+    `theta, phi` : ndarray, ndarray
+    Views of the angles of consecutive particles.
+
+    """
+    for first in range(0, dis.N, chunk):
+        last = first + chunk
+        yield dis.theta[first:last], dis.phi[first:last]
+        await asyncio.sleep(0)
+
+
+async def stream_points(dis, r=1.0, chunk=2**16, executor=None):
+    """
+    Yield the Cartesian coordinates of a distribution in chunks, computed in
+    an executor.
+
+    Parameters
+    ----------
+
+    `dis` : spheal.distributions.Distribution
+    The distribution.
+
+    `r` : float (optional, default: 1.0)
+    The radius of the sphere the particles lie on.
+
+    `chunk` : int (optional, default: 2**16)
+    The number of particles in every chunk.
+
+    `executor` : concurrent.futures.Executor (optional, default: None)
+    The executor to compute the coordinates in. If not given, the default
+    executor of the event loop is used.
+
+    Yields
+    ------
+
+    `coords` : ndarray(chunk, 3)
+    The `x, y, z` coordinates of consecutive particles.
+
+    """
+    loop = asyncio.get_running_loop()
+
+    def compute(theta, phi):
+        coords = np.empty((theta.size, 3), dtype=theta.dtype)
+        cartesian_from_spherical(coords, np.full(theta.size, r), theta, phi)
+        return coords
+
+    async for theta, phi in stream_angles(dis, chunk):
+        yield await loop.run_in_executor(executor, compute, theta, phi)
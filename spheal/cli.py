@@ -0,0 +1,267 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines the `spheal` command, which generates tessellations, distributions and
+particle clouds for every configuration of a parameter file.
+
+The parameter file is a JSON list of configurations, or an object with a list
+`jobs` of configurations and an object `defaults` completing each of them.
+Every configuration has a `kind`, an optional `name` for its output file and
+the arguments below.
+
+- `disk` and `hemisphere`: `radius`, `n_patches`, `patch_aspect` and,
+  optionally, `analytic` and `dtype`. The output `<name>.npz` holds the arrays
+  `inner`, `outer`, `numbers` and `offsets` of the rings, from the outermost
+  one inwards.
+
+- `distribution`: `distribution`, the name of a class of
+  `spheal.distributions`, `N` and, optionally, `dtype` and the other arguments
+  of the class. Other entries, such as defaults meant for other kinds, are
+  ignored. The output `<name>.npz` holds the arrays `theta` and `phi`.
+
+- `cloud`: `N`, `profile`, the name of a class of `spheal.radial` or an object
+  with its `name` and arguments, and either `shells` or `spacing`, as in
+  `shell.radii` and `shell.spaced_radii`. Optionally, `distribution` (default:
+  `FibonacciLattice`), `dtype` and `seed`. The particles of every shell lie at
+  the radius enclosing the median particle of the shell. With a `seed`, every
+  shell is rotated at random as described in `distributions.randomization`.
+  The output `<name>.npy` holds their `x, y, z` coordinates, written shell by
+  shell to a memory-mapped file, and `<name>.shells.npy` the number of
+  particles of every shell.
+
+The configurations are processed by a pool of worker processes, so that the
+cost of starting Python and importing `spheal` is paid once per worker.
+
+"""
+
+import argparse
+import concurrent.futures
+import inspect
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from spheal import distributions, radial, shell
+from spheal.disk import Disk
+from spheal.distributions.randomization import (random_rotations,
+                                                shell_generators)
+from spheal.euclidean import cartesian_from_spherical
+from spheal.hemisphere import Hemisphere
+from spheal.precision import float_dtype
+
+
+def _tessellation(cls, path, config):
+    tessellation = cls(config["radius"],
+                       config["n_patches"],
+                       config["patch_aspect"],
+                       analytic=config.get("analytic", True),
+                       dtype=config.get("dtype"))
+    dtype = tessellation.dtype
+
+    path += ".npz"
+    np.savez(path,
+             inner=tessellation.inner.astype(dtype),
+             outer=tessellation.outer.astype(dtype),
+             numbers=tessellation.numbers,
+             offsets=tessellation.offsets)
+    return path
+
+
+def _distribution(path, config):
+    # Pass the arguments of the class only, which may come from the defaults.
+    cls = getattr(distributions, config["distribution"])
+    kwargs = {
+        key: config[key]
+        for key in inspect.signature(cls).parameters
+        if key in config and not key == "N"
+    }
+    distribution = cls(config["N"], **kwargs)
+
+    path += ".npz"
+    np.savez(path, theta=distribution.theta, phi=distribution.phi)
+    return path
+
+
+def _profile(config):
+    if isinstance(config, str):
+        return getattr(radial, config)()
+
+    kwargs = {key: value for key, value in config.items() if key != "name"}
+    return getattr(radial, config["name"])(**kwargs)
+
+
+def _cloud(path, config):
+    N = config["N"]
+    profile = _profile(config["profile"])
+    cls = getattr(distributions, config.get("distribution",
+                                            "FibonacciLattice"))
+    dtype = config.get("dtype")
+
+    if "spacing" in config:
+        r = shell.spaced_radii(profile, N, config["spacing"])
+    else:
+        r = np.empty(config["shells"] + 1)
+        shell.radii(r, profile, N)
+
+    numbers = np.empty(r.size - 1, dtype=np.uint32)
+    shell.particle_number(numbers, profile, N, r)
+    enclosed = profile.particle_number(r)
+    medians = profile.quantile_radius(0.5 * (enclosed[1:] + enclosed[:-1]))
+
+    coords = np.lib.format.open_memmap(path + ".npy",
+                                       mode="w+",
+                                       dtype=float_dtype(dtype),
+                                       shape=(int(np.sum(numbers)), 3))
+    rotations = None
+    if config.get("seed") is not None:
+        rotations = np.empty((numbers.size, 3, 3))
+        random_rotations(rotations,
+                         shell_generators(config["seed"], range(numbers.size)))
+
+    first = 0
+    for i, (n, radius) in enumerate(zip(numbers, medians)):
+        if n > 0:
+            particles = cls(int(n), dtype=dtype)
+            shell_coords = coords[first:first + n]
+            cartesian_from_spherical(shell_coords, np.full(n, radius),
+                                     particles.theta, particles.phi)
+            if rotations is not None:
+                shell_coords[:] = shell_coords @ rotations[i].T
+            first += n
+    coords.flush()
+    del coords
+
+    np.save(path + ".shells.npy", numbers)
+    return path + ".npy"
+
+
+def run(config, directory):
+    """
+    Generate the output of one configuration.
+
+    Parameters
+    ----------
+
+    `config` : dict
+    The configuration, as described in the module documentation.
+
+    `directory` : str
+    The directory of the output files.
+
+    Returns
+    -------
+
+    `path` : str
+    The path of the main output file.
+
+    """
+    path = os.path.join(directory, config["name"])
+    kind = config["kind"]
+    if kind == "disk":
+        return _tessellation(Disk, path, config)
+    if kind == "hemisphere":
+        return _tessellation(Hemisphere, path, config)
+    if kind == "distribution":
+        return _distribution(path, config)
+    if kind == "cloud":
+        return _cloud(path, config)
+
+    msg = "Unknown kind of configuration " + str(kind)
+    raise ValueError(msg)
+
+
+def _timed_run(config, directory):
+    start = time.perf_counter()
+    path = run(config, directory)
+    return path, time.perf_counter() - start
+
+
+def load(filename):
+    """
+    Read the configurations of a parameter file.
+
+    Parameters
+    ----------
+
+    `filename` : str
+    The path of the JSON parameter file.
+
+    Returns
+    -------
+
+    `configs` : list(dict)
+    The configurations, completed with the defaults and a name.
+
+    """
+    with open(filename, "r", encoding="utf-8") as parameter_file:
+        parameters = json.load(parameter_file)
+
+    if isinstance(parameters, list):
+        parameters = {"jobs": parameters}
+
+    configs = []
+    for index, job in enumerate(parameters["jobs"]):
+        config = {"name": "job" + str(index)}
+        config.update(parameters.get("defaults", {}))
+        config.update(job)
+        configs.append(config)
+
+    return configs
+
+
+def main(argv=None):
+    """
+    Run the `spheal` command.
+
+    Parameters
+    ----------
+
+    `argv` : list(str) (optional, default: None)
+    The command-line arguments. If not given, the ones of the process.
+
+    Returns
+    -------
+
+    `status` : int
+    0 if every configuration succeeded, 1 otherwise.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="spheal",
+        description="Generate tessellations, distributions and particle "
+        "clouds from a parameter file.")
+    parser.add_argument("parameters", help="The JSON parameter file.")
+    parser.add_argument("-o",
+                        "--output",
+                        default=".",
+                        help="The directory of the output files.")
+    parser.add_argument("-j",
+                        "--workers",
+                        type=int,
+                        default=os.cpu_count(),
+                        help="The number of worker processes.")
+    args = parser.parse_args(argv)
+
+    configs = load(args.parameters)
+    os.makedirs(args.output, exist_ok=True)
+
+    failed = 0
+    with concurrent.futures.ProcessPoolExecutor(args.workers) as executor:
+        futures = {
+            executor.submit(_timed_run, config, args.output): config["name"]
+            for config in configs
+        }
+        for future in concurrent.futures.as_completed(futures):
+            name = futures[future]
+            try:
+                path, elapsed = future.result()
+            except Exception as error:
+                failed += 1
+                print(name + ": failed: " + repr(error), file=sys.stderr)
+            else:
+                print(name + ": " + path + " ({:.3f} s)".format(elapsed))
+
+    return 1 if failed else 0
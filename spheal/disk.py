@@ -9,9 +9,16 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 from spheal.annulus import Annulus
+from spheal.overlap import ring_overlap
+from spheal.rings import RingTessellation, _read_only
+from spheal.tables import boundary_table
 
+# The number of passes of the closed-form solver of the annuli before it
+# follows the recurrence one annulus at a time.
+MAX_PASSES = 8
 
-class Disk:
+
+class Disk(RingTessellation):
     """
     Equal-area disk tessellation based on Beckers & Beckers (2012).
 
@@ -32,6 +39,16 @@ class Disk:
     `patch_number`: int
     The total number of patches in the disk.
 
+    `offsets`: ndarray(int)
+    The index of the first patch of every annulus, and the total number of
+    patches.
+
+    `inner, outer`: ndarray, ndarray
+    The inner and outer radii of every annulus.
+
+    `numbers`: ndarray(int)
+    The number of patches of every annulus.
+
     Notes
     -----
 
@@ -44,15 +61,32 @@ class Disk:
       fail to converge to a solution. For instance, for 1000 patches, aspect
       ratios > 50 and < 0.15 are prone to give innacurate results.
 
+    - With `analytic=True`, the number of patches and the outer radius of every
+      annulus are computed at once from the closed form of Eq. (13), and then
+      corrected so that the integer rounding is identical to the one of the
+      iterative recurrence.
+
+    - With `strict=True`, the enclosed numbers of patches are checked to
+      decrease annulus by annulus in a single vectorized pass, and the annuli
+      past the first invalid one are merged into the innermost valid annulus
+      and the central circle. This only changes tessellations that would
+      otherwise contain annuli without patches.
+
     """
 
+    _ring_class = Annulus
+    _ring_name = "annuli"
+
     def __init__(self,
                  radius: float,
                  n_patches: int,
                  patch_aspect: float,
                  draw=False,
                  filename="Disk",
-                 fmt="pdf"):
+                 fmt="pdf",
+                 analytic=False,
+                 dtype=None,
+                 strict=False):
         """
         Parameters
         ----------
@@ -69,31 +103,29 @@ class Disk:
         `draw`: bool (default: False)
         Whether to draw the resulting tessellation to a PDF.
 
-        """
-        self._radius = radius
-        self._patch_aspect = patch_aspect
-
-        # Maximum integer l for which k_l > 0.
-        lmax = np.floor(np.sqrt(n_patches * patch_aspect /
-                                np.pi)).astype(dtype=np.int64)
+        `analytic`: bool (default: False)
+        Whether to compute all annuli at once in closed form instead of
+        iterating over them one at a time. Both give the same tessellation.
 
-        l = 0
-        k_lm1, r_lm1 = n_patches, radius
+        `dtype`: numpy.dtype (default: None)
+        The floating-point type of the extents of every annulus and of the
+        per-patch arrays. If not given, the default type of `spheal.precision`
+        is used. The extents are always computed in double precision.
 
-        self._annuli = []
-        while l < lmax:
-            l += 1
-            k_l = self._k_l(k_lm1)
-            r_l = self._r_l(r_lm1, k_lm1, k_l)
+        `strict`: bool (default: False)
+        Whether to guarantee that every annulus holds at least one patch, so
+        that the annuli partition the disk into exactly `n_patches` patches.
+        The rounding residuals of Eq. (13) near the center, which may leave
+        annuli with no or a negative number of patches, are then gathered into
+        the innermost valid annulus.
 
-            if l == lmax:
-                # Force innermost patch to be a concentric circle.
-                r_inn = r_lm1 / np.sqrt(k_lm1)
-                self._annuli.append(Annulus((r_inn, r_lm1), k_lm1 - 1))
-                self._annuli.append(Annulus((0., r_inn), 1))
-            else:
-                self._annuli.append(Annulus((r_l, r_lm1), k_lm1 - k_l))
-                k_lm1, r_lm1 = k_l, r_l
+        """
+        super().__init__(radius,
+                         n_patches,
+                         patch_aspect,
+                         analytic=analytic,
+                         dtype=dtype,
+                         strict=strict)
 
         if draw:
             self.draw(filename, fmt)
@@ -103,8 +135,14 @@ class Disk:
         """
         The annuli covering the disk.
 
+        They are built from the arrays of annulus extents and numbers of
+        patches on first access and cached.
+
         """
-        return self._annuli
+        if self._ring_objects is None:
+            self._ring_objects = self._build_ring_objects(
+                self._inner, self._outer, self._numbers)
+        return self._ring_objects
 
     @property
     def radius(self):
@@ -114,13 +152,408 @@ class Disk:
         """
         return self._radius
 
+    @property
+    def patch_aspect(self):
+        """
+        The aspect ratio requested for every patch.
+
+        """
+        return self._patch_aspect
+
+    @property
+    def adjacency(self):
+        """
+        The neighbors of every patch in compressed sparse row format.
+
+        This is a tuple `(indptr, indices)` such that the neighbors of patch p,
+        numbered as described in `patch_quality`, are
+        `indices[indptr[p]:indptr[p + 1]]` in increasing order. Two patches are
+        neighbors if they share a boundary of nonzero length, i.e. a radial
+        segment within an annulus or an arc between adjacent annuli. It is
+        built on first access and cached.
+
+        """
+        if self._adjacency is None:
+            self._adjacency = self._build_adjacency()
+        return self._adjacency
+
     @property
     def patch_number(self):
         """
         The number of patches covering the disk.
 
         """
-        return sum(annulus.patch_number for annulus in self._annuli)
+        return int(self._offsets[-1])
+
+    @property
+    def offsets(self):
+        """
+        The index of the first patch of every annulus, numbered as described in
+        `patch_quality`, followed by the total number of patches. The array is
+        read-only.
+
+        """
+        return _read_only(self._offsets)
+
+    @property
+    def inner(self):
+        """
+        The inner radius of every annulus, from the outermost to the innermost
+        one, in double precision. The array is read-only.
+
+        """
+        return _read_only(self._inner)
+
+    @property
+    def outer(self):
+        """
+        The outer radius of every annulus, from the outermost to the innermost
+        one, in double precision. The array is read-only.
+
+        """
+        return _read_only(self._outer)
+
+    @property
+    def numbers(self):
+        """
+        The number of patches of every annulus, from the outermost to the
+        innermost one. The array is read-only.
+
+        """
+        return _read_only(self._numbers)
+
+    @property
+    def dtype(self):
+        """
+        The floating-point type of the extents of every annulus and of the
+        per-patch arrays.
+
+        """
+        return self._dtype
+
+    @property
+    def strict(self):
+        """
+        Whether every annulus is guaranteed to hold at least one patch.
+
+        """
+        return self._strict
+
+    def _rings(self, n_patches, lmax):
+        """
+        Compute the number of patches enclosed by, and the radius of, the outer
+        circle of every annulus l = 0, ..., lmax - 1, one annulus at a time.
+
+        """
+        k = np.empty(lmax, dtype=np.int64)
+        r = np.empty(lmax)
+
+        k_lm1, r_lm1 = n_patches, self._radius
+        for l in range(lmax):
+            k[l], r[l] = k_lm1, r_lm1
+            k_l = self._k_l(k_lm1)
+            k_lm1, r_lm1 = k_l, self._r_l(r_lm1, k_lm1, k_l)
+
+        return k, r
+
+    @staticmethod
+    def _rings_analytic(radius, n_patches, patch_aspect):
+        """
+        Compute the same arrays as `_rings`, but for all annuli at once.
+
+        Eq. (13) without rounding gives sqrt(k_l) = sqrt(k_0) - l sqrt(pi / a).
+        Starting from this guess, each pass finds the first annulus whose
+        number of patches differs from the rounded recurrence, corrects it, and
+        restarts the closed form from there. The guess drifts away from the
+        rounded recurrence towards the center, so after `MAX_PASSES` passes the
+        annuli past the first mismatch follow the recurrence one at a time
+        instead, which keeps the cost linear in the number of annuli.
+
+        """
+        lmax = Disk._lmax(n_patches, patch_aspect)
+        step = np.sqrt(np.pi / patch_aspect)
+        l = np.arange(lmax)
+
+        k = np.rint((np.sqrt(n_patches) - l * step)**2.0)
+        if lmax > 0:
+            k[0] = n_patches
+
+        # Annuli up to m are exact.
+        m = 0
+        for _ in range(MAX_PASSES if lmax > 1 else 0):
+            k_next = np.rint((np.sqrt(k[:-1]) - step)**2.0)
+            mismatch = np.flatnonzero(k_next != k[1:])
+            if mismatch.size == 0:
+                m = lmax
+                break
+
+            m = mismatch[0] + 1
+            k[m] = k_next[m - 1]
+            k[m + 1:] = np.rint((np.sqrt(k[m]) - l[1:lmax - m] * step)**2.0)
+
+        # Eq. (13), as in `_rings`, past the last exact annulus.
+        for j in range(m + 1, lmax):
+            k[j] = np.rint((np.sqrt(k[j - 1]) - step)**2.0)
+
+        # Eq. (1) accumulated in the same order as the recurrence.
+        ratios = np.empty(lmax)
+        ratios[:1] = radius
+        ratios[1:] = np.sqrt(k[1:] / k[:-1])
+        r = np.multiply.accumulate(ratios)
+
+        return k.astype(dtype=np.int64), r
+
+    @staticmethod
+    def _lmax(n_patches, patch_aspect):
+        # Maximum integer l for which k_l > 0.
+        return np.floor(np.sqrt(n_patches * patch_aspect /
+                                np.pi)).astype(dtype=np.int64)
+
+    @staticmethod
+    def _ring_arrays(radius, k, r):
+        """
+        Compute the inner radius, outer radius and number of patches of every
+        annulus, from the outermost to the innermost one, given the arrays
+        returned by `_rings`, which already scale with the radius of the disk.
+
+        """
+        del radius
+        if k.size == 0:
+            return np.empty(0), np.empty(0), np.empty(0, dtype=np.int64)
+
+        # Force innermost patch to be a concentric circle.
+        outer = np.append(r, r[-1] / np.sqrt(k[-1]))
+        inner = np.append(outer[1:], 0.)
+        numbers = np.append(k[:-1] - k[1:], (k[-1] - 1, 1))
+
+        return inner, outer, numbers
+
+    @staticmethod
+    def _outer_edge(radius):
+        return radius
+
+    @staticmethod
+    def _ring_quality(inner, outer, numbers):
+        """
+        Compute the area and the aspect ratio of the patches of every annulus.
+
+        The aspect ratio is the ratio of the area to the squared radial width,
+        i.e. the mean arc length of a patch over its radial width.
+
+        """
+        area = np.pi * (outer**2.0 - inner**2.0) / numbers
+        aspect = area / (outer - inner)**2.0
+        return area, aspect
+
+    @staticmethod
+    def _summary(radius, inner, outer, numbers, patch_aspect):
+        """
+        Compute the root-mean-square relative deviation of the patch aspect
+        ratios from `patch_aspect`, and of the patch areas from the mean area.
+
+        Every patch is weighted equally. The central circle is not a sector,
+        so it is left out of the aspect deviation.
+
+        """
+        area, aspect = Disk._ring_quality(inner, outer, numbers)
+        aspect_deviation = np.inf
+        if numbers.size > 1:
+            aspect_deviation = np.sqrt(
+                np.average((aspect[:-1] / patch_aspect - 1.0)**2.0,
+                           weights=numbers[:-1]))
+
+        mean_area = np.pi * radius**2.0 / np.sum(numbers)
+        area_error = np.sqrt(
+            np.average((area / mean_area - 1.0)**2.0, weights=numbers))
+
+        return {
+            "patch_aspect": patch_aspect,
+            "aspect_deviation": aspect_deviation,
+            "area_error": area_error
+        }
+
+    def patch_quality(self):
+        """
+        Compute the area and aspect ratio of every patch, and summarize how
+        much they deviate from the ideal ones.
+
+        Patches are numbered from the outermost annulus inwards and, within each
+        annulus, by increasing azimuth.
+
+        Returns
+        -------
+
+        `quality`: dict
+        The per-patch arrays 'area', 'aspect' and 'deviation', the latter
+        being the relative deviation of the aspect ratio from `patch_aspect`
+        (NaN for the central circle). Also the summary values 'patch_aspect',
+        'aspect_deviation' and 'area_error' described in `search_aspect`, and
+        the largest absolute relative deviations 'max_aspect_deviation' and
+        'max_area_error'.
+
+        """
+        self._check_numbers("have no quality")
+
+        # Rings without patches have no area, and are left out.
+        kept = self._numbers > 0
+        inner, outer = self._inner[kept], self._outer[kept]
+        numbers = self._numbers[kept]
+        area, aspect = self._ring_quality(inner, outer, numbers)
+        deviation = aspect / self._patch_aspect - 1.0
+        deviation[-1:] = np.nan
+        area_error = area / np.average(area, weights=numbers) - 1.0
+
+        quality = self._summary(self._radius, inner, outer, numbers,
+                                self._patch_aspect)
+        quality["max_aspect_deviation"] = np.nanmax(np.abs(deviation),
+                                                    initial=0.0)
+        quality["max_area_error"] = np.max(np.abs(area_error))
+        dtype = self._dtype
+        quality["area"] = np.repeat(area.astype(dtype), numbers)
+        quality["aspect"] = np.repeat(aspect.astype(dtype), numbers)
+        quality["deviation"] = np.repeat(deviation.astype(dtype), numbers)
+
+        return quality
+
+    def sample_patches(self, points, counts, rng=None):
+        """
+        Draw points uniformly distributed within every patch.
+
+        The radius of each point is drawn by inverse-transform sampling of r^2
+        between the radial extents of its annulus, and the azimuth uniformly
+        between the extents of its patch. No draw is rejected.
+
+        Parameters
+        ----------
+
+        `points` : ndarray(M, 2)
+        The `x, y` Cartesian coordinates of the M points, stored patch by patch
+        in the order described in `patch_quality`.
+
+        `counts` : int or ndarray(int)
+        The number of points to draw in each patch, either the same for every
+        patch or one value per patch.
+
+        `rng` : numpy.random.Generator (optional, default: None)
+        The random number generator to draw from. If not given, a new one is
+        created from fresh entropy.
+
+        """
+        counts = np.broadcast_to(counts, self._offsets[-1:])
+        total = np.sum(counts)
+        if not points.shape[0] == total:
+            msg = ("Number of points should be " + str(total) + ". Got " +
+                   str(points.shape[0]))
+            raise ValueError(msg)
+
+        if rng is None:
+            rng = np.random.default_rng()
+
+        self._check_numbers("cannot be sampled")
+
+        patches = np.repeat(np.arange(counts.size), counts)
+        rings = np.repeat(np.arange(self._numbers.size),
+                          self._numbers)[patches]
+        inner, outer = self._inner[rings], self._outer[rings]
+
+        # Patch m of a ring with n patches spans 2 pi m / n to 2 pi (m + 1) / n
+        phi = 2.0 * np.pi * (patches - self._offsets[rings] +
+                             rng.random(total)) / self._numbers[rings]
+
+        r = np.sqrt(inner**2.0 + rng.random(total) * (outer**2.0 - inner**2.0))
+        points[:, 0] = r * np.cos(phi)
+        points[:, 1] = r * np.sin(phi)
+
+    def patch_centers(self, r, phi, patches=None):
+        """
+        Compute the center of every patch.
+
+        The radius of a center splits the area of its annulus in halves, and
+        its azimuth lies halfway between the extents of its patch. The center
+        of the innermost patch is the center of the disk.
+
+        Parameters
+        ----------
+
+        `r, phi` : ndarray, ndarray
+        The polar coordinates of the centers, stored in the order described in
+        `patch_quality`, or in the order of `patches`.
+
+        `patches` : ndarray(int) (optional, default: None)
+        The patches whose centers to compute, numbered as described in
+        `patch_quality`. If not given, the centers of every patch are computed.
+
+        """
+        numbers, offsets = self._numbers, self._offsets
+        if patches is None:
+            patches = np.arange(offsets[-1])
+            rings = np.repeat(np.arange(numbers.size), numbers)
+        else:
+            rings = np.searchsorted(offsets, patches, side="right") - 1
+
+        center = np.sqrt(0.5 * (self._inner**2.0 + self._outer**2.0))
+        center[-1:] = 0.0
+        r[:] = center[rings]
+        phi[:] = 2.0 * np.pi * (patches - offsets[rings] +
+                                0.5) / numbers[rings]
+        phi[np.isin(patches, offsets[-2:-1])] = 0.0
+
+    def overlap(self, other):
+        """
+        Compute the area shared by every patch of this disk and every patch of
+        another one of the same radius.
+
+        A patch spans intervals of `r^2` and `phi`, and its area is half the
+        product of their lengths. The overlaps are found exactly as described
+        in `overlap.ring_overlap`.
+
+        Parameters
+        ----------
+
+        `other` : Disk
+        The other tessellation.
+
+        Returns
+        -------
+
+        `areas` : CSRMatrix
+        The shared areas, with one row per patch of this disk and one column
+        per patch of `other`, numbered as described in `patch_quality`.
+
+        """
+        if not self._radius == other.radius:
+            msg = ("Disks should have the same radius. Got " +
+                   str(self._radius) + " and " + str(other.radius))
+            raise ValueError(msg)
+
+        areas = ring_overlap(self._inner**2.0, self._outer**2.0, self._numbers,
+                             other.inner**2.0, other.outer**2.0, other.numbers)
+        return areas.scale_rows(np.full(areas.shape[0], 0.5))
+
+    def locate_patches(self, patches, r, phi):
+        """
+        Find the patch containing each of the given points.
+
+        Parameters
+        ----------
+
+        `patches` : ndarray(int)
+        The index of the patch containing each point, numbered as described in
+        `patch_quality`.
+
+        `r, phi` : ndarray, ndarray
+        The polar coordinates of the points. Points beyond the disk are assigned
+        to the outermost annulus.
+
+        """
+        inner, numbers = self._inner, self._numbers
+        rings = inner.size - np.searchsorted(inner[::-1], r, side="right")
+        rings = np.minimum(rings, inner.size - 1)
+
+        m = np.floor(
+            np.mod(phi, 2.0 * np.pi) * numbers[rings] /
+            (2.0 * np.pi)).astype(dtype=np.int64)
+        patches[:] = self._offsets[rings] + np.minimum(m, numbers[rings] - 1)
 
     # Eq. (1)
     def _r_l(self, r_lm1, k_lm1, k_l):
@@ -150,15 +583,13 @@ class Disk:
         The format of the figure to draw.
 
         """
-        dense_phi = np.linspace(0., 2. * np.pi, 100)
-        dense_cos, dense_sin = np.cos(dense_phi), np.sin(dense_phi)
+        dense_cos, dense_sin = boundary_table(99)
 
         fig, ax = plt.subplots()
-        for annulus in self._annuli:
+        for annulus in self.annuli:
             ri, ro = annulus.extents
-            phi = annulus.patch_extents
-            cos_phi, sin_phi = np.cos(phi), np.sin(phi)
-            if len(phi) > 2:
+            if annulus.patch_number > 1:
+                cos_phi, sin_phi = annulus.patch_boundaries
                 ax.plot(np.array([ri * cos_phi, ro * cos_phi]),
                         np.array([ri * sin_phi, ro * sin_phi]),
                         color="purple",
@@ -3,6 +3,23 @@
 """
 Defines classes holding functions to distribute points in spherical coordinates.
 
+Every distribution derives from `Distribution` and exposes the angles of its
+particles as the arrays `theta` and `phi`:
+
+- `GeneralizedSpiral`: the spiral of Saff & Kuijlaars (1997).
+- `FibonacciLattice`: the spherical Fibonacci lattice, whose particles can be
+  computed independently of each other.
+- `RandomizedFibonacciLattice`: a randomly shifted Fibonacci lattice, for
+  quasi-Monte-Carlo estimates.
+- `PatchCenters`: the centers of equal-area `Hemisphere` patches.
+
+The module `metrics` defines functions measuring the quality of the
+distributions, and the module `randomization` functions rotating the
+distributions of concentric shells at random, reproducibly.
+
 """
 
+from .distribution import *
 from .generalized_spiral import *
+from .fibonacci_lattice import *
+from .patch_centers import *
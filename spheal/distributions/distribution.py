@@ -0,0 +1,102 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines `Distribution`, the base class for distributions of points on the
+sphere.
+
+"""
+
+import abc
+
+import numpy as np
+
+from spheal.precision import float_dtype
+
+# The angles are computed in double precision in chunks of this many particles,
+# and cast to the floating-point type of the distribution chunk by chunk.
+CHUNK_SIZE = 65536
+
+
+class Distribution(metaclass=abc.ABCMeta):
+    """
+    Base class for distributions of points on the unit sphere. Each derived
+    class should define the following function:
+
+    Functions
+    ---------
+
+    `_angles(chunk)`
+    Yield the angles of consecutive chunks of at most `chunk` particles, in
+    double precision.
+
+    Attributes
+    ----------
+
+    `N` : int
+    The number of particles in the distribution.
+
+    `theta` : ndarray
+    The zenithal coordinate of every particle.
+
+    `phi` : ndarray
+    The azimuthal coordinate of every particle.
+
+    """
+
+    def __init__(self, N, dtype=None):
+        """
+        Parameters
+        ----------
+
+        `N` : int
+        The number of particles in the distribution.
+
+        `dtype` : numpy.dtype (optional, default: None)
+        The floating-point type of `theta` and `phi`. If not given, the default
+        type of `spheal.precision` is used. The angles are always computed in
+        double precision.
+
+        """
+        self._N = N
+        dtype = float_dtype(dtype)
+        self._theta = np.empty(N, dtype=dtype)
+        self._phi = np.empty(N, dtype=dtype)
+
+        first = 0
+        for theta, phi in self._angles(CHUNK_SIZE):
+            last = first + theta.size
+            self._theta[first:last] = theta
+            self._phi[first:last] = phi
+            first = last
+
+    @property
+    def N(self):
+        """
+        The number of particles in the distribution.
+
+        """
+        return self._N
+
+    @property
+    def theta(self):
+        """
+        The zenithal cordinate of every particle.
+
+        """
+        return self._theta
+
+    @property
+    def phi(self):
+        """
+        The azimuthal coordinate of every particle.
+
+        """
+        return self._phi
+
+    @abc.abstractmethod
+    def _angles(self, chunk):
+        """
+        Yield the zenithal and azimuthal coordinates of consecutive chunks of
+        at most `chunk` particles.
+
+        """
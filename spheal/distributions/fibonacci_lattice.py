@@ -0,0 +1,146 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines classes `FibonacciLattice` and `RandomizedFibonacciLattice`.
+
+"""
+
+import numpy as np
+
+from spheal.distributions.distribution import Distribution
+
+
+class FibonacciLattice(Distribution):
+    """
+    The spherical Fibonacci lattice: the rank-1 lattice with generator
+    (1, 1 / golden ratio) on the unit square, mapped onto the sphere with
+    equal area, so that `cos(theta)` is uniformly spaced.
+
+    The angles of every particle depend only on its index, so any subset of
+    the particles can be computed with `angles`.
+
+    Attributes
+    ----------
+
+    `N` : int
+    The number of particles in the distribution.
+
+    `theta` : ndarray
+    The zenithal coordinate of every particle.
+
+    `phi` : ndarray
+    The azimuthal coordinate of every particle.
+
+    `offset` : ndarray(2)
+    The shift of the lattice on the unit square.
+
+    """
+
+    _generator = 0.5 * (np.sqrt(5.0) - 1.0)
+
+    def __init__(self, N, offset=(0.5, 0.0), dtype=None):
+        """
+        Parameters
+        ----------
+
+        `N` : int
+        The number of particles in the distribution.
+
+        `offset` : tuple(float, float) (optional, default: (0.5, 0.0))
+        The shift of the lattice on the unit square, along `cos(theta)` and
+        `phi` respectively. The default centers the particles in `N` bands of
+        equal area.
+
+        `dtype` : numpy.dtype (optional, default: None)
+        The floating-point type of `theta` and `phi`.
+
+        """
+        self._offset = np.array(offset, dtype=np.float64)
+        super().__init__(N, dtype)
+
+    @property
+    def offset(self):
+        """
+        The shift of the lattice on the unit square.
+
+        """
+        return self._offset
+
+    def angles(self, theta, phi, k):
+        """
+        Compute the angles of the particles with the given indices.
+
+        Parameters
+        ----------
+
+        `theta, phi` : ndarray, ndarray
+        The spherical angles of the particles.
+
+        `k` : ndarray(int)
+        The indices of the particles, in the range [0, N).
+
+        """
+        k = np.asarray(k)
+        if np.any(k < 0) or np.any(k >= self._N):
+            msg = "Particle indices should be in range [0, " + str(
+                self._N) + ")."
+            raise ValueError(msg)
+
+        u = np.mod((k + self._offset[0]) / self._N, 1.0)
+        v = np.mod(k * self._generator + self._offset[1], 1.0)
+        theta[:] = np.arccos(1.0 - 2.0 * u)
+        phi[:] = 2.0 * np.pi * v
+
+    def _angles(self, chunk):
+        for first in range(0, self._N, chunk):
+            k = np.arange(first, min(first + chunk, self._N))
+            theta = np.empty(k.size)
+            phi = np.empty(k.size)
+            self.angles(theta, phi, k)
+            yield theta, phi
+
+
+class RandomizedFibonacciLattice(FibonacciLattice):
+    """
+    A Fibonacci lattice shifted by a uniformly random offset on the unit square
+    (Cranley & Patterson 1976), which makes averages over the particles
+    unbiased estimators of averages over the sphere. Independent offsets give
+    independent estimates of the quadrature error.
+
+    Attributes
+    ----------
+
+    `N` : int
+    The number of particles in the distribution.
+
+    `theta` : ndarray
+    The zenithal coordinate of every particle.
+
+    `phi` : ndarray
+    The azimuthal coordinate of every particle.
+
+    `offset` : ndarray(2)
+    The shift of the lattice on the unit square.
+
+    """
+
+    def __init__(self, N, rng=None, dtype=None):
+        """
+        Parameters
+        ----------
+
+        `N` : int
+        The number of particles in the distribution.
+
+        `rng` : numpy.random.Generator (optional, default: None)
+        The random number generator to draw the offset from. If not given, a
+        new one is created from fresh entropy.
+
+        `dtype` : numpy.dtype (optional, default: None)
+        The floating-point type of `theta` and `phi`.
+
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+
+        super().__init__(N, rng.random(2), dtype)
@@ -7,8 +7,10 @@ Defines class `GeneralizedSpiral`.
 
 import numpy as np
 
+from spheal.distributions.distribution import Distribution
 
-class GeneralizedSpiral:
+
+class GeneralizedSpiral(Distribution):
     """
     The parameterized spiraling scheme introduced by Saff & Kuijlaars (1997).
 
@@ -26,52 +28,26 @@ class GeneralizedSpiral:
 
     """
 
-    def __init__(self, N):
-        self._N = N
-        self._theta = np.empty(N)
-        self._phi = np.empty(N)
-
-        self._set_angles(self._theta, self._phi)
-
-    @property
-    def N(self):
-        """
-        The number of particles in the distribution.
-
-        """
-        return self._N
-
-    @property
-    def theta(self):
-        """
-        The zenithal cordinate of every particle.
-
-        """
-        return self._theta
-
-    @property
-    def phi(self):
-        """
-        The azimuthal coordinate of every particle.
-
-        """
-        return self._phi
-
-    def _h(self, k):
-        N = self._N
-        if k < 1 or k > N:
-            ValueError("Value of k should be in range [1, N].")
-        return -1.0 + 2.0 * (k - 1.0) / (N - 1.0)
-
     def _phase(self, hk):
         return 3.6 / np.sqrt(self._N) / np.sqrt(1.0 - hk**2)
 
-    def _set_angles(self, theta, phi):
+    def _angles(self, chunk):
         N = self._N
 
-        hk = np.array([self._h(k) for k in range(1, N + 1)])
-        theta[:] = np.arccos(hk)
-
-        for k in range(N):
-            phi[k] = 0.0 if k in (0,
-                                  N - 1) else phi[k - 1] + self._phase(hk[k])
+        phi_last = 0.0
+        for first in range(0, N, chunk):
+            k = np.arange(first, min(first + chunk, N), dtype=np.float64)
+            hk = -1.0 + 2.0 * k / (N - 1.0)
+            inner = (k > 0.0) & (k < N - 1.0)
+
+            # The cumulative sum adds the phases in the same order as the
+            # recurrence phi_k = phi_km1 + phase(h_k), carrying the last angle
+            # of the previous chunk.
+            phases = np.zeros(k.size)
+            phases[inner] = self._phase(hk[inner])
+            phases[0] += phi_last
+            phi = np.cumsum(phases)
+            phi_last = phi[-1]
+            phi[k == N - 1.0] = 0.0
+
+            yield np.arccos(hk), phi
@@ -0,0 +1,210 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines the following functions measuring the quality of distributions of
+points on the unit sphere:
+
+- `nearest_neighbor_distances(distances, theta, phi)`
+  Computes the geodesic distance from every point to its nearest neighbor.
+
+- `minimum_separation(theta, phi)`
+  Computes the smallest geodesic distance between two points.
+
+- `riesz_energy(theta, phi, s=1.0, cutoff=None)`
+  Estimates the Riesz s-energy of the points.
+
+- `cap_discrepancy(theta, phi, centers=64, rng=None)`
+  Estimates the spherical cap discrepancy of the points.
+
+Nearby points are found with a `spheal.index.ParticleIndex`, so that the cost
+grows linearly with the number of points.
+
+"""
+
+import numpy as np
+
+from spheal.euclidean import cartesian_from_spherical
+from spheal.index import ParticleIndex
+
+
+def _unit_vectors(theta, phi):
+    points = np.empty((np.size(theta), 3))
+    cartesian_from_spherical(points, np.ones(np.size(theta)), theta, phi)
+    return points
+
+
+def _spacing(N):
+    # The side of a square patch when the unit sphere is split in N of them.
+    return np.sqrt(4.0 * np.pi / N)
+
+
+def nearest_neighbor_distances(distances, theta, phi):
+    """
+    Compute the geodesic distance from every point to its nearest neighbor.
+
+    Parameters
+    ----------
+
+    `distances` : ndarray(N)
+    The distance from each point to its nearest neighbor.
+
+    `theta, phi` : ndarray(N), ndarray(N)
+    The spherical angles of the N points, with N > 1.
+
+    """
+    points = _unit_vectors(theta, phi)
+    N = points.shape[0]
+    if N < 2:
+        msg = "Number of points should be larger than 1. Got " + str(N)
+        raise ValueError(msg)
+
+    radius = 2.0 * _spacing(N)
+    index = ParticleIndex(points, cell_size=radius)
+    chords = np.full(N, np.inf)
+    for i, j, chord in index.query_pairs(radius):
+        np.minimum.at(chords, i, chord)
+        np.minimum.at(chords, j, chord)
+
+    # Points without neighbors within the radius are searched further. The
+    # nearest particle to every point is the point itself.
+    isolated = np.flatnonzero(np.isinf(chords))
+    if isolated.size > 0:
+        chords[isolated] = index.query_knn(points[isolated], 2)[1][:, 1]
+
+    distances[:] = 2.0 * np.arcsin(np.minimum(0.5 * chords, 1.0))
+
+
+def minimum_separation(theta, phi):
+    """
+    Compute the smallest geodesic distance between two points.
+
+    Parameters
+    ----------
+
+    `theta, phi` : ndarray(N), ndarray(N)
+    The spherical angles of the N points, with N > 1.
+
+    Returns
+    -------
+
+    `separation` : float
+    The minimum separation of the points.
+
+    """
+    distances = np.empty(np.size(theta))
+    nearest_neighbor_distances(distances, theta, phi)
+    return np.min(distances)
+
+
+def riesz_energy(theta, phi, s=1.0, cutoff=None):
+    """
+    Estimate the Riesz s-energy of the points, the sum of `|x_i - x_j|^(-s)`
+    over every pair of different points, with each pair counted twice.
+
+    Pairs of points closer than `cutoff` are summed exactly. The kernel of
+    every farther pair is replaced by its average over pairs of uniformly
+    distributed points farther than `cutoff`, so that the estimate is exact if
+    `cutoff >= 2`.
+
+    Parameters
+    ----------
+
+    `theta, phi` : ndarray(N), ndarray(N)
+    The spherical angles of the N points.
+
+    `s` : float (optional, default: 1.0)
+    The positive exponent of the Riesz kernel.
+
+    `cutoff` : float (optional, default: None)
+    The Euclidean distance below which pairs are summed exactly. If not given,
+    it is twice the side of a square patch when the sphere is split in N of
+    them. The cost grows with `N * cutoff^2`.
+
+    Returns
+    -------
+
+    `energy` : float
+    The estimated energy.
+
+    """
+    points = _unit_vectors(theta, phi)
+    N = points.shape[0]
+    if not s > 0.0:
+        msg = "Exponent s should be positive. Got " + str(s)
+        raise ValueError(msg)
+
+    if cutoff is None:
+        cutoff = 2.0 * _spacing(N)
+    cutoff = min(cutoff, 2.0)
+
+    # Add a small margin so that antipodal pairs are summed exactly.
+    near, pairs = 0.0, 0
+    radius = cutoff * (1.0 + 1.e-12)
+    index = ParticleIndex(points, cell_size=radius)
+    for _, _, distance in index.query_pairs(radius):
+        near += np.sum(distance**(-s))
+        pairs += distance.size
+    if cutoff == 2.0:
+        return 2.0 * near
+
+    # The Euclidean distance t of two uniformly distributed points follows the
+    # density t / 2 on [0, 2]. Average the kernel over t > cutoff.
+    if s == 2.0:
+        far = 0.5 * np.log(2.0 / cutoff)
+    else:
+        far = (2.0**(2.0 - s) - cutoff**(2.0 - s)) / (2.0 * (2.0 - s))
+    far /= 1.0 - 0.25 * cutoff**2
+
+    return 2.0 * near + (N * (N - 1.0) - 2.0 * pairs) * far
+
+
+def cap_discrepancy(theta, phi, centers=64, rng=None):
+    """
+    Estimate the spherical cap discrepancy of the points: the largest
+    difference between the fraction of points within a spherical cap and the
+    fraction of the sphere covered by the cap.
+
+    For every center, the supremum over all cap sizes is computed exactly by
+    sorting the points by their distance to the center. The supremum over
+    centers is estimated from the given ones.
+
+    Parameters
+    ----------
+
+    `theta, phi` : ndarray(N), ndarray(N)
+    The spherical angles of the N points.
+
+    `centers` : int or ndarray(M, 3) (optional, default: 64)
+    The unit vectors pointing to the centers of the caps, or the number of
+    centers to draw uniformly on the sphere.
+
+    `rng` : numpy.random.Generator (optional, default: None)
+    The random number generator to draw the centers from. If not given, a new
+    one is created from fresh entropy.
+
+    Returns
+    -------
+
+    `discrepancy` : float
+    The estimated discrepancy.
+
+    """
+    points = _unit_vectors(theta, phi)
+    N = points.shape[0]
+
+    if np.ndim(centers) == 0:
+        if rng is None:
+            rng = np.random.default_rng()
+        centers = rng.normal(size=(centers, 3))
+        centers /= np.sqrt(np.sum(centers**2, axis=1))[:, np.newaxis]
+
+    # The cap {x : x . c >= h} covers the fraction (1 - h) / 2 of the sphere.
+    # Just above and at the k-th largest height, it holds k - 1 and k points.
+    k = np.arange(1, N + 1)
+    discrepancy = 0.0
+    for center in centers:
+        covered = 0.5 * (1.0 - np.sort(points @ center)[::-1])
+        discrepancy = max(discrepancy, np.max(np.abs(k / N - covered)),
+                          np.max(np.abs((k - 1) / N - covered)))
+
+    return discrepancy
@@ -0,0 +1,80 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class `PatchCenters`.
+
+"""
+
+import numpy as np
+
+from spheal.distributions.distribution import Distribution
+from spheal.hemisphere import Hemisphere
+
+
+class PatchCenters(Distribution):
+    """
+    The centers of the patches of two `Hemisphere` tessellations, one for
+    each half of the sphere. Every particle represents a patch of nearly the
+    same area and aspect ratio. The hemispheres are tessellated in strict mode,
+    so that every zone holds at least one patch.
+
+    The northern hemisphere holds the first `(N + 1) // 2` particles.
+
+    Attributes
+    ----------
+
+    `N` : int
+    The number of particles in the distribution.
+
+    `theta` : ndarray
+    The zenithal coordinate of every particle.
+
+    `phi` : ndarray
+    The azimuthal coordinate of every particle.
+
+    """
+
+    def __init__(self, N, patch_aspect=1.0, dtype=None):
+        """
+        Parameters
+        ----------
+
+        `N` : int
+        The number of particles in the distribution.
+
+        `patch_aspect` : float (optional, default: 1.0)
+        The aspect ratio of the patches.
+
+        `dtype` : numpy.dtype (optional, default: None)
+        The floating-point type of `theta` and `phi`.
+
+        """
+        if N < 2:
+            msg = "Patch centers need at least one particle per hemisphere."
+            raise ValueError(msg)
+
+        self._hemispheres = [
+            Hemisphere(1.0,
+                       n_patches,
+                       patch_aspect,
+                       analytic=True,
+                       strict=True) for n_patches in ((N + 1) // 2, N // 2)
+        ]
+
+        super().__init__(N, dtype)
+
+    def _angles(self, chunk):
+        north, south = self._hemispheres
+        n_north = north.patch_number
+
+        for first in range(0, self._N, chunk):
+            k = np.arange(first, min(first + chunk, self._N))
+            theta = np.empty(k.size)
+            phi = np.empty(k.size)
+
+            split = np.clip(n_north - first, 0, k.size)
+            north.patch_centers(theta[:split], phi[:split], k[:split])
+            south.patch_centers(theta[split:], phi[split:],
+                                k[split:] - n_north)
+            theta[split:] = np.pi - theta[split:]
+            yield theta, phi
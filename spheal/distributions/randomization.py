@@ -0,0 +1,149 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines the following functions randomizing the orientation of the
+distributions of concentric shells reproducibly:
+
+- `shell_generators(seed, shells, stream=0)`
+  Creates the random number generator of every shell.
+
+- `random_rotations(rotations, generators)`
+  Draws a uniformly random rotation from every generator.
+
+- `random_azimuths(offsets, generators)`
+  Draws a uniformly random azimuthal offset from every generator.
+
+- `rotate_angles(theta, phi, rotations, frames=None)`
+  Rotates the particles of many distributions given by their angles.
+
+The generator of a shell is spawned from the root seed with the index of the
+shell and of the stream as its spawn key, so it does not depend on which other
+shells are randomized, nor on the process randomizing it. Every shell thus gets
+the same rotation however the shells are split across workers.
+
+For instance, to rotate every shell of a cloud by its own rotation:
+
+    rotations = np.empty((n_shells, 3, 3))
+    random_rotations(rotations, shell_generators(seed, range(n_shells)))
+    euclidean.rotate(coords, coords, rotations, shell_of_every_particle)
+
+"""
+
+import numpy as np
+
+from spheal.euclidean import (cartesian_from_spherical, rotate,
+                              spherical_from_cartesian)
+
+
+def shell_generators(seed, shells, stream=0):
+    """
+    Create the random number generator of every given shell.
+
+    Parameters
+    ----------
+
+    `seed` : int or numpy.random.SeedSequence
+    The root seed, shared by every shell.
+
+    `shells` : iterable(int)
+    The index of every shell.
+
+    `stream` : int (optional, default: 0)
+    The index of an independent stream of every shell, e.g. one for the
+    rotations and one for the azimuthal offsets.
+
+    Returns
+    -------
+
+    `generators` : list(numpy.random.Generator)
+    The generator of every shell.
+
+    """
+    root = seed if isinstance(
+        seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return [
+        np.random.default_rng(
+            np.random.SeedSequence(root.entropy,
+                                   spawn_key=root.spawn_key +
+                                   (int(shell), stream))) for shell in shells
+    ]
+
+
+def random_rotations(rotations, generators):
+    """
+    Draw a uniformly random rotation from every generator.
+
+    The rotations are built from unit quaternions, drawn as normalized
+    four-dimensional Gaussian vectors, all at once.
+
+    Parameters
+    ----------
+
+    `rotations` : ndarray(M, 3, 3)
+    The rotation matrix drawn from every generator.
+
+    `generators` : list(numpy.random.Generator)
+    The M generators.
+
+    """
+    q = np.array([rng.standard_normal(4) for rng in generators]).reshape(-1, 4)
+    q /= np.sqrt(np.sum(q * q, axis=1))[:, np.newaxis]
+    w, x, y, z = q.T
+
+    rotations[:, 0, 0] = 1.0 - 2.0 * (y * y + z * z)
+    rotations[:, 0, 1] = 2.0 * (x * y - z * w)
+    rotations[:, 0, 2] = 2.0 * (x * z + y * w)
+    rotations[:, 1, 0] = 2.0 * (x * y + z * w)
+    rotations[:, 1, 1] = 1.0 - 2.0 * (x * x + z * z)
+    rotations[:, 1, 2] = 2.0 * (y * z - x * w)
+    rotations[:, 2, 0] = 2.0 * (x * z - y * w)
+    rotations[:, 2, 1] = 2.0 * (y * z + x * w)
+    rotations[:, 2, 2] = 1.0 - 2.0 * (x * x + y * y)
+
+
+def random_azimuths(offsets, generators):
+    """
+    Draw a uniformly random azimuthal offset in [0, 2 pi) from every
+    generator.
+
+    Parameters
+    ----------
+
+    `offsets` : ndarray(M)
+    The offset drawn from every generator.
+
+    `generators` : list(numpy.random.Generator)
+    The M generators.
+
+    """
+    offsets[:] = 2.0 * np.pi * np.array([rng.random() for rng in generators])
+
+
+def rotate_angles(theta, phi, rotations, frames=None):
+    """
+    Rotate the particles of many distributions given by their angles, in
+    place.
+
+    Parameters
+    ----------
+
+    `theta, phi` : ndarray(N), ndarray(N)
+    The spherical angles of the particles.
+
+    `rotations` : ndarray(M, 3, 3)
+    The rotation matrices.
+
+    `frames` : ndarray(int) (optional, default: None)
+    The index of the rotation of every particle, e.g. its shell. If not
+    given, particle i is rotated by matrix i.
+
+    """
+    coords = np.empty((theta.size, 3))
+    cartesian_from_spherical(coords, np.ones(theta.size), theta, phi)
+    rotate(coords, coords, rotations, frames)
+
+    # Rounding may take z slightly out of [-1, 1].
+    np.clip(coords[:, 2], -1.0, 1.0, out=coords[:, 2])
+    spherical_from_cartesian(theta, phi, coords[:, 0], coords[:, 1], coords[:,
+                                                                            2],
+                             np.ones(theta.size))
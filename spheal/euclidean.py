@@ -12,10 +12,25 @@ Defines the following functions related to vectors in Euclidean space:
 - `rotate_about(v, k a)`
   Rotates a vector using Rodrigues's axis-angle formula.
 
+- `frame_rotations(rotations, normals)`
+  Computes the rotation matrices taking the z axis onto every given normal.
+
+- `rotate(rotated, v, rotations, frames=None, inverse=False)`
+  Rotates many vectors, each by one of many rotation matrices.
+
+Every function writes its result into arrays given by the caller, so the
+floating-point type of the result is the one of those arrays.
+
 """
 
 import numpy as np
 
+# Vectors sharing a frame are rotated together when their runs are at least
+# this long on average, and otherwise in chunks of this many vectors, so that
+# the matrices are never gathered for every vector at once.
+MIN_RUN = 64
+CHUNK_SIZE = 65536
+
 
 def cartesian_from_spherical(coords, r, theta, phi):
     """
@@ -82,3 +97,93 @@ def rotate_about(v, k, a):
     """
     v[:] = v * np.cos(a) + np.cross(k, v) * np.sin(a) + k * np.dot(
         k, v) * (1.0 - np.cos(a))
+
+
+def frame_rotations(rotations, normals):
+    """
+    Compute the rotation matrices taking the z axis onto every given normal.
+
+    Each rotation is the one of smallest angle, about the axis `z x n`. Its
+    columns are the local `x, y, z` axes of a frame whose z axis is the normal.
+    The normal `-z` is reached by a rotation of pi about the x axis.
+
+    Parameters
+    ---------
+
+    `rotations` : ndarray(M, 3, 3)
+    The rotation matrix of every normal.
+
+    `normals` : ndarray(M, 3)
+    The M normals. Must be unit vectors.
+
+    """
+    x, y, z = normals[:, 0], normals[:, 1], normals[:, 2]
+
+    # R = I + [k]_x + [k]_x^2 / (1 + z), with k = z x n = (-y, x, 0). Near
+    # -z, 1 / (1 + z) = (1 - z) / (x^2 + y^2) is evaluated without
+    # cancellation.
+    rho2 = x * x + y * y
+    flipped = (z < 0.0) & (rho2 == 0.0)
+    c = np.where(z >= 0.0, 1.0 / (1.0 + np.abs(z)),
+                 (1.0 - z) / np.where(rho2 == 0.0, 1.0, rho2))
+    rotations[:, 0, 0] = 1.0 - x * x * c
+    rotations[:, 0, 1] = -x * y * c
+    rotations[:, 0, 2] = x
+    rotations[:, 1, 0] = -x * y * c
+    rotations[:, 1, 1] = 1.0 - y * y * c
+    rotations[:, 1, 2] = y
+    rotations[:, 2, 0] = -x
+    rotations[:, 2, 1] = -y
+    rotations[:, 2, 2] = z
+    rotations[flipped] = np.diag((1.0, -1.0, -1.0))
+
+
+def rotate(rotated, v, rotations, frames=None, inverse=False):
+    """
+    Rotate many vectors, each by one of many rotation matrices.
+
+    Parameters
+    ---------
+
+    `rotated` : ndarray(N, 3)
+    The rotated vectors.
+
+    `v` : ndarray(N, 3)
+    The vectors to rotate.
+
+    `rotations` : ndarray(M, 3, 3)
+    The rotation matrices.
+
+    `frames` : ndarray(int) (optional, default: None)
+    The index of the rotation of every vector. If not given, vector i is
+    rotated by matrix i.
+
+    `inverse` : bool (optional, default: False)
+    Whether to rotate by the inverse, i.e. transposed, matrices, e.g. to
+    transform vectors to the local frames of `frame_rotations`.
+
+    """
+    if frames is None:
+        if inverse:
+            rotated[:] = np.matmul(v[:, np.newaxis, :], rotations)[:, 0]
+        else:
+            rotated[:] = np.matmul(rotations, v[:, :, np.newaxis])[:, :, 0]
+        return
+
+    frames = np.asarray(frames)
+    changes = frames[1:] != frames[:-1]
+    if (np.count_nonzero(changes) + 1) * MIN_RUN <= frames.size:
+        # Every run of vectors sharing a frame is rotated by one product.
+        starts = np.append(0, np.flatnonzero(changes) + 1)
+        for start, stop in zip(starts, np.append(starts[1:], frames.size)):
+            matrix = rotations[frames[start]]
+            if not inverse:
+                matrix = matrix.T
+            rotated[start:stop] = v[start:stop] @ matrix
+    else:
+        for start in range(0, frames.size, CHUNK_SIZE):
+            chunk = slice(start, start + CHUNK_SIZE)
+            rotate(rotated[chunk],
+                   v[chunk],
+                   rotations[frames[chunk]],
+                   inverse=inverse)
@@ -8,10 +8,18 @@ Defines class `Hemisphere`.
 import matplotlib.pyplot as plt
 import numpy as np
 
+from spheal.euclidean import cartesian_from_spherical
+from spheal.overlap import ring_overlap
+from spheal.rings import RingTessellation, _read_only
+from spheal.tables import boundary_table
 from spheal.zone import Zone
 
+# The number of passes of the closed-form solver of the zones before it
+# follows the recurrence one zone at a time.
+MAX_PASSES = 8
 
-class Hemisphere:
+
+class Hemisphere(RingTessellation):
     """
     Equal-area hemisphere tessellation based on Beckers & Beckers (2012).
 
@@ -32,6 +40,16 @@ class Hemisphere:
     `patch_number`: int
     The total number of patches in the hemisphere.
 
+    `offsets`: ndarray(int)
+    The index of the first patch of every zone, and the total number of
+    patches.
+
+    `inner, outer`: ndarray, ndarray
+    The inner and outer zenith angles of every zone.
+
+    `numbers`: ndarray(int)
+    The number of patches of every zone.
+
     Notes
     -----
 
@@ -44,13 +62,30 @@ class Hemisphere:
       fail to converge to a solution. For instance, for 1000 patches, aspect
       ratios > 50 and < 0.15 are prone to give inaccurate results.
 
+    - With `analytic=True`, the zenithal extents and number of patches of every
+      zone are computed at once from the closed form of Eqs. (1) and (20), and
+      then corrected so that the result is identical to the one of the
+      iterative recurrence.
+
+    - With `strict=True`, the enclosed numbers of patches are checked to
+      decrease zone by zone in a single vectorized pass, and the zones
+      past the first invalid one are merged into the innermost valid zone
+      and the polar cap. This only changes tessellations that would otherwise
+      contain zones without patches.
+
     """
 
+    _ring_class = Zone
+    _ring_name = "zones"
+
     def __init__(self,
                  radius: float,
                  n_patches: int,
                  patch_aspect: float,
-                 draw=False):
+                 draw=False,
+                 analytic=False,
+                 dtype=None,
+                 strict=False):
         """
         Parameters
         ----------
@@ -67,36 +102,29 @@ class Hemisphere:
         `draw`: bool (default: False)
         Whether to draw the resulting tessellation to a PDF.
 
-        """
-        self._radius = radius
-        self._patch_aspect = patch_aspect
+        `analytic`: bool (default: False)
+        Whether to compute all zones at once in closed form instead of
+        iterating over them one at a time. Both give the same tessellation.
 
-        l = 0
-        theta_lm1 = 0.5 * np.pi
-        r_lm1 = self._r(theta_lm1)
-        k_lm1 = n_patches
+        `dtype`: numpy.dtype (default: None)
+        The floating-point type of the extents of every zone and of the
+        per-patch arrays. If not given, the default type of `spheal.precision`
+        is used. The extents are always computed in double precision.
 
-        # Maximum integer l for which theta_l > 0.
-        lmax = np.floor(
-            (radius * theta_lm1 / r_lm1) *
-            np.sqrt(n_patches * patch_aspect / np.pi)).astype(dtype=np.int64)
-
-        self._zones = []
-        while l < lmax:
-            l += 1
-            theta_l = self._theta_l(theta_lm1, r_lm1, k_lm1)
-            r_l = self._r(theta_l)
-            k_l = self._k_l(k_lm1, r_lm1, r_l)
+        `strict`: bool (default: False)
+        Whether to guarantee that every zone holds at least one patch, so that
+        the zones partition the hemisphere into exactly `n_patches` patches.
+        The rounding residuals of Eq. (1) near the pole, which may leave zones
+        with no or a negative number of patches, are then gathered into the
+        innermost valid zone.
 
-            if l == lmax:
-                r_inn = r_lm1 / np.sqrt(k_lm1)
-                theta_inn = 2. * np.arcsin(0.5 * r_inn / radius)
-                self._zones.append(Zone((theta_inn, theta_lm1), k_lm1 - 1))
-                self._zones.append(Zone((0., theta_inn), 1))
-
-            else:
-                self._zones.append(Zone((theta_l, theta_lm1), k_lm1 - k_l))
-                theta_lm1, r_lm1, k_lm1 = theta_l, r_l, k_l
+        """
+        super().__init__(radius,
+                         n_patches,
+                         patch_aspect,
+                         analytic=analytic,
+                         dtype=dtype,
+                         strict=strict)
 
         if draw:
             self.draw_lambert_proj()
@@ -106,8 +134,14 @@ class Hemisphere:
         """
         The zones covering the hemisphere.
 
+        They are built from the arrays of zone extents and numbers of patches
+        on first access and cached.
+
         """
-        return self._zones
+        if self._ring_objects is None:
+            self._ring_objects = self._build_ring_objects(
+                self._inner, self._outer, self._numbers)
+        return self._ring_objects
 
     @property
     def radius(self):
@@ -117,13 +151,480 @@ class Hemisphere:
         """
         return self._radius
 
+    @property
+    def patch_aspect(self):
+        """
+        The aspect ratio requested for every patch.
+
+        """
+        return self._patch_aspect
+
+    @property
+    def adjacency(self):
+        """
+        The neighbors of every patch in compressed sparse row format.
+
+        This is a tuple `(indptr, indices)` such that the neighbors of patch p,
+        numbered as described in `patch_quality`, are
+        `indices[indptr[p]:indptr[p + 1]]` in increasing order. Two patches are
+        neighbors if they share a boundary of nonzero length, i.e. a meridian
+        arc within a zone or a parallel arc between adjacent zones. It is built
+        on first access and cached.
+
+        """
+        if self._adjacency is None:
+            self._adjacency = self._build_adjacency()
+        return self._adjacency
+
     @property
     def patch_number(self):
         """
         The number of patches covering the hemisphere.
 
         """
-        return sum(zone.patch_number for zone in self._zones)
+        return int(self._offsets[-1])
+
+    @property
+    def offsets(self):
+        """
+        The index of the first patch of every zone, numbered as described in
+        `patch_quality`, followed by the total number of patches. The array is
+        read-only.
+
+        """
+        return _read_only(self._offsets)
+
+    @property
+    def inner(self):
+        """
+        The inner zenith angle of every zone, from the outermost to the
+        innermost one, in double precision. The array is read-only.
+
+        """
+        return _read_only(self._inner)
+
+    @property
+    def outer(self):
+        """
+        The outer zenith angle of every zone, from the outermost to the
+        innermost one, in double precision. The array is read-only.
+
+        """
+        return _read_only(self._outer)
+
+    @property
+    def numbers(self):
+        """
+        The number of patches of every zone, from the outermost to the
+        innermost one. The array is read-only.
+
+        """
+        return _read_only(self._numbers)
+
+    @property
+    def dtype(self):
+        """
+        The floating-point type of the extents of every zone and of the
+        per-patch arrays.
+
+        """
+        return self._dtype
+
+    @property
+    def strict(self):
+        """
+        Whether every zone is guaranteed to hold at least one patch.
+
+        """
+        return self._strict
+
+    def _rings(self, n_patches, lmax):
+        """
+        Compute the number of patches enclosed by, and the zenith angle of, the
+        outer parallel of every zone l = 0, ..., lmax - 1, one zone at a time.
+
+        """
+        k = np.empty(lmax, dtype=np.int64)
+        theta = np.empty(lmax)
+
+        theta_lm1 = 0.5 * np.pi
+        r_lm1 = self._r(theta_lm1)
+        k_lm1 = n_patches
+        for l in range(lmax):
+            k[l], theta[l] = k_lm1, theta_lm1
+            theta_l = self._theta_l(theta_lm1, r_lm1, k_lm1)
+            r_l = self._r(theta_l)
+            k_l = self._k_l(k_lm1, r_lm1, r_l)
+            theta_lm1, r_lm1, k_lm1 = theta_l, r_l, k_l
+
+        return k, theta
+
+    @staticmethod
+    def _rings_analytic(radius, n_patches, patch_aspect):
+        """
+        Compute the same arrays as `_rings`, but for all zones at once.
+
+        Without rounding, K = k_l / sin^2(theta_l / 2) is conserved by Eq. (1),
+        and Eq. (20) reduces to constant steps theta_l - theta_lm1 =
+        -2 sqrt(pi / (a K)). Starting from this guess, each pass re-evaluates
+        both equations for all zones from the previous pass, corrects the
+        first zone whose number of patches is wrong, and restarts the closed
+        form from there. The guess drifts away from the rounded recurrence
+        towards the pole, so after `MAX_PASSES` passes the zones past the
+        first mismatch follow the recurrence one at a time instead, which
+        keeps the cost linear in the number of zones. The zenith angles are
+        accumulated in the same order as the recurrence, so the arrays are
+        identical to `_rings`.
+
+        """
+        lmax = Hemisphere._lmax(n_patches, patch_aspect)
+        aspect = patch_aspect
+        theta_0 = 0.5 * np.pi
+        l = np.arange(lmax)
+
+        # Eq. (16)
+        def r(theta):
+            return 2.0 * radius * np.sin(0.5 * theta)
+
+        def closed_form(theta_m, k_m, steps):
+            K = k_m / np.sin(0.5 * theta_m)**2.0
+            theta = theta_m - steps * 2.0 * np.sqrt(np.pi / (aspect * K))
+            return np.rint(K * np.sin(0.5 * theta)**2.0), theta
+
+        k, theta = closed_form(theta_0, n_patches, l)
+        k[:1] = n_patches
+
+        # Zones up to m are exact.
+        m = 0
+        for _ in range(MAX_PASSES if lmax > 0 else 0):
+            increments = r(theta[:-1]) * np.sqrt(
+                np.pi / aspect / k[:-1]) / radius
+            theta_next = np.subtract.accumulate(
+                np.hstack((theta_0, increments)))
+            r_next = r(theta_next)
+
+            k_next = np.empty_like(k)
+            k_next[0] = n_patches
+            k_next[1:] = np.rint(k[:-1] * (r_next[1:] / r_next[:-1])**2.0)
+
+            # Zones past the pole give NaN, which should not count as a change.
+            k_changed = ~((k_next == k) | (np.isnan(k_next) & np.isnan(k)))
+            theta_changed = ~((theta_next == theta)
+                              | (np.isnan(theta_next) & np.isnan(theta)))
+            changed = np.flatnonzero(k_changed | theta_changed)
+            if changed.size == 0:
+                m = lmax
+                break
+
+            m = changed[0]
+            theta = theta_next
+            mismatch = np.flatnonzero(k_changed)
+            if mismatch.size > 0:
+                f = mismatch[0]
+                k[f] = k_next[f]
+                k[f + 1:], theta[f + 1:] = closed_form(theta[f], k[f],
+                                                       l[1:lmax - f])
+
+        # Eqs. (20) and (1), as in `_rings`, past the last exact zone.
+        for j in range(m + 1, lmax):
+            r_jm1 = r(theta[j - 1])
+            theta[j] = theta[j - 1] - r_jm1 * np.sqrt(
+                np.pi / aspect / k[j - 1]) / radius
+            k[j] = np.rint(k[j - 1] * (r(theta[j]) / r_jm1)**2.0)
+
+        return k.astype(dtype=np.int64), theta
+
+    @staticmethod
+    def _lmax(n_patches, patch_aspect):
+        # Maximum integer l for which theta_l > 0, i.e. Eq. (16) at the
+        # equator: r = sqrt(2) R.
+        return np.floor(
+            (0.5 * np.pi / np.sqrt(2.0)) *
+            np.sqrt(n_patches * patch_aspect / np.pi)).astype(dtype=np.int64)
+
+    @staticmethod
+    def _ring_arrays(radius, k, theta):
+        """
+        Compute the inner zenith angle, outer zenith angle and number of
+        patches of every zone, from the outermost to the innermost one, given
+        the arrays returned by `_rings`.
+
+        """
+        if k.size == 0:
+            return np.empty(0), np.empty(0), np.empty(0, dtype=np.int64)
+
+        # Force innermost patch to be a polar cap.
+        r_inn = 2.0 * radius * np.sin(0.5 * theta[-1]) / np.sqrt(k[-1])
+        outer = np.append(theta, 2. * np.arcsin(0.5 * r_inn / radius))
+        inner = np.append(outer[1:], 0.)
+        numbers = np.append(k[:-1] - k[1:], (k[-1] - 1, 1))
+
+        return inner, outer, numbers
+
+    @staticmethod
+    def _outer_edge(radius):
+        return 0.5 * np.pi
+
+    @staticmethod
+    def _ring_quality(radius, inner, outer, numbers):
+        """
+        Compute the area and the aspect ratio of the patches of every zone.
+
+        The aspect ratio is the ratio of the area to the squared zenithal arc
+        length, i.e. the mean azimuthal width of a patch over its height.
+
+        """
+        area = 2.0 * np.pi * radius**2.0 * (np.cos(inner) -
+                                            np.cos(outer)) / numbers
+        aspect = area / (radius * (outer - inner))**2.0
+        return area, aspect
+
+    @staticmethod
+    def _summary(radius, inner, outer, numbers, patch_aspect):
+        """
+        Compute the root-mean-square relative deviation of the patch aspect
+        ratios from `patch_aspect`, and of the patch areas from the mean area.
+
+        Every patch is weighted equally. The polar cap is not bounded by
+        meridians, so it is left out of the aspect deviation.
+
+        """
+        area, aspect = Hemisphere._ring_quality(radius, inner, outer, numbers)
+        aspect_deviation = np.inf
+        if numbers.size > 1:
+            aspect_deviation = np.sqrt(
+                np.average((aspect[:-1] / patch_aspect - 1.0)**2.0,
+                           weights=numbers[:-1]))
+
+        mean_area = 2.0 * np.pi * radius**2.0 / np.sum(numbers)
+        area_error = np.sqrt(
+            np.average((area / mean_area - 1.0)**2.0, weights=numbers))
+
+        return {
+            "patch_aspect": patch_aspect,
+            "aspect_deviation": aspect_deviation,
+            "area_error": area_error
+        }
+
+    def patch_quality(self):
+        """
+        Compute the area and aspect ratio of every patch, and summarize how
+        much they deviate from the ideal ones.
+
+        Patches are numbered from the outermost zone inwards and, within each
+        zone, by increasing azimuth.
+
+        Returns
+        -------
+
+        `quality`: dict
+        The per-patch arrays 'area', 'aspect' and 'deviation', the latter
+        being the relative deviation of the aspect ratio from `patch_aspect`
+        (NaN for the polar cap). Also the summary values 'patch_aspect',
+        'aspect_deviation' and 'area_error' described in `search_aspect`, and
+        the largest absolute relative deviations 'max_aspect_deviation' and
+        'max_area_error'.
+
+        """
+        self._check_numbers("have no quality")
+
+        # Rings without patches have no area, and are left out.
+        kept = self._numbers > 0
+        inner, outer = self._inner[kept], self._outer[kept]
+        numbers = self._numbers[kept]
+        area, aspect = self._ring_quality(self._radius, inner, outer, numbers)
+        deviation = aspect / self._patch_aspect - 1.0
+        deviation[-1:] = np.nan
+        area_error = area / np.average(area, weights=numbers) - 1.0
+
+        quality = self._summary(self._radius, inner, outer, numbers,
+                                self._patch_aspect)
+        quality["max_aspect_deviation"] = np.nanmax(np.abs(deviation),
+                                                    initial=0.0)
+        quality["max_area_error"] = np.max(np.abs(area_error))
+        dtype = self._dtype
+        quality["area"] = np.repeat(area.astype(dtype), numbers)
+        quality["aspect"] = np.repeat(aspect.astype(dtype), numbers)
+        quality["deviation"] = np.repeat(deviation.astype(dtype), numbers)
+
+        return quality
+
+    def sample_patches(self, points, counts, rng=None):
+        """
+        Draw points uniformly distributed within every patch.
+
+        The zenith angle of each point is drawn by inverse-transform sampling
+        of cos(theta) between the zenithal extents of its zone, and the azimuth
+        uniformly between the extents of its patch. No draw is rejected.
+
+        Parameters
+        ----------
+
+        `points` : ndarray(M, 3)
+        The `x, y, z` Cartesian coordinates of the M points, stored patch by
+        patch in the order described in `patch_quality`.
+
+        `counts` : int or ndarray(int)
+        The number of points to draw in each patch, either the same for every
+        patch or one value per patch.
+
+        `rng` : numpy.random.Generator (optional, default: None)
+        The random number generator to draw from. If not given, a new one is
+        created from fresh entropy.
+
+        """
+        counts = np.broadcast_to(counts, self._offsets[-1:])
+        total = np.sum(counts)
+        if not points.shape[0] == total:
+            msg = ("Number of points should be " + str(total) + ". Got " +
+                   str(points.shape[0]))
+            raise ValueError(msg)
+
+        if rng is None:
+            rng = np.random.default_rng()
+
+        self._check_numbers("cannot be sampled")
+
+        patches = np.repeat(np.arange(counts.size), counts)
+        rings = np.repeat(np.arange(self._numbers.size),
+                          self._numbers)[patches]
+        self._sample_within(points, patches, rings, rng)
+
+    def sample_within(self, points, patches, rng=None):
+        """
+        Draw one point uniformly distributed within each of the given patches,
+        as described in `sample_patches`.
+
+        Parameters
+        ----------
+
+        `points` : ndarray(M, 3)
+        The `x, y, z` Cartesian coordinates of the M points.
+
+        `patches` : ndarray(int)
+        The patch of every point, numbered as described in `patch_quality`.
+
+        `rng` : numpy.random.Generator (optional, default: None)
+        The random number generator to draw from. If not given, a new one is
+        created from fresh entropy.
+
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+
+        rings = np.searchsorted(self._offsets, patches, side="right") - 1
+        self._sample_within(points, patches, rings, rng)
+
+    def _sample_within(self, points, patches, rings, rng):
+        """
+        Draw one point uniformly distributed within each of the given patches,
+        as described in `sample_patches`, given the zone of every patch.
+
+        """
+        total = patches.size
+        inner, outer = self._inner[rings], self._outer[rings]
+
+        # Patch m of a ring with n patches spans 2 pi m / n to 2 pi (m + 1) / n
+        phi = 2.0 * np.pi * (patches - self._offsets[rings] +
+                             rng.random(total)) / self._numbers[rings]
+
+        cos_inner = np.cos(inner)
+        theta = np.arccos(cos_inner + rng.random(total) *
+                          (np.cos(outer) - cos_inner))
+        cartesian_from_spherical(points, np.full(total, self._radius), theta,
+                                 phi)
+
+    def patch_centers(self, theta, phi, patches=None):
+        """
+        Compute the center of every patch.
+
+        The zenith angle of a center splits the area of its zone in halves, and
+        its azimuth lies halfway between the extents of its patch. The center
+        of the polar cap is the pole.
+
+        Parameters
+        ----------
+
+        `theta, phi` : ndarray, ndarray
+        The spherical angles of the centers, stored in the order described in
+        `patch_quality`, or in the order of `patches`.
+
+        `patches` : ndarray(int) (optional, default: None)
+        The patches whose centers to compute, numbered as described in
+        `patch_quality`. If not given, the centers of every patch are computed.
+
+        """
+        numbers, offsets = self._numbers, self._offsets
+        if patches is None:
+            patches = np.arange(offsets[-1])
+            rings = np.repeat(np.arange(numbers.size), numbers)
+        else:
+            rings = np.searchsorted(offsets, patches, side="right") - 1
+
+        center = np.arccos(0.5 * (np.cos(self._inner) + np.cos(self._outer)))
+        center[-1:] = 0.0
+        theta[:] = center[rings]
+        phi[:] = 2.0 * np.pi * (patches - offsets[rings] +
+                                0.5) / numbers[rings]
+        phi[np.isin(patches, offsets[-2:-1])] = 0.0
+
+    def overlap(self, other):
+        """
+        Compute the area shared by every patch of this hemisphere and every
+        patch of another one of the same radius.
+
+        A patch spans intervals of `-cos(theta)` and `phi`, and its area is
+        `radius^2` times the product of their lengths. The overlaps are found
+        exactly as described in `overlap.ring_overlap`.
+
+        Parameters
+        ----------
+
+        `other` : Hemisphere
+        The other tessellation.
+
+        Returns
+        -------
+
+        `areas` : CSRMatrix
+        The shared areas, with one row per patch of this hemisphere and one
+        column per patch of `other`, numbered as described in `patch_quality`.
+
+        """
+        if not self._radius == other.radius:
+            msg = ("Hemispheres should have the same radius. Got " +
+                   str(self._radius) + " and " + str(other.radius))
+            raise ValueError(msg)
+
+        areas = ring_overlap(-np.cos(self._inner), -np.cos(self._outer),
+                             self._numbers, -np.cos(other.inner),
+                             -np.cos(other.outer), other.numbers)
+        return areas.scale_rows(np.full(areas.shape[0], self._radius**2.0))
+
+    def locate_patches(self, patches, theta, phi):
+        """
+        Find the patch containing each of the given points.
+
+        Parameters
+        ----------
+
+        `patches` : ndarray(int)
+        The index of the patch containing each point, numbered as described in
+        `patch_quality`.
+
+        `theta, phi` : ndarray, ndarray
+        The spherical angles of the points. Points below the equator are
+        assigned to the outermost zone.
+
+        """
+        inner, numbers = self._inner, self._numbers
+        rings = inner.size - np.searchsorted(inner[::-1], theta, side="right")
+        rings = np.minimum(rings, inner.size - 1)
+
+        m = np.floor(
+            np.mod(phi, 2.0 * np.pi) * numbers[rings] /
+            (2.0 * np.pi)).astype(dtype=np.int64)
+        patches[:] = self._offsets[rings] + np.minimum(m, numbers[rings] - 1)
 
     # Eq. (1)
     def _k_l(self, k_lm1, r_lm1, r_l):
@@ -149,15 +650,13 @@ class Hemisphere:
         The name of the figure to draw.
 
         """
-        dense_phi = np.linspace(0., 2. * np.pi, 100)
-        dense_cos, dense_sin = np.cos(dense_phi), np.sin(dense_phi)
+        dense_cos, dense_sin = boundary_table(99)
 
         fig, ax = plt.subplots()
-        for zone in self._zones:
+        for zone in self.zones:
             ri, ro = self._r(zone.extents[0]), self._r(zone.extents[1])
-            phi = zone.patch_extents
-            cos_phi, sin_phi = np.cos(phi), np.sin(phi)
-            if len(phi) > 2:
+            if zone.patch_number > 1:
+                cos_phi, sin_phi = zone.patch_boundaries
                 ax.plot(np.array([ri * cos_phi, ro * cos_phi]),
                         np.array([ri * sin_phi, ro * sin_phi]),
                         color="purple",
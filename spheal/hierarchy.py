@@ -0,0 +1,162 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class `Hierarchy`.
+
+"""
+
+from spheal.hemisphere import Hemisphere
+
+
+class Hierarchy:
+    """
+    Tessellations of the same domain at several resolutions, with the sparse
+    matrices transferring per-patch averages between consecutive levels.
+
+    Level 0 is the finest tessellation. Between levels l and l + 1, the
+    restriction averages the values of the patches of level l over every
+    patch of level l + 1, weighted by their shared areas, and the
+    prolongation does the converse. Both conserve the integral of the values
+    over the domain, and map constant values to themselves.
+
+    Attributes
+    ----------
+
+    `levels` : list
+    The tessellation at every level, from the finest to the coarsest.
+
+    `restrictions` : list
+    The matrix mapping the per-patch values of level l to level l + 1.
+
+    `prolongations` : list
+    The matrix mapping the per-patch values of level l + 1 to level l.
+
+    """
+
+    def __init__(self,
+                 radius: float,
+                 n_patches,
+                 patch_aspect: float,
+                 tessellation=Hemisphere,
+                 dtype=None):
+        """
+        Parameters
+        ----------
+
+        `radius`: float
+        The radius of every tessellation.
+
+        `n_patches`: list(int)
+        The total number of patches of every level, in any order.
+
+        `patch_aspect`: float
+        The aspect ratio of the patches of every level.
+
+        `tessellation`: class (optional, default: Hemisphere)
+        The class of the tessellations, which should provide an `overlap`
+        function like `Hemisphere.overlap`.
+
+        `dtype`: numpy.dtype (default: None)
+        The floating-point type of the tessellations.
+
+        """
+        self._levels = [
+            tessellation(radius, n, patch_aspect, analytic=True, dtype=dtype)
+            for n in sorted(n_patches, reverse=True)
+        ]
+
+        self._restrictions, self._prolongations = [], []
+        for fine, coarse in zip(self._levels[:-1], self._levels[1:]):
+            areas = fine.overlap(coarse)
+            transposed = areas.transpose()
+            self._prolongations.append(
+                areas.scale_rows(1.0 / areas.sum(axis=1)))
+            self._restrictions.append(
+                transposed.scale_rows(1.0 / transposed.sum(axis=1)))
+
+    @property
+    def levels(self):
+        """
+        The tessellation at every level, from the finest to the coarsest.
+
+        """
+        return self._levels
+
+    @property
+    def restrictions(self):
+        """
+        The matrix mapping the per-patch values of level l to level l + 1.
+
+        """
+        return self._restrictions
+
+    @property
+    def prolongations(self):
+        """
+        The matrix mapping the per-patch values of level l + 1 to level l.
+
+        """
+        return self._prolongations
+
+    def _check_levels(self, finest, coarsest):
+        if not 0 <= finest <= coarsest < len(self._levels):
+            msg = ("Levels should be in range [0, " +
+                   str(len(self._levels) - 1) + "]. Got " + str(finest) +
+                   " and " + str(coarsest))
+            raise ValueError(msg)
+
+    def restrict(self, values, level=0, levels=1):
+        """
+        Average per-patch values over coarser patches.
+
+        Parameters
+        ----------
+
+        `values` : ndarray(P) or ndarray(P, m)
+        The values at every patch of `level`, or m such sets as columns.
+
+        `level` : int (optional, default: 0)
+        The level of the given values.
+
+        `levels` : int (optional, default: 1)
+        The number of levels to coarsen.
+
+        Returns
+        -------
+
+        `restricted` : ndarray
+        The values at every patch of level `level + levels`.
+
+        """
+        self._check_levels(level, level + levels)
+        for l in range(level, level + levels):
+            values = self._restrictions[l] @ values
+        return values
+
+    def prolong(self, values, level, levels=1):
+        """
+        Distribute per-patch values over finer patches.
+
+        Parameters
+        ----------
+
+        `values` : ndarray(P) or ndarray(P, m)
+        The values at every patch of `level`, or m such sets as columns.
+
+        `level` : int
+        The level of the given values.
+
+        `levels` : int (optional, default: 1)
+        The number of levels to refine.
+
+        Returns
+        -------
+
+        `prolonged` : ndarray
+        The values at every patch of level `level - levels`.
+
+        """
+        self._check_levels(level - levels, level)
+        for l in range(level - 1, level - levels - 1, -1):
+            values = self._prolongations[l] @ values
+        return values
@@ -0,0 +1,375 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class `ParticleIndex`.
+
+"""
+
+import numpy as np
+
+# Cell coordinates are packed in a single integer key, 21 bits per axis.
+_BITS = 21
+_BIAS = 1 << (_BITS - 1)
+
+
+class ParticleIndex:
+    """
+    A spatial index over the Cartesian coordinates of a cloud of particles,
+    such as the ones initialized on shells by a distribution of
+    `spheal.distributions` and `euclidean.cartesian_from_spherical`.
+
+    The particles are binned in a uniform grid of cubic cells and stored cell
+    by cell. Every query is vectorized over batches of probe points.
+
+    Attributes
+    ----------
+
+    `points` : ndarray(N, 3)
+    The Cartesian coordinates of the particles.
+
+    `cell_size` : float
+    The side of the cells.
+
+    """
+
+    def __init__(self, points, cell_size=None, occupancy=8):
+        """
+        Parameters
+        ----------
+
+        `points` : ndarray(N, 3)
+        The Cartesian coordinates of the N particles.
+
+        `cell_size` : float (optional, default: None)
+        The side of the cells. If not given, it is chosen so that occupied
+        cells hold about `occupancy` particles.
+
+        `occupancy` : int (optional, default: 8)
+        The target number of particles per occupied cell.
+
+        """
+        points = np.asarray(points)
+        if not (points.ndim == 2 and points.shape[1] == 3
+                and points.shape[0] > 0):
+            msg = "Particle coordinates should have shape (N, 3). Got " + str(
+                points.shape)
+            raise ValueError(msg)
+
+        self._points = points
+        self._origin = np.min(points, axis=0).astype(np.float64)
+
+        if cell_size is None:
+            cell_size = self._default_cell_size(occupancy)
+        if not cell_size > 0.0:
+            msg = "Cell size should be positive. Got " + str(cell_size)
+            raise ValueError(msg)
+        self._cell_size = float(cell_size)
+
+        keys = self._keys(points)
+        self._order = np.argsort(keys, kind="stable")
+        keys = keys[self._order]
+        # Stored by axis, so that distances are computed one axis at a time.
+        self._sorted = np.ascontiguousarray(points[self._order].T,
+                                            dtype=np.float64)
+
+        first = np.append(True, np.diff(keys) > 0)
+        self._cells = keys[first]
+        self._starts = np.append(np.flatnonzero(first), keys.size)
+
+        coords = self._unpack(self._cells)
+        self._lower = np.min(coords, axis=0)
+        self._upper = np.max(coords, axis=0)
+
+    @property
+    def points(self):
+        """
+        The Cartesian coordinates of the particles.
+
+        """
+        return self._points
+
+    @property
+    def cell_size(self):
+        """
+        The side of the cells.
+
+        """
+        return self._cell_size
+
+    def _default_cell_size(self, occupancy):
+        # Start from the cells of a uniformly filled bounding box, and correct
+        # the size assuming the particles fill a surface, as shells do.
+        N = self._points.shape[0]
+        extent = np.max(np.ptp(self._points, axis=0))
+        if extent == 0.0:
+            return 1.0
+
+        cell_size = extent / max(N / occupancy, 1.0)**(1.0 / 3.0)
+        for _ in range(3):
+            self._cell_size = cell_size
+            keys = np.sort(self._keys(self._points))
+            occupied = 1 + np.count_nonzero(np.diff(keys))
+            cell_size *= np.sqrt(occupancy * occupied / N)
+
+        return min(cell_size, extent)
+
+    def _coords(self, points):
+        coords = np.floor(
+            (np.asarray(points, dtype=np.float64) - self._origin) /
+            self._cell_size)
+        if np.any(np.abs(coords) >= _BIAS):
+            msg = ("Points should lie within " + str(_BIAS) +
+                   " cells of the particles.")
+            raise ValueError(msg)
+        return coords.astype(np.int64)
+
+    def _keys(self, points):
+        return self._pack(self._coords(points))
+
+    @staticmethod
+    def _pack(coords):
+        coords = coords + _BIAS
+        return (coords[..., 0] << 2 * _BITS) | (
+            coords[..., 1] << _BITS) | coords[..., 2]
+
+    @staticmethod
+    def _unpack(keys):
+        mask = (1 << _BITS) - 1
+        return np.stack(
+            ((keys >> 2 * _BITS) & mask, (keys >> _BITS) & mask, keys & mask),
+            axis=-1) - _BIAS
+
+    @staticmethod
+    def _shifts(reach, shell=None):
+        # The cell offsets within `reach` cells along every axis. If `shell`
+        # is given, only the ones exactly `shell` cells away.
+        steps = np.arange(-reach, reach + 1)
+        shifts = np.stack(np.meshgrid(steps, steps, steps, indexing="ij"),
+                          axis=-1).reshape(-1, 3)
+        if shell is not None:
+            shifts = shifts[np.max(np.abs(shifts), axis=1) == shell]
+        return shifts
+
+    def _candidates(self, coords, shift):
+        # For every probe in a cell with the given coordinates, the range of
+        # sorted particles in the cell at the given offset.
+        keys = self._pack(coords + shift)
+        position = np.minimum(np.searchsorted(self._cells, keys),
+                              self._cells.size - 1)
+        found = self._cells[position] == keys
+        start = self._starts[position]
+        stop = np.where(found, self._starts[position + 1], start)
+        return start, stop
+
+    @staticmethod
+    def _expand(probes, start, stop):
+        # The pairs of probe and sorted particle over every range.
+        lengths = np.maximum(stop - start, 0)
+        pairs = np.repeat(probes, lengths)
+        particles = np.arange(pairs.size) + np.repeat(
+            start - np.cumsum(lengths) + lengths, lengths)
+        return pairs, particles
+
+    def _distances(self, points, probes, particles):
+        # Both `points` and the sorted particles are stored by axis.
+        squared = np.zeros(probes.size)
+        for axis in range(3):
+            squared += (points[axis][probes] -
+                        self._sorted[axis][particles])**2
+        return np.sqrt(squared)
+
+    def query_radius(self, points, radius, chunk=2**14):
+        """
+        Find the particles closer than `radius` to each of the given points.
+
+        Parameters
+        ----------
+
+        `points` : ndarray(M, 3)
+        The Cartesian coordinates of the M probe points.
+
+        `radius` : float
+        The largest distance to a neighbor. The cost grows with the cube of
+        `radius / cell_size`.
+
+        `chunk` : int (optional, default: 2**14)
+        The number of probe points processed at once.
+
+        Returns
+        -------
+
+        `indptr, indices, distances` : ndarray(M + 1), ndarray, ndarray
+        The neighbors of the probe point `i` are the particles
+        `indices[indptr[i]:indptr[i + 1]]`, in increasing order, at the
+        distances `distances[indptr[i]:indptr[i + 1]]`.
+
+        """
+        coords = self._coords(points)
+        points = np.ascontiguousarray(np.asarray(points, dtype=np.float64).T)
+        shifts = self._shifts(int(np.ceil(radius / self._cell_size)))
+
+        found_probes, found_particles, found_distances = [], [], []
+        for first in range(0, points.shape[1], chunk):
+            probes = np.arange(first, min(first + chunk, points.shape[1]))
+            for shift in shifts:
+                start, stop = self._candidates(coords[probes], shift)
+                pairs, particles = self._expand(probes, start, stop)
+                distances = self._distances(points, pairs, particles)
+                close = distances <= radius
+                found_probes.append(pairs[close])
+                found_particles.append(self._order[particles[close]])
+                found_distances.append(distances[close])
+
+        probes = np.concatenate(found_probes)
+        indices = np.concatenate(found_particles)
+        distances = np.concatenate(found_distances)
+
+        order = np.lexsort((indices, probes))
+        indptr = np.append(
+            0, np.cumsum(np.bincount(probes, minlength=points.shape[1])))
+
+        return indptr, indices[order], distances[order]
+
+    def query_knn(self, points, k, chunk=2**14):
+        """
+        Find the `k` particles nearest to each of the given points.
+
+        Cubic shells of cells around every probe point are searched outwards
+        until the `k` nearest particles found so far are closer than any
+        unsearched cell.
+
+        Parameters
+        ----------
+
+        `points` : ndarray(M, 3)
+        The Cartesian coordinates of the M probe points.
+
+        `k` : int
+        The number of neighbors, at most the number of particles.
+
+        `chunk` : int (optional, default: 2**14)
+        The number of probe points processed at once.
+
+        Returns
+        -------
+
+        `indices, distances` : ndarray(M, k), ndarray(M, k)
+        The neighbors of every probe point and their distances, in increasing
+        order of distance.
+
+        """
+        N = self._points.shape[0]
+        if not 0 < k <= N:
+            msg = ("Number of neighbors should be in range [1, " + str(N) +
+                   "]. Got " + str(k))
+            raise ValueError(msg)
+
+        coords = self._coords(points)
+        points = np.ascontiguousarray(np.asarray(points, dtype=np.float64).T)
+        M = points.shape[1]
+
+        indices = np.empty((M, k), dtype=np.int64)
+        distances = np.empty((M, k))
+        for first in range(0, M, chunk):
+            probes = np.arange(first, min(first + chunk, M))
+            best = np.full((probes.size, k), -1, dtype=np.int64)
+            best_distances = np.full((probes.size, k), np.inf)
+
+            # Beyond this many cells, no occupied cell is left.
+            reach = np.max(np.maximum(self._upper - coords[probes],
+                                      coords[probes] - self._lower),
+                           axis=1)
+
+            shell = 0
+            active = np.arange(probes.size)
+            while active.size > 0:
+                rows, particles = [], []
+                for shift in self._shifts(shell, shell):
+                    start, stop = self._candidates(coords[probes[active]],
+                                                   shift)
+                    found_rows, found = self._expand(np.arange(active.size),
+                                                     start, stop)
+                    rows.append(found_rows)
+                    particles.append(found)
+                rows = np.concatenate(rows)
+                order = np.argsort(rows, kind="stable")
+                rows = rows[order]
+                particles = np.concatenate(particles)[order]
+                found_distances = self._distances(points[:, probes[active]],
+                                                  rows, particles)
+
+                # Merge the candidates with the best particles so far, one
+                # row per probe point.
+                counts = np.bincount(rows, minlength=active.size)
+                columns = k + np.arange(rows.size) - np.repeat(
+                    np.cumsum(counts) - counts, counts)
+                merged = np.full((active.size, k + np.max(counts)), -1)
+                merged_distances = np.full(merged.shape, np.inf)
+                merged[:, :k] = best[active]
+                merged_distances[:, :k] = best_distances[active]
+                merged[rows, columns] = particles
+                merged_distances[rows, columns] = found_distances
+
+                kept = np.argpartition(merged_distances, k - 1, axis=1)[:, :k]
+                kept_distances = np.take_along_axis(merged_distances, kept, 1)
+                ranked = np.argsort(kept_distances, axis=1)
+                best[active] = np.take_along_axis(
+                    np.take_along_axis(merged, kept, 1), ranked, 1)
+                best_distances[active] = np.take_along_axis(
+                    kept_distances, ranked, 1)
+
+                # Every unsearched particle lies farther than `shell` cells.
+                done = (best_distances[active, -1]
+                        <= shell * self._cell_size) | (shell >= reach[active])
+                active = active[~done]
+                shell += 1
+
+            indices[probes] = self._order[best]
+            distances[probes] = best_distances
+
+        return indices, distances
+
+    def query_pairs(self, radius, chunk=2**16):
+        """
+        Find every pair of particles closer than `radius`.
+
+        The pairs are yielded in chunks, so that the memory used does not grow
+        with the number of particles.
+
+        Parameters
+        ----------
+
+        `radius` : float
+        The largest distance between the particles of a pair.
+
+        `chunk` : int (optional, default: 2**16)
+        The number of particles whose pairs are yielded at once.
+
+        Yields
+        ------
+
+        `i, j, distances` : ndarray, ndarray, ndarray
+        The indices of the particles of every pair, with each pair yielded
+        once, and their distances.
+
+        """
+        coords = self._unpack(np.repeat(self._cells, np.diff(self._starts)))
+
+        # Only the cells following a cell in the key order are searched, plus
+        # the cell itself for the particles following a particle.
+        shifts = self._shifts(int(np.ceil(radius / self._cell_size)))
+        shifts = shifts[self._pack(shifts) >= self._pack(np.zeros(3, int))]
+
+        N = coords.shape[0]
+        for first in range(0, N, chunk):
+            i = np.arange(first, min(first + chunk, N))
+            for shift in shifts:
+                start, stop = self._candidates(coords[i], shift)
+                if not np.any(shift):
+                    start = i + 1
+                pairs, particles = self._expand(i, start, stop)
+                distances = self._distances(self._sorted, pairs, particles)
+
+                close = distances <= radius
+                yield (self._order[pairs[close]],
+                       self._order[particles[close]], distances[close])
@@ -0,0 +1,223 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines the following functions integrating over the patches of a
+`Hemisphere`, and class `PatchQuadrature`:
+
+- `solid_angles(omega, hemisphere)`
+  Computes the solid angle of every patch.
+
+- `view_factors(factors, hemisphere)`
+  Computes the view factor of every patch from the center of the base.
+
+Every patch spans `theta_i <= theta <= theta_o` and `phi_a <= phi <= phi_b`,
+so both have a closed form: the solid angle is
+`(cos theta_i - cos theta_o) (phi_b - phi_a)`, and the view factor, i.e. the
+cosine-weighted solid angle over pi, is
+`(sin^2 theta_o - sin^2 theta_i) (phi_b - phi_a) / (2 pi)`.
+
+"""
+
+import numpy as np
+
+
+def _ring_extents(hemisphere):
+    numbers = hemisphere.numbers
+    rings = np.repeat(np.arange(numbers.size), numbers)
+    return rings, 2.0 * np.pi / numbers[rings]
+
+
+def solid_angles(omega, hemisphere):
+    """
+    Compute the solid angle of every patch of a hemisphere.
+
+    Parameters
+    ----------
+
+    `omega` : ndarray
+    The solid angle of every patch, numbered as described in
+    `Hemisphere.patch_quality`.
+
+    `hemisphere` : Hemisphere
+    The tessellation.
+
+    """
+    rings, width = _ring_extents(hemisphere)
+    omega[:] = (np.cos(hemisphere.inner) -
+                np.cos(hemisphere.outer))[rings] * width
+
+
+def view_factors(factors, hemisphere):
+    """
+    Compute the view factor of every patch of a hemisphere from a
+    differential area at the center of its base, facing the pole.
+
+    The view factors of all the patches add up to one.
+
+    Parameters
+    ----------
+
+    `factors` : ndarray
+    The view factor of every patch, numbered as described in
+    `Hemisphere.patch_quality`.
+
+    `hemisphere` : Hemisphere
+    The tessellation.
+
+    """
+    rings, width = _ring_extents(hemisphere)
+    factors[:] = 0.5 * (np.sin(hemisphere.outer)**2.0 -
+                        np.sin(hemisphere.inner)**2.0)[rings] * width / np.pi
+
+
+class PatchQuadrature:
+    """
+    A tensor-product Gauss-Legendre rule on every patch of a hemisphere.
+
+    The nodes of every patch are placed in `cos(theta)` and `phi`, in which
+    the area element is uniform, so that the rule integrates exactly any
+    polynomial of degree lower than `2 order` in both. Integrands are
+    evaluated at the nodes of all the patches at once, and of many oriented
+    copies of the hemisphere at once if given.
+
+    Attributes
+    ----------
+
+    `order` : int
+    The number of nodes in each direction of every patch.
+
+    `directions` : ndarray(P, Q, 3)
+    The unit vectors of the Q nodes of every patch, in the frame of the
+    hemisphere.
+
+    `weights` : ndarray(P, Q)
+    The solid angle weights of the nodes of every patch, which add up to the
+    solid angle of the patch.
+
+    """
+
+    def __init__(self, hemisphere, order=4):
+        """
+        Parameters
+        ----------
+
+        `hemisphere` : Hemisphere
+        The tessellation.
+
+        `order` : int (optional, default: 4)
+        The number of nodes in each direction of every patch.
+
+        """
+        if order < 1:
+            msg = "Order should be at least 1. Got " + str(order)
+            raise ValueError(msg)
+
+        self._hemisphere = hemisphere
+        self._order = order
+
+        x, w = np.polynomial.legendre.leggauss(order)
+        offsets = hemisphere.offsets
+        rings, width = _ring_extents(hemisphere)
+        m = np.arange(offsets[-1]) - offsets[rings]
+
+        cos_inner = np.cos(hemisphere.inner)[rings]
+        cos_outer = np.cos(hemisphere.outer)[rings]
+        u = 0.5 * ((cos_inner + cos_outer)[:, np.newaxis] +
+                   (cos_inner - cos_outer)[:, np.newaxis] * x)
+        phi = width[:, np.newaxis] * (m[:, np.newaxis] + 0.5 + 0.5 * x)
+
+        # Nodes are ordered by u first, then by phi.
+        u = np.repeat(u, order, axis=1)
+        phi = np.tile(phi, order)
+        sin = np.sqrt(1.0 - u * u)
+
+        self._directions = np.stack((sin * np.cos(phi), sin * np.sin(phi), u),
+                                    axis=-1)
+        self._weights = (0.25 * (cos_inner - cos_outer) *
+                         width)[:, np.newaxis] * np.outer(w, w).ravel()
+
+    @property
+    def hemisphere(self):
+        """
+        The tessellation.
+
+        """
+        return self._hemisphere
+
+    @property
+    def order(self):
+        """
+        The number of nodes in each direction of every patch.
+
+        """
+        return self._order
+
+    @property
+    def directions(self):
+        """
+        The unit vectors of the nodes of every patch.
+
+        """
+        return self._directions
+
+    @property
+    def weights(self):
+        """
+        The solid angle weights of the nodes of every patch.
+
+        """
+        return self._weights
+
+    def integrate(self, integrand, oriented=None, cosine=False, chunk=64):
+        """
+        Integrate a function of direction over the solid angle of every patch.
+
+        Parameters
+        ----------
+
+        `integrand` : callable
+        The vectorized function to integrate. Without `oriented`, it is called
+        as `integrand(directions)` with the unit vectors of shape (P, Q, 3) of
+        `directions`, and returns the values of shape (P, Q). With `oriented`,
+        it is called as `integrand(directions, frames)` with the unit vectors
+        of shape (m, P, Q, 3) of the nodes of m copies, rotated to their
+        frames, and the indices of shape (m, 1, 1) of these copies, and
+        returns the values of shape (m, P, Q).
+
+        `oriented` : OrientedHemispheres (optional, default: None)
+        The oriented copies of the hemisphere to integrate over.
+
+        `cosine` : bool (optional, default: False)
+        Whether to weight the integrand by the cosine of the angle to the pole
+        of the hemisphere, as for view factors.
+
+        `chunk` : int (optional, default: 64)
+        The number of copies whose nodes are evaluated at once.
+
+        Returns
+        -------
+
+        `integrals` : ndarray(P) or ndarray(M, P)
+        The integral over every patch, or over every patch of every copy.
+
+        """
+        weights = self._weights
+        if cosine:
+            weights = weights * self._directions[:, :, 2]
+
+        if oriented is None:
+            return np.sum(integrand(self._directions) * weights, axis=-1)
+
+        if oriented.hemisphere is not self._hemisphere:
+            msg = "Oriented copies should be of the integrated hemisphere."
+            raise ValueError(msg)
+
+        rotations = oriented.rotations
+        integrals = np.empty((rotations.shape[0], weights.shape[0]))
+        for first in range(0, rotations.shape[0], chunk):
+            frames = np.arange(first, min(first + chunk, rotations.shape[0]))
+            directions = np.einsum("mij,pqj->mpqi", rotations[frames],
+                                   self._directions)
+            values = integrand(directions, frames[:, np.newaxis, np.newaxis])
+            integrals[frames] = np.sum(values * weights, axis=-1)
+        return integrals
@@ -0,0 +1,191 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class `OrientedHemispheres`.
+
+"""
+
+import numpy as np
+
+from spheal.euclidean import frame_rotations, rotate, spherical_from_cartesian
+
+
+class OrientedHemispheres:
+    """
+    Copies of one hemisphere tessellation, each oriented along its own normal.
+
+    The pole of every copy points along its normal, and its azimuth is measured
+    from the local x axis given by `euclidean.frame_rotations`. The rotation
+    matrix of every copy is computed once, so that directions in any number of
+    copies are transformed, located or sampled in a single vectorized pass.
+
+    Attributes
+    ----------
+
+    `hemisphere` : Hemisphere
+    The tessellation shared by every copy.
+
+    `normals` : ndarray(M, 3)
+    The unit normal of every copy.
+
+    `rotations` : ndarray(M, 3, 3)
+    The rotation matrix of every copy, whose columns are its local axes.
+
+    """
+
+    def __init__(self, hemisphere, normals):
+        """
+        Parameters
+        ----------
+
+        `hemisphere` : Hemisphere
+        The tessellation shared by every copy.
+
+        `normals` : ndarray(M, 3)
+        The normal of every copy. They are normalized to unit length.
+
+        """
+        normals = np.array(normals, dtype=np.float64, ndmin=2)
+        lengths = np.sqrt(np.sum(normals * normals, axis=1))
+        if not np.all(lengths > 0.0):
+            msg = ("Normals should be nonzero. Got " +
+                   str(normals[~(lengths > 0.0)]))
+            raise ValueError(msg)
+
+        self._hemisphere = hemisphere
+        self._normals = normals / lengths[:, np.newaxis]
+        self._rotations = np.empty((self._normals.shape[0], 3, 3))
+        frame_rotations(self._rotations, self._normals)
+
+    @property
+    def hemisphere(self):
+        """
+        The tessellation shared by every copy.
+
+        """
+        return self._hemisphere
+
+    @property
+    def normals(self):
+        """
+        The unit normal of every copy.
+
+        """
+        return self._normals
+
+    @property
+    def rotations(self):
+        """
+        The rotation matrix of every copy, whose columns are its local axes.
+
+        """
+        return self._rotations
+
+    def to_local(self, local, directions, frames):
+        """
+        Transform directions to the local frames of their copies.
+
+        Parameters
+        ----------
+
+        `local` : ndarray(N, 3)
+        The `x, y, z` coordinates of the directions in their local frames.
+
+        `directions` : ndarray(N, 3)
+        The `x, y, z` coordinates of the directions.
+
+        `frames` : ndarray(int)
+        The copy of every direction.
+
+        """
+        rotate(local, directions, self._rotations, frames, inverse=True)
+
+    def to_global(self, directions, local, frames):
+        """
+        Transform directions from the local frames of their copies.
+
+        Parameters
+        ----------
+
+        `directions` : ndarray(N, 3)
+        The `x, y, z` coordinates of the directions.
+
+        `local` : ndarray(N, 3)
+        The `x, y, z` coordinates of the directions in their local frames.
+
+        `frames` : ndarray(int)
+        The copy of every direction.
+
+        """
+        rotate(directions, local, self._rotations, frames)
+
+    def locate_patches(self, patches, directions, frames):
+        """
+        Find the patch of its copy containing each of the given directions.
+
+        Parameters
+        ----------
+
+        `patches` : ndarray(int)
+        The index of the patch containing each direction, numbered as
+        described in `Hemisphere.patch_quality`.
+
+        `directions` : ndarray(N, 3)
+        The `x, y, z` coordinates of the directions, which need not be unit
+        vectors. Directions below the base of their copy are assigned to its
+        outermost zone, as in `Hemisphere.locate_patches`.
+
+        `frames` : ndarray(int)
+        The copy of every direction.
+
+        """
+        local = np.empty((directions.shape[0], 3))
+        self.to_local(local, directions, frames)
+
+        theta, phi = np.empty(local.shape[0]), np.empty(local.shape[0])
+        spherical_from_cartesian(theta, phi, local[:, 0], local[:, 1],
+                                 local[:, 2])
+        self._hemisphere.locate_patches(patches, theta, phi)
+
+    def sample_patches(self, points, counts, rng=None):
+        """
+        Draw points uniformly distributed within every patch of every copy.
+
+        The points are drawn in the local frame of the shared tessellation, as
+        in `Hemisphere.sample_patches`, and then rotated to their copies.
+
+        Parameters
+        ----------
+
+        `points` : ndarray(M', 3)
+        The `x, y, z` Cartesian coordinates of the points, stored copy by copy
+        and, within a copy, patch by patch.
+
+        `counts` : int or ndarray(int)
+        The number of points to draw in each patch of each copy. Either a
+        single value, one value per patch shared by every copy, or an array of
+        shape (M, P) with one value per copy and patch.
+
+        `rng` : numpy.random.Generator (optional, default: None)
+        The random number generator to draw from. If not given, a new one is
+        created from fresh entropy.
+
+        """
+        counts = np.broadcast_to(
+            counts, (self._rotations.shape[0], self._hemisphere.patch_number))
+        total = np.sum(counts)
+        if not points.shape[0] == total:
+            msg = ("Number of points should be " + str(total) + ". Got " +
+                   str(points.shape[0]))
+            raise ValueError(msg)
+
+        local = np.empty((total, 3))
+        self._hemisphere.sample_patches(local, np.sum(counts, axis=0), rng)
+
+        # The local points are stored patch by patch; within a patch, assign
+        # them to the copies in order, then store them copy by copy.
+        frames = np.repeat(
+            np.tile(np.arange(counts.shape[0]), counts.shape[1]),
+            counts.T.ravel())
+        order = np.argsort(frames, kind="stable")
+        self.to_global(points, local[order], frames[order])
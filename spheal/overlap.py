@@ -0,0 +1,100 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines the following function computing the overlap of tessellations made of
+rings of patches, such as `Disk` and `Hemisphere`:
+
+- `ring_overlap(lower_a, upper_a, numbers_a, lower_b, upper_b, numbers_b)`
+  Computes the sparse matrix of overlaps between the patches of two
+  tessellations.
+
+"""
+
+import numpy as np
+
+from spheal.sparse import CSRMatrix
+
+
+def ring_overlap(lower_a, upper_a, numbers_a, lower_b, upper_b, numbers_b):
+    """
+    Compute the overlap between every patch of a tessellation A and every
+    patch of a tessellation B of the same domain.
+
+    Every ring spans an interval of a coordinate `u` in which the area is
+    uniform, e.g. `r^2` on a disk or `-cos(theta)` on a sphere, and is split
+    in patches of equal azimuthal extents starting at `phi = 0`. Patches are
+    numbered ring by ring, in the given order of the rings, and by increasing
+    azimuth within a ring.
+
+    The overlapping pairs of rings are found by sorting their boundaries in
+    `u`. Within a pair of rings with `n_a` and `n_b` patches, every azimuthal
+    boundary is an integer multiple of `2 pi / (n_a n_b)`, so the overlapping
+    pairs of patches are found exactly by merging the sorted integer
+    boundaries of all pairs of rings at once.
+
+    Parameters
+    ----------
+
+    `lower_a, upper_a, numbers_a` : ndarray, ndarray, ndarray(int)
+    The extents in `u` and the number of patches of every ring of A.
+
+    `lower_b, upper_b, numbers_b` : ndarray, ndarray, ndarray(int)
+    The extents in `u` and the number of patches of every ring of B.
+
+    Returns
+    -------
+
+    `overlap` : CSRMatrix
+    The product of the overlapping extents in `u` and in `phi` of every pair
+    of patches, with one row per patch of A and one column per patch of B.
+
+    """
+    numbers_a = np.asarray(numbers_a, dtype=np.int64)
+    numbers_b = np.asarray(numbers_b, dtype=np.int64)
+    offsets_a = np.append(0, np.cumsum(numbers_a))
+    offsets_b = np.append(0, np.cumsum(numbers_b))
+    shape = (offsets_a[-1], offsets_b[-1])
+
+    # Rings without patches have no width and tie with their neighbours, so
+    # they are left out. The other rings of each tessellation are disjoint,
+    # so sorting them by their lower extent also sorts their upper extents.
+    kept_a = np.flatnonzero(numbers_a > 0)
+    kept_b = np.flatnonzero(numbers_b > 0)
+    order = kept_b[np.argsort(lower_b[kept_b], kind="stable")]
+    first = np.searchsorted(upper_b[order], lower_a[kept_a], side="right")
+    last = np.searchsorted(lower_b[order], upper_a[kept_a], side="left")
+    lengths = np.maximum(last - first, 0)
+
+    ring_a = np.repeat(kept_a, lengths)
+    ring_b = order[np.arange(ring_a.size) +
+                   np.repeat(first - np.cumsum(lengths) + lengths, lengths)]
+    extent = np.minimum(upper_a[ring_a], upper_b[ring_b]) - np.maximum(
+        lower_a[ring_a], lower_b[ring_b])
+    overlapping = extent > 0.0
+    ring_a, ring_b = ring_a[overlapping], ring_b[overlapping]
+    extent = extent[overlapping]
+    if extent.size == 0:
+        return CSRMatrix(np.zeros(shape[0] + 1, dtype=np.int64),
+                         np.empty(0, dtype=np.int64), np.empty(0), shape)
+
+    n_a, n_b = numbers_a[ring_a], numbers_b[ring_b]
+    scale = np.append(0, np.cumsum(n_a * n_b))
+
+    # Patch m of ring a starts at m n_b, and patch m of ring b at m n_a.
+    pairs = np.arange(ring_a.size)
+    starts = []
+    for n, n_other in ((n_a, n_b), (n_b, n_a)):
+        pair = np.repeat(pairs, n)
+        m = np.arange(pair.size) - np.repeat(np.cumsum(n) - n, n)
+        starts.append(scale[pair] + m * n_other[pair])
+    starts = np.sort(np.concatenate(starts))
+    starts = starts[np.append(True, np.diff(starts) > 0)]
+    widths = np.diff(np.append(starts, scale[-1]))
+
+    pair = np.searchsorted(scale, starts, side="right") - 1
+    local = starts - scale[pair]
+    rows = offsets_a[ring_a[pair]] + local // n_b[pair]
+    columns = offsets_b[ring_b[pair]] + local // n_a[pair]
+    data = extent[pair] * 2.0 * np.pi * widths / (n_a[pair] * n_b[pair])
+
+    return CSRMatrix.from_coo(rows, columns, data, shape)
@@ -0,0 +1,72 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines the following functions controlling the floating-point type of the
+arrays computed by spheal:
+
+- `default_dtype()`
+  Returns the floating-point type used when none is given.
+
+- `set_default_dtype(dtype)`
+  Sets the floating-point type used when none is given.
+
+- `float_dtype(dtype=None)`
+  Returns the given floating-point type, or the default one.
+
+Notes
+-----
+
+- Only the stored and returned arrays use the chosen type. Quantities that
+  accumulate rounding errors, such as the phases of spiral distributions or the
+  extents of tessellation rings, are always computed in double precision.
+
+"""
+
+import numpy as np
+
+_default_dtype = np.dtype(np.float64)
+
+
+def default_dtype():
+    """
+    Return the floating-point type used when none is given.
+
+    """
+    return _default_dtype
+
+
+def set_default_dtype(dtype):
+    """
+    Set the floating-point type used when none is given.
+
+    Parameters
+    ----------
+
+    `dtype` : numpy.dtype
+    The new default floating-point type, e.g. `np.float32`.
+
+    """
+    global _default_dtype
+    _default_dtype = float_dtype(dtype)
+
+
+def float_dtype(dtype=None):
+    """
+    Return the given floating-point type, or the default one if not given.
+
+    Parameters
+    ----------
+
+    `dtype` : numpy.dtype (optional, default: None)
+    The floating-point type.
+
+    """
+    if dtype is None:
+        return _default_dtype
+
+    dtype = np.dtype(dtype)
+    if not np.issubdtype(dtype, np.floating):
+        msg = "Type should be a floating-point type. Got " + str(dtype)
+        raise TypeError(msg)
+
+    return dtype
@@ -6,3 +6,4 @@ Defines classes holding functions of the radial coordinate.
 """
 
 from .exponential import *
+from .tabulated import *
@@ -29,6 +29,7 @@ class Exponential(Profile):
     """
 
     def __init__(self):
+        super().__init__()
         self._r90 = 2.661160168917105
 
     @property
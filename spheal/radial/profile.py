@@ -7,6 +7,13 @@ Defines `Profile`, the base class for radial profiles.
 
 import abc
 
+import numpy as np
+
+# Queries of at most `MAX_CACHED_FRACTIONS` fractions are cached, up to
+# `MAX_CACHED_QUERIES` of them per profile, discarding the least recently used.
+MAX_CACHED_FRACTIONS = 64
+MAX_CACHED_QUERIES = 256
+
 
 class Profile(metaclass=abc.ABCMeta):
     """
@@ -25,8 +32,18 @@ class Profile(metaclass=abc.ABCMeta):
     `particle_number(r)`
     The number of particles contained at the given radius r.
 
+    The following functions are derived from them:
+
+    `quantile_radius(q)`
+    The radius containing a fraction q of the total number of particles.
+
     """
 
+    def __init__(self):
+        # The radii of recent small queries, by their fractions, from the least
+        # to the most recently used.
+        self._quantile_radii = {}
+
     @property
     @abc.abstractmethod
     def r90(self):
@@ -42,3 +59,60 @@ class Profile(metaclass=abc.ABCMeta):
         Compute the number of particles enclosed in a radius r.
 
         """
+
+    def quantile_radius(self, q):
+        """
+        Compute the radius enclosing a given fraction of the particles.
+
+        Each radius is first bracketed by doubling `r90` and then found by
+        bisection, for all distinct fractions at once. Queries of at most
+        `MAX_CACHED_FRACTIONS` fractions are cached, so that repeated small
+        queries, such as scalar ones, are only solved once.
+
+        Parameters
+        ----------
+
+        `q` : float or ndarray
+        The fractions of particles, in [0, 1].
+
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if np.any(q < 0.0) or np.any(q > 1.0):
+            msg = "Fractions should be in range [0, 1]."
+            raise ValueError(msg)
+
+        key = (q.shape,
+               q.tobytes()) if q.size <= MAX_CACHED_FRACTIONS else None
+        if key is not None and key in self._quantile_radii:
+            radii = self._quantile_radii.pop(key)
+            self._quantile_radii[key] = radii
+            return radii.copy()[()]
+
+        targets, inverse = np.unique(q, return_inverse=True)
+        lower = np.zeros_like(targets)
+        upper = np.full_like(targets, self.r90)
+
+        for _ in range(1024):
+            below = self.particle_number(upper) < targets
+            if not np.any(below):
+                break
+            lower[below] = upper[below]
+            upper[below] *= 2.0
+
+        for _ in range(1100):
+            middle = 0.5 * (lower + upper)
+            if not np.any((middle > lower) & (middle < upper)):
+                break
+            below = self.particle_number(middle) < targets
+            lower = np.where(below, middle, lower)
+            upper = np.where(below, upper, middle)
+
+        upper[targets == 0.0] = 0.0
+        radii = upper[inverse].reshape(q.shape)
+
+        if key is not None:
+            self._quantile_radii[key] = radii.copy()
+            if len(self._quantile_radii) > MAX_CACHED_QUERIES:
+                del self._quantile_radii[next(iter(self._quantile_radii))]
+
+        return radii[()]
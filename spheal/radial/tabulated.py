@@ -0,0 +1,119 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class `Tabulated`.
+
+"""
+
+import numpy as np
+
+from spheal.radial.profile import Profile
+
+
+class Tabulated(Profile):
+    """
+    A profile given by a table of number densities and its derived quantities.
+
+    Members
+    -------
+
+    `r90` : float
+    The radius containing 90% of the total number of particles.
+
+    `radii` : ndarray
+    The radii at which the density is tabulated.
+
+    `cumulative` : ndarray
+    The fraction of particles contained at each tabulated radius.
+
+    Functions
+    ---------
+
+    `particle_number(r)`
+    The number of particles contained at the given radius r.
+
+    `quantile_radius(q)`
+    The radius containing a fraction q of the total number of particles.
+
+    Notes
+    -----
+
+    - The density is integrated once, at construction, with the trapezoidal
+      rule on 4 pi r^2 n(r). Afterwards, `particle_number` and
+      `quantile_radius` only interpolate linearly in the resulting table.
+
+    - No particles lie inside the first tabulated radius, and all particles lie
+      inside the last one.
+
+    """
+
+    def __init__(self, radii, density):
+        """
+        Parameters
+        ----------
+
+        `radii` : ndarray
+        The strictly increasing radii at which the density is tabulated.
+
+        `density` : ndarray
+        The non-negative number density at each radius.
+
+        """
+        super().__init__()
+        radii = np.asarray(radii, dtype=np.float64)
+        density = np.asarray(density, dtype=np.float64)
+
+        if not (radii.ndim == 1 and radii.shape == density.shape
+                and radii.size > 1):
+            msg = ("Radii and density should be 1-d arrays of equal size > 1. "
+                   "Got shapes " + str(radii.shape) + " and " +
+                   str(density.shape))
+            raise ValueError(msg)
+
+        if np.any(np.diff(radii) <= 0.0) or np.any(density < 0.0):
+            msg = "Radii should be strictly increasing and density non-negative."
+            raise ValueError(msg)
+
+        integrand = 4.0 * np.pi * radii**2.0 * density
+        cumulative = np.append(
+            0.0,
+            np.cumsum(0.5 * (integrand[1:] + integrand[:-1]) * np.diff(radii)))
+
+        if not cumulative[-1] > 0.0:
+            msg = "Tabulated density should contain particles."
+            raise ValueError(msg)
+
+        self._radii = radii
+        self._cumulative = cumulative / cumulative[-1]
+        self._r90 = np.interp(0.9, self._cumulative, self._radii)
+
+    @property
+    def r90(self):
+        return self._r90
+
+    @property
+    def radii(self):
+        """
+        The radii at which the density is tabulated.
+
+        """
+        return self._radii
+
+    @property
+    def cumulative(self):
+        """
+        The fraction of particles contained at each tabulated radius.
+
+        """
+        return self._cumulative
+
+    def particle_number(self, r):
+        return np.interp(r, self._radii, self._cumulative)
+
+    def quantile_radius(self, q):
+        q = np.asarray(q, dtype=np.float64)
+        if np.any(q < 0.0) or np.any(q > 1.0):
+            msg = "Fractions should be in range [0, 1]."
+            raise ValueError(msg)
+
+        return np.interp(q, self._cumulative, self._radii)[()]
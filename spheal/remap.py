@@ -0,0 +1,119 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class `Remapper`.
+
+"""
+
+from spheal.sparse import CSRMatrix
+
+
+class Remapper:
+    """
+    Conservative remapping of per-patch quantities from one tessellation to
+    another of the same domain, such as two `Disk` or two `Hemisphere`
+    tessellations with different numbers of patches or aspect ratios.
+
+    The areas shared by every pair of source and target patches are computed
+    exactly once, and every remap is a single sparse product. Remapping
+    preserves the integral of the quantity over the domain.
+
+    Attributes
+    ----------
+
+    `source`, `target`
+    The tessellations remapped from and to.
+
+    `areas` : CSRMatrix
+    The area shared by every target patch, as a row, and every source patch,
+    as a column.
+
+    """
+
+    def __init__(self, source, target):
+        """
+        Parameters
+        ----------
+
+        `source`, `target`
+        The tessellations remapped from and to, which should provide an
+        `overlap` function like `Disk.overlap`.
+
+        """
+        self._source = source
+        self._target = target
+        self._areas = target.overlap(source)
+        self._averages = None
+        self._totals = None
+
+    @property
+    def source(self):
+        """
+        The tessellation remapped from.
+
+        """
+        return self._source
+
+    @property
+    def target(self):
+        """
+        The tessellation remapped to.
+
+        """
+        return self._target
+
+    @property
+    def areas(self):
+        """
+        The area shared by every target patch and every source patch.
+
+        """
+        return self._areas
+
+    def remap(self, values):
+        """
+        Remap per-patch averages, such as densities. The average over a target
+        patch is the area-weighted average of the overlapping source patches.
+
+        Parameters
+        ----------
+
+        `values` : ndarray(P) or ndarray(P, m)
+        The average at every source patch, or m such sets as columns.
+
+        Returns
+        -------
+
+        `remapped` : ndarray
+        The average at every target patch.
+
+        """
+        if self._averages is None:
+            self._averages = self._areas.scale_rows(1.0 /
+                                                    self._areas.sum(axis=1))
+        return self._averages @ values
+
+    def remap_totals(self, values):
+        """
+        Remap per-patch totals, such as masses. Each source patch contributes
+        to every target patch in proportion to their shared area.
+
+        Parameters
+        ----------
+
+        `values` : ndarray(P) or ndarray(P, m)
+        The total at every source patch, or m such sets as columns.
+
+        Returns
+        -------
+
+        `remapped` : ndarray
+        The total at every target patch.
+
+        """
+        if self._totals is None:
+            areas = self._areas
+            self._totals = CSRMatrix(
+                areas.indptr, areas.indices,
+                areas.data / areas.sum(axis=0)[areas.indices], areas.shape)
+        return self._totals @ values
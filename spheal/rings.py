@@ -0,0 +1,490 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines `RingTessellation`, the base class for tessellations made of rings of
+patches, such as `Disk` and `Hemisphere`.
+
+"""
+
+import abc
+from typing import Callable
+
+import numpy as np
+
+from spheal.precision import float_dtype
+
+
+def _read_only(array):
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+class RingTessellation(metaclass=abc.ABCMeta):
+    """
+    Base class for tessellations made of rings of patches. Every ring spans an
+    interval of a radial coordinate, e.g. a radius or a zenith angle, and is
+    split in patches of equal azimuthal extents. Patches are numbered from the
+    outermost ring inwards and, within each ring, by increasing azimuth. Each
+    derived class should define the following members:
+
+    Attributes
+    ----------
+
+    `_ring_class` : class
+    The class of the ring objects, e.g. `Annulus`.
+
+    `_ring_name` : str
+    The plural name of the rings, e.g. 'annuli'.
+
+    Functions
+    ---------
+
+    `_rings(n_patches, lmax)`
+    Compute the number of patches enclosed by, and the radial coordinate of,
+    the outer edge of every ring one ring at a time.
+
+    `_lmax(n_patches, patch_aspect)`
+    The number of rings computed by `_rings`.
+
+    `_rings_analytic(radius, n_patches, patch_aspect)`
+    Compute the number of patches enclosed by, and the radial coordinate of,
+    the outer edge of every ring in closed form.
+
+    `_ring_arrays(radius, k, edges)`
+    Compute the inner radial coordinate, outer radial coordinate and number
+    of patches of every ring, given the arrays of `_rings_analytic`.
+
+    `_outer_edge(radius)`
+    The radial coordinate of the outer edge of the whole tessellation.
+
+    `_summary(radius, inner, outer, numbers, patch_aspect)`
+    Summarize how much the patches deviate from the ideal ones.
+
+    `patch_centers(edges, phi)`
+    Compute the radial coordinate and the azimuth of every patch center.
+
+    `locate_patches(patches, edges, phi)`
+    Find the patch containing every point.
+
+    The following functions are derived from them:
+
+    `__init__(radius, n_patches, patch_aspect, analytic=False, dtype=None,
+    strict=False)`
+    Compute the rings of the tessellation.
+
+    `retessellate(n_patches)`
+    Change the number of patches of the tessellation in place.
+
+    `from_arrays(radius, patch_aspect, dtype, strict, inner, outer, numbers,
+    offsets, adjacency=None)`
+    Build a tessellation from the arrays of its rings.
+
+    `search_aspect(radius, n_patches, ...)`
+    Find the patch aspect ratio giving the best tessellation.
+
+    """
+
+    # Defined by the derived classes, with the names of their own radial
+    # coordinate for the arguments of the functions.
+    _ring_class: type
+    _ring_name: str
+    _ring_arrays: Callable
+    patch_centers: Callable
+    locate_patches: Callable
+
+    def __init__(self,
+                 radius: float,
+                 n_patches: int,
+                 patch_aspect: float,
+                 analytic=False,
+                 dtype=None,
+                 strict=False):
+        """
+        Parameters
+        ----------
+
+        `radius, n_patches, patch_aspect, analytic, dtype, strict` :
+        The parameters of the tessellation, as described in the derived class.
+
+        """
+        self._radius = radius
+        self._patch_aspect = patch_aspect
+        self._dtype = float_dtype(dtype)
+        self._strict = strict
+
+        # In strict mode, the invalid values of the rings past the center are
+        # expected, for these rings are discarded.
+        with np.errstate(all="ignore" if strict else None):
+            if analytic:
+                k, edges = self._rings_analytic(radius, n_patches,
+                                                patch_aspect)
+            else:
+                k, edges = self._rings(n_patches,
+                                       self._lmax(n_patches, patch_aspect))
+
+        self._inner, self._outer, self._numbers = self._arrays(
+            radius, n_patches, k, edges, strict)
+        self._offsets = np.append(0, np.cumsum(self._numbers))
+        self._adjacency = None
+        self._ring_objects = None
+
+    @abc.abstractmethod
+    def _rings(self, n_patches, lmax):
+        """
+        Compute the number of patches enclosed by, and the radial coordinate
+        of, the outer edge of every ring l = 0, ..., lmax - 1, one ring at a
+        time.
+
+        """
+
+    @staticmethod
+    @abc.abstractmethod
+    def _lmax(n_patches, patch_aspect):
+        """
+        Return the number of rings computed by `_rings`.
+
+        """
+
+    @staticmethod
+    @abc.abstractmethod
+    def _rings_analytic(radius, n_patches, patch_aspect):
+        """
+        Compute the number of patches enclosed by, and the radial coordinate
+        of, the outer edge of every ring in closed form.
+
+        """
+
+    @staticmethod
+    @abc.abstractmethod
+    def _outer_edge(radius):
+        """
+        Return the radial coordinate of the outer edge of the tessellation.
+
+        """
+
+    @staticmethod
+    @abc.abstractmethod
+    def _summary(radius, inner, outer, numbers, patch_aspect):
+        """
+        Compute the root-mean-square relative deviation of the patch aspect
+        ratios from `patch_aspect`, and of the patch areas from the mean area.
+
+        """
+
+    @classmethod
+    def _strict_arrays(cls, radius, n_patches, k, edges):
+        """
+        Compute the same arrays as `_ring_arrays`, keeping only the rings
+        before the first one enclosing fewer than two patches or no fewer
+        patches than the previous one. Every ring then holds at least one
+        patch, and there are exactly `n_patches` patches.
+
+        """
+        if k.size == 0:
+            k = np.array([n_patches])
+            edges = np.array([cls._outer_edge(radius)])
+
+        invalid = k < 2
+        invalid[1:] |= k[1:] >= k[:-1]
+        last = max(np.argmax(invalid) if np.any(invalid) else k.size, 1)
+        inner, outer, numbers = cls._ring_arrays(radius, k[:last],
+                                                 edges[:last])
+
+        # A single patch is a central circle or a polar cap covering the whole
+        # tessellation.
+        kept = numbers > 0
+        return inner[kept], outer[kept], numbers[kept]
+
+    @classmethod
+    def _arrays(cls, radius, n_patches, k, edges, strict):
+        """
+        Compute the arrays of `_strict_arrays` in strict mode, and of
+        `_ring_arrays` otherwise.
+
+        """
+        if strict:
+            return cls._strict_arrays(radius, n_patches, k, edges)
+        return cls._ring_arrays(radius, k, edges)
+
+    def _build_ring_objects(self, inner, outer, numbers, kept=None):
+        """
+        Build the ring objects from the arrays of ring extents and numbers of
+        patches, reusing the objects of `kept`, a dict from the extents and
+        number of patches of a ring to its object.
+
+        """
+        kept = kept or {}
+        return [
+            kept.get((x_i, x_o, n)) or self._ring_class(
+                (x_i_cast, x_o_cast), n)
+            for x_i, x_o, n, x_i_cast, x_o_cast in zip(
+                inner, outer, numbers, inner.astype(self._dtype),
+                outer.astype(self._dtype))
+        ]
+
+    def _check_numbers(self, predicate):
+        """
+        Raise a ValueError stating that rings with a negative number of
+        patches `predicate`, if there are any.
+
+        """
+        if np.any(self._numbers < 0):
+            msg = (self._ring_name.capitalize() +
+                   " with a negative number of patches " + predicate +
+                   ". Use `strict=True` to avoid them.")
+            raise ValueError(msg)
+
+    def _build_adjacency(self):
+        self._check_numbers("have no adjacency")
+
+        # Rings without patches have no width, so the rings on either side
+        # of them border each other.
+        numbers = self._numbers[self._numbers > 0]
+        offsets = np.append(0, np.cumsum(numbers))
+        n_total = offsets[-1]
+        patches = np.arange(n_total)
+        rings = np.repeat(np.arange(numbers.size), numbers)
+
+        # Within a ring, patch m borders patch m + 1 (mod n).
+        m = patches - offsets[rings]
+        following = offsets[rings] + (m + 1) % numbers[rings]
+        bounded = numbers[rings] > 1
+        source, target = [patches[bounded]], [following[bounded]]
+
+        # Between rings l and l + 1, every azimuthal boundary is an exact
+        # integer multiple of 2 pi / (n_l n_lp1). Each interval between
+        # consecutive merged boundaries is shared by one patch of each ring.
+        scale = np.append(0, np.cumsum(numbers[:-1] * numbers[1:]))
+
+        outer = patches[:offsets[-2]]
+        l = rings[outer]
+        starts_outer = scale[l] + (outer - offsets[l]) * numbers[l + 1]
+
+        inner = patches[offsets[1]:]
+        l = rings[inner] - 1
+        starts_inner = scale[l] + (inner - offsets[l + 1]) * numbers[l]
+
+        starts = np.sort(np.concatenate((starts_outer, starts_inner)))
+        starts = starts[np.append(True, np.diff(starts) > 0)]
+        l = np.searchsorted(scale, starts, side="right") - 1
+        source.append(offsets[l] + (starts - scale[l]) // numbers[l + 1])
+        target.append(offsets[l + 1] + (starts - scale[l]) // numbers[l])
+
+        edges = np.sort(
+            np.concatenate(source + target) * n_total +
+            np.concatenate(target + source))
+        edges = edges[np.append(True, np.diff(edges) > 0)]
+        source, indices = np.divmod(edges, n_total)
+        indptr = np.append(0, np.cumsum(np.bincount(source,
+                                                    minlength=n_total)))
+
+        return indptr, indices
+
+    def retessellate(self, n_patches: int):
+        """
+        Change the number of patches of the tessellation in place, keeping its
+        radius, patch aspect ratio and strict mode.
+
+        The rings are computed in closed form, as with `analytic=True`. The
+        rings whose extents and number of patches do not change are kept as
+        they are, if they were built, and so is the adjacency if no ring
+        changes its number of patches.
+        A tessellation with patches cannot be changed to one without rings,
+        such as one with a single patch, for its patches would have nowhere to
+        go: a ValueError is then raised and the tessellation is left as is.
+
+        Parameters
+        ----------
+
+        `n_patches`: int
+        The new total number of patches.
+
+        Returns
+        -------
+
+        `old_to_new` : ndarray(int)
+        For every patch before the change, the patch after the change that
+        contains its center, both numbered as described in `patch_quality`.
+
+        """
+        centers = np.empty(self._offsets[-1])
+        phi = np.empty(self._offsets[-1])
+        self.patch_centers(centers, phi)
+
+        with np.errstate(all="ignore" if self._strict else None):
+            k, edges = self._rings_analytic(self._radius, n_patches,
+                                            self._patch_aspect)
+        inner, outer, numbers = self._arrays(self._radius, n_patches, k, edges,
+                                             self._strict)
+        if numbers.size == 0 and centers.size > 0:
+            msg = ("Could not map the patches to a tessellation without " +
+                   self._ring_name + ", with " + str(n_patches) + " patches.")
+            raise ValueError(msg)
+        if not np.array_equal(numbers, self._numbers):
+            self._adjacency = None
+
+        if self._ring_objects is not None:
+            kept = {
+                (x_i, x_o, n): ring
+                for x_i, x_o, n, ring in zip(self._inner, self._outer,
+                                             self._numbers, self._ring_objects)
+            }
+            self._ring_objects = self._build_ring_objects(
+                inner, outer, numbers, kept)
+        self._inner, self._outer, self._numbers = inner, outer, numbers
+        self._offsets = np.append(0, np.cumsum(numbers))
+
+        old_to_new = np.empty(centers.size, dtype=np.int64)
+        if centers.size > 0:
+            self.locate_patches(old_to_new, centers, phi)
+        return old_to_new
+
+    @classmethod
+    def from_arrays(cls,
+                    radius,
+                    patch_aspect,
+                    dtype,
+                    strict,
+                    inner,
+                    outer,
+                    numbers,
+                    offsets,
+                    adjacency=None):
+        """
+        Build a tessellation from the arrays of its rings without computing
+        them, e.g. from arrays shared with another process or saved to a file.
+        The arrays are used as they are, without copying them.
+
+        Parameters
+        ----------
+
+        `radius, patch_aspect, dtype, strict` :
+        The parameters the tessellation was built with.
+
+        `inner, outer` : ndarray, ndarray
+        The inner and outer radial coordinates of every ring, e.g. radii or
+        zenith angles, in double precision.
+
+        `numbers, offsets` : ndarray(int), ndarray(int)
+        The number of patches of every ring, and the index of its first patch
+        followed by the total number of patches.
+
+        `adjacency` : tuple (optional, default: None)
+        The adjacency of the patches, as described in `adjacency`. If not
+        given, it is built on first access.
+
+        Returns
+        -------
+
+        `tessellation`
+        The tessellation, of the class this function is called on.
+
+        """
+        tessellation = cls.__new__(cls)
+        tessellation._radius = radius
+        tessellation._patch_aspect = patch_aspect
+        tessellation._dtype = float_dtype(dtype)
+        tessellation._strict = strict
+        tessellation._inner, tessellation._outer = inner, outer
+        tessellation._numbers, tessellation._offsets = numbers, offsets
+        tessellation._adjacency = adjacency
+        tessellation._ring_objects = None
+        return tessellation
+
+    @classmethod
+    def search_aspect(cls,
+                      radius: float,
+                      n_patches: int,
+                      bounds=(0.5, 4.0),
+                      objective="aspect_deviation",
+                      samples=32,
+                      refinements=3):
+        """
+        Find the patch aspect ratio giving the best tessellation with a given
+        number of patches.
+
+        The aspect ratios are sampled on a logarithmic grid within `bounds`,
+        which is then narrowed around the best sample `refinements` times.
+        Each sample is evaluated from the closed-form rings only, and only
+        samples giving exactly `n_patches` non-empty patches are accepted. The
+        winning tessellation is the only one constructed.
+
+        Parameters
+        ----------
+
+        `radius`: float
+        The radius of the tessellation.
+
+        `n_patches`: int
+        The total number of patches to use in the tessellation.
+
+        `bounds`: tuple (default: (0.5, 4.0))
+        The smallest and largest aspect ratios to consider.
+
+        `objective`: str (default: 'aspect_deviation')
+        The quantity to minimize. Either 'aspect_deviation', the RMS relative
+        deviation of every patch's aspect ratio from the requested one, or
+        'area_error', the RMS relative deviation of every patch's area from
+        the mean area.
+
+        `samples`: int (default: 32)
+        The number of aspect ratios sampled at each refinement.
+
+        `refinements`: int (default: 3)
+        The number of times the search interval is narrowed.
+
+        Returns
+        -------
+
+        `tessellation`
+        The tessellation with the best aspect ratio found, of the class this
+        function is called on.
+
+        `quality`: dict
+        The best aspect ratio, under key 'patch_aspect', and the values of
+        'aspect_deviation' and 'area_error' of its tessellation.
+
+        """
+        if objective not in ("aspect_deviation", "area_error"):
+            msg = "Unknown objective " + str(objective)
+            raise ValueError(msg)
+
+        def evaluate(patch_aspect):
+            k, edges = cls._rings_analytic(radius, n_patches, patch_aspect)
+            inner, outer, numbers = cls._ring_arrays(radius, k, edges)
+            if (numbers.size == 0 or np.any(numbers < 1)
+                    or np.sum(numbers) != n_patches
+                    or not np.all(np.isfinite(outer))):
+                return None
+            return cls._summary(radius, inner, outer, numbers, patch_aspect)
+
+        best = None
+        lower, upper = np.log(bounds[0]), np.log(bounds[1])
+        for _ in range(refinements + 1):
+            grid = np.exp(np.linspace(lower, upper, samples))
+            scores = np.full(samples, np.inf)
+            for i, patch_aspect in enumerate(grid):
+                quality = evaluate(patch_aspect)
+                if quality is not None:
+                    scores[i] = quality[objective]
+                    if best is None or scores[i] < best[objective]:
+                        best = quality
+
+            if best is None:
+                break
+
+            i = np.argmin(scores)
+            lower = np.log(grid[max(i - 1, 0)])
+            upper = np.log(grid[min(i + 1, samples - 1)])
+
+        if best is None:
+            msg = ("No aspect ratio within " + str(bounds) + " gives " +
+                   str(n_patches) + " patches.")
+            raise ValueError(msg)
+
+        tessellation = cls(radius,
+                           n_patches,
+                           best["patch_aspect"],
+                           analytic=True)
+        return tessellation, best
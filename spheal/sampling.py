@@ -0,0 +1,264 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class `PatchSampler`.
+
+"""
+
+import numpy as np
+
+
+def _alias_tables(weights, offsets):
+    """
+    Build the alias tables of consecutive segments of weights at once.
+
+    The weights of every segment are scaled to a mean of one. Every light
+    entry, below one, takes its alias from the heavy entries of its segment in
+    order, as in the sweep of Vose's method: heavy entry j covers the light
+    entries starting within its cumulative excess, and once the excess is
+    exhausted it becomes light itself, with heavy entry j + 1 as its alias.
+    Both assignments are found at once by searching the cumulative deficits
+    of the light entries and the cumulative excesses of the heavy ones.
+
+    Returns the probability of keeping every entry and the index of its
+    alias, within the weights. Segments without weight are uniform.
+
+    """
+    n = weights.size
+    sizes = np.diff(offsets)
+    segments = np.repeat(np.arange(sizes.size), sizes)
+
+    totals = np.bincount(segments, weights=weights, minlength=sizes.size)
+    empty = ~(totals > 0.0)
+    scaled = weights * (sizes / np.where(empty, 1.0, totals))[segments]
+    scaled[empty[segments]] = 1.0
+
+    prob, alias = np.ones(n), np.arange(n)
+
+    # Entries of exactly one need no alias, and are left out of the sweep.
+    lights = np.flatnonzero(scaled < 1.0)
+    heavies = np.flatnonzero(scaled > 1.0)
+    if heavies.size == 0:
+        return prob, alias
+    heavy_segments = segments[heavies]
+    first = np.searchsorted(heavy_segments, np.arange(sizes.size))
+    last = np.searchsorted(heavy_segments, np.arange(sizes.size),
+                           side="right") - 1
+
+    # Every entry of a segment without heavy entries, which only happens by
+    # rounding, keeps probability one.
+    lights = lights[first[segments[lights]] <= last[segments[lights]]]
+    light_segments = segments[lights]
+    deficits = 1.0 - scaled[lights]
+    excess_ends = np.cumsum(scaled[heavies] - 1.0)
+
+    # The cumulative deficits of every segment span exactly the same interval
+    # as its cumulative excesses, and every light entry starts exactly where
+    # the previous one ends, so that both are compared consistently.
+    bases = np.append(0.0, excess_ends)[first[light_segments]]
+    tops = excess_ends[last[light_segments]]
+    firsts = np.searchsorted(light_segments, light_segments)
+    cumulative = np.cumsum(deficits)
+    deficit_ends = np.minimum(
+        bases + (cumulative - (cumulative - deficits)[firsts]), tops)
+    lasts = np.diff(np.append(light_segments, -1)) != 0
+    deficit_ends[lasts] = tops[lasts]
+    deficit_starts = np.append(0.0, deficit_ends[:-1])
+    starting = firsts == np.arange(lights.size)
+    deficit_starts[starting] = bases[starting]
+
+    # Light entries take the heavy entry whose excess covers their start.
+    j = np.clip(np.searchsorted(excess_ends, deficit_starts, side="right"),
+                first[light_segments], last[light_segments])
+    prob[lights] = scaled[lights]
+    alias[lights] = heavies[j]
+
+    # Heavy entries become light at the end of the light entry straddling
+    # their cumulative excess, and take the next heavy entry of their segment.
+    # A light entry starting exactly at the end of the excess of a heavy entry
+    # takes the next one as its alias, so the heavy entry keeps all of itself.
+    i = np.searchsorted(deficit_ends, excess_ends, side="right")
+    crossed = (i < lights.size) & (np.arange(heavies.size)
+                                   < last[heavy_segments])
+    crossed[crossed] = ((light_segments[i[crossed]] == heavy_segments[crossed])
+                        & (deficit_starts[i[crossed]] < excess_ends[crossed]))
+    overshoot = deficit_ends[i[crossed]] - excess_ends[crossed]
+    prob[heavies[crossed]] = np.clip(1.0 - overshoot, 0.0, 1.0)
+    alias[heavies[crossed]] = heavies[np.flatnonzero(crossed) + 1]
+
+    return prob, alias
+
+
+class PatchSampler:
+    """
+    Draws directions on a hemisphere with a probability proportional to a
+    weight per patch, and uniformly within every patch.
+
+    A patch is picked in constant time with two levels of alias tables: one
+    over the total weight of every zone, and one over the weights of the
+    patches of every zone. The direction is then drawn within the patch as in
+    `Hemisphere.sample_patches`. Changing some weights rebuilds the tables of
+    their zones and of the zone totals only.
+
+    Attributes
+    ----------
+
+    `hemisphere` : Hemisphere
+    The tessellation.
+
+    `weights` : ndarray
+    The weight of every patch, numbered as described in
+    `Hemisphere.patch_quality`.
+
+    """
+
+    def __init__(self, hemisphere, weights):
+        """
+        Parameters
+        ----------
+
+        `hemisphere` : Hemisphere
+        The tessellation. Every zone should hold at least one patch, see
+        `strict` in `Hemisphere`.
+
+        `weights` : ndarray
+        The non-negative weight of every patch, not all zero.
+
+        """
+        if np.any(hemisphere.numbers < 1):
+            msg = "Every zone should hold at least one patch."
+            raise ValueError(msg)
+
+        self._hemisphere = hemisphere
+        self._weights = np.zeros(hemisphere.offsets[-1])
+        self._prob = np.ones(self._weights.size)
+        self._alias = np.arange(self._weights.size)
+        self._totals = np.zeros(hemisphere.numbers.size)
+        self.update(np.arange(self._weights.size), weights)
+
+    @property
+    def hemisphere(self):
+        """
+        The tessellation.
+
+        """
+        return self._hemisphere
+
+    @property
+    def weights(self):
+        """
+        The weight of every patch.
+
+        """
+        return self._weights
+
+    def _rings(self, patches):
+        return np.searchsorted(self._hemisphere.offsets, patches,
+                               side="right") - 1
+
+    def update(self, patches, weights):
+        """
+        Change the weights of some patches, and rebuild the alias tables of
+        their zones and of the zone totals.
+
+        Parameters
+        ----------
+
+        `patches` : ndarray(int)
+        The patches whose weight changes.
+
+        `weights` : float or ndarray
+        The new non-negative weight of every given patch.
+
+        """
+        weights = np.broadcast_to(np.asarray(weights, dtype=np.float64),
+                                  np.shape(patches))
+        if not np.all((weights >= 0.0) & np.isfinite(weights)):
+            msg = "Weights should be finite and non-negative."
+            raise ValueError(msg)
+
+        new_weights = self._weights.copy()
+        new_weights[patches] = weights
+        if not np.sum(new_weights) > 0.0:
+            msg = "Weights should not all be zero."
+            raise ValueError(msg)
+        self._weights = new_weights
+
+        numbers, offsets = self._hemisphere.numbers, self._hemisphere.offsets
+        zones = np.unique(self._rings(patches))
+        sizes = numbers[zones]
+        local_offsets = np.append(0, np.cumsum(sizes))
+        members = np.arange(local_offsets[-1]) + np.repeat(
+            offsets[zones] - local_offsets[:-1], sizes)
+
+        prob, alias = _alias_tables(self._weights[members], local_offsets)
+        self._prob[members] = prob
+        self._alias[members] = members[alias]
+        self._totals[zones] = np.add.reduceat(self._weights[members],
+                                              local_offsets[:-1])
+
+        self._zone_prob, self._zone_alias = _alias_tables(
+            self._totals, np.array([0, self._totals.size]))
+
+    def sample(self, points, patches, rng=None):
+        """
+        Draw points on the hemisphere, each in a patch picked with a
+        probability proportional to its weight, and uniformly within it.
+
+        Parameters
+        ----------
+
+        `points` : ndarray(M, 3)
+        The `x, y, z` Cartesian coordinates of the M points.
+
+        `patches` : ndarray(int)
+        The patch of every point, numbered as described in
+        `Hemisphere.patch_quality`.
+
+        `rng` : numpy.random.Generator (optional, default: None)
+        The random number generator to draw from. If not given, a new one is
+        created from fresh entropy.
+
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+
+        total = points.shape[0]
+        numbers, offsets = self._hemisphere.numbers, self._hemisphere.offsets
+
+        # The integer part of a scaled uniform picks an entry of the table,
+        # and the fractional part decides between the entry and its alias.
+        u = rng.random(total) * numbers.size
+        rings = np.minimum(u.astype(np.int64), numbers.size - 1)
+        rings = np.where(u - rings < self._zone_prob[rings], rings,
+                         self._zone_alias[rings])
+
+        u = rng.random(total) * numbers[rings]
+        m = np.minimum(u.astype(np.int64), numbers[rings] - 1)
+        picked = offsets[rings] + m
+        patches[:] = np.where(u - m < self._prob[picked], picked,
+                              self._alias[picked])
+
+        self._hemisphere.sample_within(points, patches, rng)
+
+    def densities(self, densities, patches):
+        """
+        Compute the probability density per unit solid angle of drawing a
+        direction in each of the given patches.
+
+        Parameters
+        ----------
+
+        `densities` : ndarray
+        The density in every given patch.
+
+        `patches` : ndarray(int)
+        The patches.
+
+        """
+        hemisphere = self._hemisphere
+        rings = self._rings(patches)
+        solid_angles = 2.0 * np.pi * (np.cos(hemisphere.inner[rings]) - np.cos(
+            hemisphere.outer[rings])) / hemisphere.numbers[rings]
+        densities[:] = self._weights[patches] / (np.sum(self._weights) *
+                                                 solid_angles)
@@ -0,0 +1,178 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class `SharedTessellation`, which publishes the arrays of a `Disk` or
+a `Hemisphere` in shared memory so that worker processes can use the
+tessellation without receiving a copy of it.
+
+The publishing process creates the block and sends the small, picklable
+handle to the workers instead of the tessellation:
+
+    with SharedTessellation(hemisphere) as shared:
+        pool.map(task, [(shared, ...) for ...])
+
+and every worker rebuilds a read-only tessellation from the block:
+
+    def task(args):
+        shared, ... = args
+        hemisphere = shared.attach()
+
+Attaching maps the block once per process and wraps its arrays without
+copying them, so its cost does not depend on the number of patches. The
+workers should be started by `multiprocessing`, so that they share the
+resource tracker of the publishing process.
+
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# The blocks mapped by this process, by name. They are kept open for the
+# lifetime of the process, or until detached, for the tessellations built on
+# them do not own their memory.
+_attached = {}
+
+
+class SharedTessellation:
+    """
+    A handle to the arrays of a tessellation made of rings of patches, such
+    as `Disk` or `Hemisphere`, published in a shared memory block.
+
+    The block holds the inner and outer extents, the number of patches and
+    the offsets of the rings, in double precision and 64-bit integers, and
+    optionally the adjacency of the patches.
+
+    Attributes
+    ----------
+
+    `name` : str
+    The name of the shared memory block.
+
+    `patch_number` : int
+    The total number of patches of the tessellation.
+
+    """
+
+    def __init__(self, tessellation, adjacency=False):
+        """
+        Parameters
+        ----------
+
+        `tessellation` : Disk or Hemisphere
+        The tessellation to publish.
+
+        `adjacency` : bool (optional, default: False)
+        Whether to also publish the adjacency of the patches, building it if
+        needed.
+
+        """
+        arrays = [
+            np.asarray(tessellation.inner, dtype=np.float64),
+            np.asarray(tessellation.outer, dtype=np.float64),
+            np.asarray(tessellation.numbers, dtype=np.int64),
+            np.asarray(tessellation.offsets, dtype=np.int64)
+        ]
+        if adjacency:
+            arrays.extend(
+                np.asarray(a, dtype=np.int64) for a in tessellation.adjacency)
+
+        self._cls = type(tessellation)
+        self._parameters = (tessellation.radius, tessellation.patch_aspect,
+                            tessellation.dtype, tessellation.strict)
+        self._sizes = tuple(a.size for a in arrays)
+        self._patch_number = tessellation.patch_number
+
+        # Every array has 8-byte items, so they are packed back to back.
+        self._shm = shared_memory.SharedMemory(create=True,
+                                               size=max(
+                                                   8 * sum(self._sizes), 1))
+        self._name = self._shm.name
+        for view, a in zip(self._views(self._shm), arrays):
+            view[:] = a
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_shm"] = None
+        return state
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.unlink()
+
+    @property
+    def name(self):
+        """
+        The name of the shared memory block.
+
+        """
+        return self._name
+
+    @property
+    def patch_number(self):
+        """
+        The total number of patches of the tessellation.
+
+        """
+        return self._patch_number
+
+    def _views(self, shm):
+        views, start = [], 0
+        for i, size in enumerate(self._sizes):
+            dtype = np.float64 if i < 2 else np.int64
+            views.append(
+                np.ndarray((size, ), dtype=dtype, buffer=shm.buf,
+                           offset=start))
+            start += 8 * size
+        return views
+
+    def attach(self):
+        """
+        Build a read-only tessellation on the arrays of the block.
+
+        Returns
+        -------
+
+        `tessellation` : Disk or Hemisphere
+        The tessellation, whose ring arrays, and adjacency if published, are
+        read-only views of the block. They stay valid until the block is
+        detached from this process.
+
+        """
+        shm = _attached.get(self._name)
+        if shm is None:
+            shm = shared_memory.SharedMemory(self._name)
+            _attached[self._name] = shm
+
+        views = self._views(shm)
+        for view in views:
+            view.flags.writeable = False
+
+        adjacency = tuple(views[4:]) if len(views) > 4 else None
+        return self._cls.from_arrays(*self._parameters,
+                                     *views[:4],
+                                     adjacency=adjacency)
+
+    def detach(self):
+        """
+        Unmap the block from this process. Tessellations attached in this
+        process must not be used afterwards.
+
+        """
+        shm = _attached.pop(self._name, None)
+        if shm is not None:
+            shm.close()
+
+    def unlink(self):
+        """
+        Release the block. Only the publishing process should call this, once
+        every worker is done with it.
+
+        """
+        self.detach()
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
@@ -6,6 +6,12 @@ Defines the following functions involving spherical shells:
 - `particle_number(numbers, profile, N, r)`
   Calculates the number of particles in the shell for a given profile.
 
+- `radii(r, profile, N, numbers=None)`
+  Calculates the shell extensions holding given numbers of particles.
+
+- `spaced_radii(profile, N, spacing=1.0, samples=4096)`
+  Calculates the shell extensions matching the local particle spacing.
+
 """
 
 import numpy as np
@@ -41,3 +47,97 @@ def particle_number(numbers, profile, N, r):
     numbers[:] = np.rint(
         N * np.array([f[j] - f[j + 1]
                       for j in range(0, len(numbers))])).astype(numbers.dtype)
+
+
+def radii(r, profile, N, numbers=None):
+    """
+    Calculate the radial extensions of shells holding the given numbers of
+    particles.
+
+    This is the inverse of `particle_number`: all extensions are found at once
+    from the quantile radii of the profile, from the outermost shell inwards.
+
+    Arguments
+    ---------
+
+    `r` : ndarray
+    The array where to store the radial extensions of every shell, in
+    decreasing order, i.e. the nth shell extends between `r[n + 1]` and
+    `r[n]`. The innermost extension encloses no particles.
+
+    `profile` : obj
+    The spherically symmetric profile used to calculate the fraction of
+    particles at a given radius. Must have a `quantile_radius(q)` member.
+
+    `N` : int
+    The total number of particles across all shells.
+
+    `numbers` : ndarray (optional, default: None)
+    The number of particles in each shell, adding up to at most N. If not
+    given, the N particles are split as evenly as possible.
+
+    """
+    n_shells = len(r) - 1
+    if numbers is None:
+        numbers = np.diff(np.rint(N * np.arange(n_shells + 1) / n_shells))
+
+    if not len(numbers) == n_shells:
+        msg = ("Number of shells should be " + str(n_shells) + ". Got " +
+               str(len(numbers)))
+        raise ValueError(msg)
+
+    # Fraction of particles enclosed by the outer extension of every shell.
+    enclosed = np.append(np.cumsum(np.asarray(numbers)[::-1])[::-1], 0.0) / N
+    if np.any(enclosed > 1.0):
+        msg = "Shells should hold at most " + str(N) + " particles."
+        raise ValueError(msg)
+
+    r[:] = profile.quantile_radius(enclosed)
+
+
+def spaced_radii(profile, N, spacing=1.0, samples=4096):
+    """
+    Calculate the radial extensions of shells whose widths are proportional to
+    the local mean particle spacing.
+
+    The mean spacing of N particles with number density n(r) is
+    (N n(r))^(-1/3). Shell boundaries are placed where the integral of its
+    inverse is a multiple of `spacing`, which is tabulated once on a uniform
+    grid and inverted by interpolation.
+
+    Arguments
+    ---------
+
+    `profile` : obj
+    The spherically symmetric profile used to calculate the fraction of
+    particles at a given radius. Must have `particle_number(r)` and
+    `quantile_radius(q)` members.
+
+    `N` : int
+    The total number of particles across all shells.
+
+    `spacing` : float (default: 1.0)
+    The width of each shell in units of the local mean particle spacing.
+
+    `samples` : int (default: 4096)
+    The number of grid points on which the spacing is tabulated.
+
+    Returns
+    -------
+
+    `r` : ndarray
+    The radial extensions of every shell, in decreasing order, as in `radii`.
+    The outermost extension encloses all but half a particle.
+
+    """
+    grid = np.linspace(0.0, profile.quantile_radius(1.0 - 0.5 / N), samples)
+    midpoints = 0.5 * (grid[1:] + grid[:-1])
+
+    # 4 pi r^2 n(r) dr = dF, with F the fraction of particles within r.
+    density = np.diff(profile.particle_number(grid)) / np.diff(grid) / (
+        4.0 * np.pi * midpoints**2.0)
+    layers = np.append(0.0, np.cumsum(np.cbrt(N * density) * np.diff(grid)))
+
+    n_shells = max(int(np.rint(layers[-1] / spacing)), 1)
+    targets = np.linspace(layers[-1], 0.0, n_shells + 1)
+    return np.interp(targets, layers, grid)
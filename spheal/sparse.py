@@ -0,0 +1,236 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines class `CSRMatrix`.
+
+"""
+
+import numpy as np
+
+
+class CSRMatrix:
+    """
+    A sparse matrix in compressed sparse row format.
+
+    The nonzero entries of row `i` are `data[indptr[i]:indptr[i + 1]]`, in the
+    columns `indices[indptr[i]:indptr[i + 1]]`, in increasing order.
+
+    Attributes
+    ----------
+
+    `indptr, indices, data` : ndarray(int), ndarray(int), ndarray
+    The arrays defining the matrix.
+
+    `shape` : tuple(int, int)
+    The number of rows and columns.
+
+    """
+
+    def __init__(self, indptr, indices, data, shape):
+        """
+        Parameters
+        ----------
+
+        `indptr, indices, data` : ndarray(int), ndarray(int), ndarray
+        The arrays defining the matrix, as described above.
+
+        `shape` : tuple(int, int)
+        The number of rows and columns.
+
+        """
+        if not (len(indptr) == shape[0] + 1 and indptr[-1] == len(indices)
+                and len(indices) == len(data)):
+            msg = "Arrays are inconsistent with shape " + str(shape)
+            raise ValueError(msg)
+
+        self._indptr = np.asarray(indptr)
+        self._indices = np.asarray(indices)
+        self._data = np.asarray(data)
+        self._shape = tuple(shape)
+
+    @classmethod
+    def from_coo(cls, rows, columns, data, shape):
+        """
+        Build a matrix from the row, column and value of each entry. The
+        values of repeated entries are added.
+
+        Parameters
+        ----------
+
+        `rows, columns, data` : ndarray(int), ndarray(int), ndarray
+        The row, column and value of each entry.
+
+        `shape` : tuple(int, int)
+        The number of rows and columns.
+
+        Returns
+        -------
+
+        `matrix` : CSRMatrix
+        The matrix with the given entries.
+
+        """
+        keys = np.asarray(rows, dtype=np.int64) * shape[1] + columns
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+
+        first = np.flatnonzero(np.append(True, np.diff(keys) > 0))
+        data = np.add.reduceat(np.asarray(data)[order],
+                               first) if keys.size > 0 else np.asarray(data)
+        rows, columns = np.divmod(keys[first], shape[1])
+        indptr = np.append(0, np.cumsum(np.bincount(rows, minlength=shape[0])))
+
+        return cls(indptr, columns, data, shape)
+
+    @property
+    def indptr(self):
+        """
+        The offset of the entries of every row.
+
+        """
+        return self._indptr
+
+    @property
+    def indices(self):
+        """
+        The column of every entry.
+
+        """
+        return self._indices
+
+    @property
+    def data(self):
+        """
+        The value of every entry.
+
+        """
+        return self._data
+
+    @property
+    def shape(self):
+        """
+        The number of rows and columns.
+
+        """
+        return self._shape
+
+    @property
+    def nnz(self):
+        """
+        The number of stored entries.
+
+        """
+        return self._data.size
+
+    def _rows(self):
+        return np.repeat(np.arange(self._shape[0]), np.diff(self._indptr))
+
+    def dot(self, x):
+        """
+        Compute the product of the matrix with a vector or a matrix.
+
+        Parameters
+        ----------
+
+        `x` : ndarray(n) or ndarray(n, m)
+        The vector, or the m vectors as columns, with `n = shape[1]`.
+
+        Returns
+        -------
+
+        `y` : ndarray(shape[0]) or ndarray(shape[0], m)
+        The product.
+
+        """
+        x = np.asarray(x)
+        products = self._data.reshape((-1, ) + (1, ) *
+                                      (x.ndim - 1)) * x[self._indices]
+        y = np.zeros((self._shape[0], ) + x.shape[1:], dtype=products.dtype)
+        filled = np.diff(self._indptr) > 0
+        y[filled] = np.add.reduceat(products, self._indptr[:-1][filled])
+        return y
+
+    def __matmul__(self, x):
+        return self.dot(x)
+
+    def transpose(self):
+        """
+        Compute the transposed matrix.
+
+        Returns
+        -------
+
+        `transposed` : CSRMatrix
+        The transposed matrix.
+
+        """
+        return CSRMatrix.from_coo(self._indices, self._rows(), self._data,
+                                  self._shape[::-1])
+
+    @property
+    def T(self):
+        """
+        The transposed matrix.
+
+        """
+        return self.transpose()
+
+    def scale_rows(self, factors):
+        """
+        Multiply every row by a factor.
+
+        Parameters
+        ----------
+
+        `factors` : ndarray(shape[0])
+        The factor of every row.
+
+        Returns
+        -------
+
+        `scaled` : CSRMatrix
+        The scaled matrix.
+
+        """
+        return CSRMatrix(
+            self._indptr, self._indices,
+            self._data * np.repeat(factors, np.diff(self._indptr)),
+            self._shape)
+
+    def sum(self, axis):
+        """
+        Add the entries along rows or columns.
+
+        Parameters
+        ----------
+
+        `axis` : int
+        0 to add the entries of every column, 1 for every row.
+
+        Returns
+        -------
+
+        `sums` : ndarray
+        The sum of every column or row.
+
+        """
+        if axis == 0:
+            return np.bincount(self._indices,
+                               weights=self._data,
+                               minlength=self._shape[1])
+        return self.dot(np.ones(self._shape[1], dtype=self._data.dtype))
+
+    def toarray(self):
+        """
+        Compute the dense matrix.
+
+        Returns
+        -------
+
+        `dense` : ndarray(shape)
+        The dense matrix.
+
+        """
+        dense = np.zeros(self._shape, dtype=self._data.dtype)
+        dense[self._rows(), self._indices] = self._data
+        return dense
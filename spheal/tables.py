@@ -0,0 +1,65 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+"""
+Defines the following functions managing tables shared by the rings of
+tessellations:
+
+- `boundary_table(n_patches)`
+  Returns the cosines and sines of the azimuthal boundaries of a ring.
+
+- `clear_tables()`
+  Empties the cache of tables.
+
+The azimuthal boundaries of a ring of n patches are `2 pi m / n`, m = 0, ...,
+n, so every ring with the same number of patches shares the same table. The
+tables are computed on first use and kept in a cache holding at most
+`MAX_TABLES` of them, discarding the least recently used ones.
+
+"""
+
+import functools
+
+import numpy as np
+
+MAX_TABLES = 1024
+
+
+@functools.lru_cache(maxsize=MAX_TABLES)
+def _boundary_table(n_patches):
+    phi = 2.0 * np.pi * np.arange(n_patches + 1) / n_patches
+    table = np.stack((np.cos(phi), np.sin(phi)))
+    table.flags.writeable = False
+    return table
+
+
+def boundary_table(n_patches):
+    """
+    Return the cosines and sines of the azimuthal boundaries of a ring.
+
+    Parameters
+    ----------
+
+    `n_patches` : int
+    The number of patches of the ring.
+
+    Returns
+    -------
+
+    `table` : ndarray(2, n_patches + 1)
+    The read-only cosines and sines of `2 pi m / n_patches`, m = 0, ...,
+    n_patches.
+
+    """
+    if n_patches < 1:
+        msg = "Number of patches should be at least 1. Got " + str(n_patches)
+        raise ValueError(msg)
+
+    return _boundary_table(int(n_patches))
+
+
+def clear_tables():
+    """
+    Empty the cache of tables.
+
+    """
+    _boundary_table.cache_clear()
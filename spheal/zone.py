@@ -7,6 +7,8 @@ Defines class `Zone`.
 
 import numpy as np
 
+from spheal.tables import boundary_table
+
 
 class Zone:
     """
@@ -27,11 +29,18 @@ class Zone:
     `patch_extents`: tuple
     The azimuthal extents of the patches that constitute the zone.
 
+    `patch_boundaries`: ndarray(2, patch_number + 1)
+    The cosines and sines of the angular extents of the patches.
+
     Notes
     -----
 
     - Each patch has exactly the same shape.
 
+    - The patch extents are computed on first access. The cosines and sines
+      of the patch extents are shared by every zone with the same number of
+      patches, as described in `spheal.tables`.
+
     """
 
     def __init__(self, extents: tuple, n_patches: int):
@@ -47,8 +56,8 @@ class Zone:
 
         """
         self._extents = extents
-        self._patch_extents = tuple(2.0 * np.pi * m / n_patches
-                                    for m in range(n_patches + 1))
+        self._patch_number = n_patches
+        self._patch_extents = None
 
     def __lt__(self, other):
         return self.extents[0] < other.extents[0]
@@ -67,7 +76,7 @@ class Zone:
         The number of patches covering the zone.
 
         """
-        return len(self._patch_extents) - 1
+        return self._patch_number
 
     @property
     def patch_extents(self) -> tuple:
@@ -75,4 +84,15 @@ class Zone:
         The angular extents of the patches.
 
         """
+        if self._patch_extents is None:
+            self._patch_extents = tuple(2.0 * np.pi * m / self._patch_number
+                                        for m in range(self._patch_number + 1))
         return self._patch_extents
+
+    @property
+    def patch_boundaries(self):
+        """
+        The cosines and sines of the angular extents of the patches.
+
+        """
+        return boundary_table(self._patch_number)
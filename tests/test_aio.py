@@ -0,0 +1,72 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+
+import asyncio
+import unittest
+
+import numpy as np
+
+from spheal import aio
+from spheal.distributions import FibonacciLattice
+from spheal.euclidean import cartesian_from_spherical
+from spheal.hemisphere import Hemisphere
+
+
+class TestAio(unittest.TestCase):
+    """
+    Test coroutines in `aio` module.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand()
+        n_patches = np.random.randint(10, 1000)
+        patch_aspect = 0.5 + np.random.rand()
+        N = np.random.randint(10, 1000)
+        chunk = np.random.randint(1, 100)
+
+        async def main():
+            hemispheres = await asyncio.gather(
+                aio.hemisphere(radius, n_patches, patch_aspect),
+                aio.hemisphere(radius, n_patches, patch_aspect),
+                aio.hemisphere(radius, n_patches + 1, patch_aspect))
+            distribution = await aio.distribution(FibonacciLattice, N)
+            points = [
+                coords async for coords in aio.stream_points(
+                    distribution, radius, chunk)
+            ]
+            return hemispheres, distribution, points
+
+        hemispheres, distribution, points = asyncio.run(main())
+
+        self.assertTrue(hemispheres[0] is hemispheres[1]
+                        and hemispheres[0] is not hemispheres[2],
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="sharing of concurrent calls", seed=seed))
+
+        expected = Hemisphere(radius, n_patches, patch_aspect)
+        self.assertEqual([(zone.extents, zone.patch_number)
+                          for zone in hemispheres[0].zones],
+                         [(zone.extents, zone.patch_number)
+                          for zone in expected.zones],
+                         msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                             f="hemisphere", seed=seed))
+
+        coords = np.empty((N, 3))
+        cartesian_from_spherical(coords, np.full(N, radius),
+                                 distribution.theta, distribution.phi)
+        self.assertTrue(len(points) == -(-N // chunk)
+                        and np.allclose(np.concatenate(points), coords),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="streamed points", seed=seed))
+
+        self.assertEqual(aio._pending, {},
+                         msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                             f="finished computations", seed=seed))
+
+
+if __name__ == "__main__":
+    unittest.main()
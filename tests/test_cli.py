@@ -0,0 +1,106 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from spheal import cli
+from spheal.distributions import GeneralizedSpiral
+from spheal.hemisphere import Hemisphere
+
+
+class TestCli(unittest.TestCase):
+    """
+    Test `main` function of `cli` module.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand()
+        n_patches = np.random.randint(10, 1000)
+        N = np.random.randint(10, 1000)
+
+        parameters = {
+            "defaults": {
+                "radius": radius,
+                "patch_aspect": 1.0
+            },
+            "jobs": [{
+                "kind": "hemisphere",
+                "n_patches": n_patches
+            }, {
+                "kind": "distribution",
+                "distribution": "GeneralizedSpiral",
+                "N": N,
+                "name": "spiral"
+            }, {
+                "kind": "cloud",
+                "N": N,
+                "profile": "Exponential",
+                "shells": 4,
+                "seed": seed,
+                "name": "cloud"
+            }]
+        }
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "parameters.json")
+            with open(filename, "w") as parameter_file:
+                json.dump(parameters, parameter_file)
+
+            status = cli.main([filename, "-o", directory, "-j", "2"])
+            self.assertEqual(
+                status,
+                0,
+                msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                    f="exit status", seed=seed))
+
+            hemisphere = Hemisphere(radius, n_patches, 1.0)
+            with np.load(os.path.join(directory, "job0.npz")) as rings:
+                self.assertEqual(
+                    [(zone.extents, zone.patch_number)
+                     for zone in hemisphere.zones],
+                    list(
+                        zip(zip(rings["inner"], rings["outer"]),
+                            rings["numbers"])),
+                    msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                        f="hemisphere output", seed=seed))
+
+            spiral = GeneralizedSpiral(N)
+            with np.load(os.path.join(directory, "spiral.npz")) as angles:
+                self.assertTrue(
+                    np.array_equal(angles["theta"], spiral.theta)
+                    and np.array_equal(angles["phi"], spiral.phi),
+                    msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                        f="distribution output", seed=seed))
+
+            coords = np.load(os.path.join(directory, "cloud.npy"))
+            numbers = np.load(os.path.join(directory, "cloud.shells.npy"))
+            r = np.sqrt(np.sum(coords**2., axis=1))
+            self.assertTrue(
+                coords.shape == (np.sum(numbers), 3) and np.all(
+                    np.diff(
+                        np.repeat(np.arange(numbers.size), numbers)[np.argsort(
+                            -r, kind="stable")]) >= 0),
+                msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                    f="cloud output", seed=seed))
+
+            parameters["jobs"] = [{"kind": "unknown"}]
+            with open(filename, "w") as parameter_file:
+                json.dump(parameters, parameter_file)
+            self.assertEqual(
+                cli.main([filename, "-o", directory, "-j", "1"]),
+                1,
+                msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                    f="failed configuration", seed=seed))
+
+
+if __name__ == "__main__":
+    unittest.main()
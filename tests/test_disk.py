@@ -1,6 +1,8 @@
 # Distributed under the MIT License.
 # See LICENSE for details.
 
+import os
+import tempfile
 import unittest
 
 import numpy as np
@@ -35,6 +37,25 @@ class TestDisk(unittest.TestCase):
                          msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
                              f="patch number", seed=seed))
 
+        # Check that the offsets of the rings match their numbers of patches.
+        self.assertEqual(
+            list(disk.offsets),
+            [0] + list(np.cumsum([ring.patch_number for ring in disk.annuli])),
+            msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(f="offsets",
+                                                                  seed=seed))
+
+        # Check that the ring arrays match the rings and are read-only.
+        self.assertTrue(
+            np.array_equal(disk.numbers,
+                           [ring.patch_number for ring in disk.annuli])
+            and np.allclose(np.stack((disk.inner, disk.outer), axis=1),
+                            [ring.extents for ring in disk.annuli])
+            and not any(
+                a.flags.writeable
+                for a in (disk.inner, disk.outer, disk.numbers, disk.offsets)),
+            msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                f="ring arrays", seed=seed))
+
         # Check that the area of all inner circles equals area of outer circle.
         area = np.pi * radius**2.0 / n_patches
         number_sub = n_patches
@@ -48,6 +69,20 @@ class TestDisk(unittest.TestCase):
                 msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
                     f="area within r = {}".format(str(radius_sub)), seed=seed))
 
+        # Check that the closed-form solver gives the same tessellation.
+        n_patches_large = np.random.randint(1000, 100000)
+        disk_analytic = Disk(radius,
+                             n_patches_large,
+                             patch_aspect,
+                             analytic=True)
+        disk_iterative = Disk(radius, n_patches_large, patch_aspect)
+        self.assertEqual([(annulus.extents, annulus.patch_number)
+                          for annulus in disk_analytic.annuli],
+                         [(annulus.extents, annulus.patch_number)
+                          for annulus in disk_iterative.annuli],
+                         msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                             f="analytic ring computation", seed=seed))
+
         def get_partial_numbers(disk):
             patch_numbers = []
             partial_number = 0
@@ -73,5 +108,436 @@ class TestDisk(unittest.TestCase):
                              f="comparison with BB12 Table 4", seed=seed))
 
 
+class TestSearchAspect(unittest.TestCase):
+    """
+    Test `Disk.search_aspect` function.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand()
+        n_patches = np.random.randint(100, 10000)
+        bounds = (0.5, 4.)
+
+        for objective in ("aspect_deviation", "area_error"):
+            disk, quality = Disk.search_aspect(radius,
+                                               n_patches,
+                                               bounds=bounds,
+                                               objective=objective)
+
+            self.assertEqual(
+                disk.patch_number,
+                n_patches,
+                msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                    f="patch number with best " + objective, seed=seed))
+
+            self.assertTrue(
+                bounds[0] <= quality["patch_aspect"] <= bounds[1],
+                msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                    f="bounds of best aspect for " + objective, seed=seed))
+
+            # The bounds are sampled, so the best aspect ratio must beat them.
+            for patch_aspect in bounds:
+                try:
+                    _, other_quality = Disk.search_aspect(
+                        radius,
+                        n_patches,
+                        bounds=(patch_aspect, patch_aspect),
+                        objective=objective,
+                        samples=1,
+                        refinements=0)
+                except ValueError:
+                    continue
+                self.assertLessEqual(
+                    quality[objective],
+                    other_quality[objective] + 1.e-12,
+                    msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                        f="optimality of best aspect for " + objective,
+                        seed=seed))
+
+        with self.assertRaises(ValueError):
+            Disk.search_aspect(radius, n_patches, objective="unknown")
+
+
+class TestPatchQuality(unittest.TestCase):
+    """
+    Test `Disk.patch_quality` function.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand()
+        n_patches = np.random.randint(100, 10000)
+        patch_aspect = 0.5 + np.random.rand()
+
+        disk = Disk(radius, n_patches, patch_aspect)
+        quality = disk.patch_quality()
+
+        area_expected, aspect_expected = [], []
+        for annulus in disk.annuli:
+            ri, ro = annulus.extents
+            n = annulus.patch_number
+            area = np.pi * (ro**2. - ri**2.) / n
+            area_expected += [area] * n
+            aspect_expected += [area / (ro - ri)**2.] * n
+
+        self.assertTrue(np.allclose(quality["area"], area_expected),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="patch areas", seed=seed))
+
+        self.assertTrue(np.allclose(quality["aspect"], aspect_expected),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="patch aspect ratios", seed=seed))
+
+        deviation_expected = np.array(aspect_expected) / patch_aspect - 1.
+        deviation_expected[-1] = np.nan
+        self.assertTrue(np.allclose(quality["deviation"],
+                                    deviation_expected,
+                                    equal_nan=True),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="patch aspect deviations", seed=seed))
+
+        self.assertAlmostEqual(
+            quality["max_aspect_deviation"],
+            np.nanmax(np.abs(deviation_expected)),
+            msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                f="maximum aspect deviation", seed=seed))
+
+        # Rings holding no patches are left out of the summaries, and rings
+        # holding a negative number of patches are refused.
+        with np.errstate(all="ignore"):
+            empty, negative = Disk(radius, 100, 4.0), Disk(radius, 44, 6.0)
+        with np.errstate(all="raise"):
+            quality = empty.patch_quality()
+        self.assertTrue(np.any(empty.numbers == 0) and np.all(
+            np.isfinite([
+                quality[key]
+                for key in ("aspect_deviation", "area_error",
+                            "max_aspect_deviation", "max_area_error")
+            ])) and quality["area"].size == empty.patch_number,
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="quality of empty annuli", seed=seed))
+
+        with self.assertRaises(ValueError):
+            negative.patch_quality()
+
+
+class TestSamplePatches(unittest.TestCase):
+    """
+    Test `Disk.sample_patches` function.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand()
+        n_patches = np.random.randint(100, 1000)
+        patch_aspect = 0.5 + np.random.rand()
+
+        disk = Disk(radius, n_patches, patch_aspect)
+        counts = np.random.randint(0, 5, n_patches)
+        points = np.empty((np.sum(counts), 2))
+        disk.sample_patches(points, counts, np.random.default_rng(seed))
+
+        r = np.sqrt(points[:, 0]**2. + points[:, 1]**2.)
+        phi = np.arctan2(points[:, 1], points[:, 0]) % (2. * np.pi)
+
+        # Check that every point lies within the patch it was drawn for.
+        eps = 1.e-12
+        offsets = np.append(0, np.cumsum(counts))
+        p = 0
+        for annulus in disk.annuli:
+            lower, upper = annulus.extents
+            for m in range(annulus.patch_number):
+                drawn = slice(offsets[p], offsets[p + 1])
+                inside = (r[drawn] >= lower - eps) & (r[drawn] <= upper + eps)
+                if annulus.patch_number > 1:
+                    inside &= phi[drawn] >= annulus.patch_extents[m] - eps
+                    inside &= phi[drawn] <= annulus.patch_extents[m + 1] + eps
+                self.assertTrue(
+                    np.all(inside),
+                    msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                        f="points in patch " + str(p), seed=seed))
+                p += 1
+
+        with self.assertRaises(ValueError):
+            disk.sample_patches(np.empty((1, 2)), 2)
+
+        with np.errstate(all="ignore"):
+            negative = Disk(radius, 44, 6.0)
+        with self.assertRaises(ValueError):
+            negative.sample_patches(np.empty((negative.patch_number, 2)), 1)
+
+
+class TestAdjacency(unittest.TestCase):
+    """
+    Test `Disk.adjacency` and `Disk.locate_patches` functions.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand()
+        n_patches = np.random.randint(10, 300)
+        patch_aspect = 0.5 + np.random.rand()
+
+        disk = Disk(radius, n_patches, patch_aspect)
+
+        # Brute-force check of every pair of patches, also with a annulus
+        # without patches, whose neighbors border each other across it.
+        with np.errstate(all="ignore"):
+            empty = Disk(radius, 100, 4.0)
+        self.assertTrue(np.any(empty._numbers == 0),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="annulus without patches", seed=seed))
+        for tessellation in (disk, empty):
+            nonempty = [
+                annulus for annulus in tessellation.annuli
+                if annulus.patch_number > 0
+            ]
+            patches = [(annulus_index, m, annulus.patch_extents[m],
+                        annulus.patch_extents[m + 1])
+                       for annulus_index, annulus in enumerate(nonempty)
+                       for m in range(annulus.patch_number)]
+            numbers = [annulus.patch_number for annulus in nonempty]
+
+            indptr, indices = tessellation.adjacency
+            for p, (l, m, start, stop) in enumerate(patches):
+                expected = []
+                for q, (l_other, m_other, start_other,
+                        stop_other) in enumerate(patches):
+                    if l == l_other:
+                        if numbers[l] > 1 and (m - m_other) % numbers[l] in (
+                                1, numbers[l] - 1):
+                            expected.append(q)
+                    elif abs(l - l_other) == 1:
+                        if max(start,
+                               start_other) < min(stop, stop_other) - 1.e-12:
+                            expected.append(q)
+
+                self.assertEqual(
+                    list(indices[indptr[p]:indptr[p + 1]]),
+                    expected,
+                    msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                        f="neighbors of patch " + str(p), seed=seed))
+
+        # Locate one point drawn within every patch.
+        points = np.empty((n_patches, 2))
+        disk.sample_patches(points, 1, np.random.default_rng(seed))
+        r = np.sqrt(points[:, 0]**2. + points[:, 1]**2.)
+        phi = np.arctan2(points[:, 1], points[:, 0])
+
+        located = np.empty(n_patches, dtype=np.int64)
+        disk.locate_patches(located, r, phi)
+        self.assertTrue(np.array_equal(located, np.arange(n_patches)),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="patch location", seed=seed))
+
+
+class TestRetessellate(unittest.TestCase):
+    """
+    Test `Disk.retessellate` function.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand()
+        n_patches = np.random.randint(100, 10000)
+        patch_aspect = 0.5 + np.random.rand()
+
+        disk = Disk(radius, n_patches, patch_aspect)
+        old = [(ring.extents, ring.patch_number) for ring in disk.annuli]
+        r, phi = np.empty(n_patches), np.empty(n_patches)
+        disk.patch_centers(r, phi)
+
+        # The centers of a subset of the patches match those of every patch.
+        patches = np.random.randint(0, r.size, 10)
+        r_subset, phi_subset = np.empty(10), np.empty(10)
+        disk.patch_centers(r_subset, phi_subset, patches)
+        self.assertTrue(np.array_equal(r_subset, r[patches])
+                        and np.array_equal(phi_subset, phi[patches]),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="patch_centers of a subset", seed=seed))
+
+        n_patches_new = n_patches + np.random.randint(-n_patches // 10,
+                                                      n_patches // 10)
+        old_to_new = disk.retessellate(n_patches_new)
+
+        expected = Disk(radius, n_patches_new, patch_aspect)
+        self.assertEqual([(ring.extents, ring.patch_number)
+                          for ring in disk.annuli],
+                         [(ring.extents, ring.patch_number)
+                          for ring in expected.annuli],
+                         msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                             f="new tessellation", seed=seed))
+
+        # The center of every old patch lies within the new patch it maps to.
+        p = 0
+        for (lower, upper), n in old:
+            for m in range(n):
+                self.assertTrue(
+                    lower <= r[p] <= upper
+                    and (n == 1 or 2. * np.pi * m / n <= phi[p] <= 2. * np.pi *
+                         (m + 1) / n),
+                    msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                        f="center of patch " + str(p), seed=seed))
+                p += 1
+
+        located = np.empty(n_patches, dtype=np.int64)
+        expected.locate_patches(located, r, phi)
+        self.assertTrue(np.array_equal(old_to_new, located),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="mapping of old patches", seed=seed))
+
+        # Nothing changes without a new number of patches.
+        annuli, adjacency = list(disk.annuli), disk.adjacency
+        old_to_new = disk.retessellate(n_patches_new)
+        self.assertTrue(np.array_equal(old_to_new, np.arange(n_patches_new))
+                        and all(a is b for a, b in zip(annuli, disk.annuli))
+                        and disk.adjacency is adjacency,
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="unchanged tessellation", seed=seed))
+
+        # Patches cannot be mapped to a tessellation without annuli.
+        with self.assertRaises(ValueError):
+            disk.retessellate(1)
+        self.assertEqual(disk.patch_number,
+                         n_patches_new,
+                         msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                             f="tessellation without annuli", seed=seed))
+
+
+class TestOverlap(unittest.TestCase):
+    """
+    Test `Disk.overlap` function.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand()
+        disks = [
+            Disk(radius, np.random.randint(10, 300), 0.5 + np.random.rand())
+            for _ in range(2)
+        ]
+
+        # Brute-force intersection of every pair of patches.
+        extents = []
+        for disk in disks:
+            extents.append(
+                np.array([
+                    (annulus.extents[0]**2., annulus.extents[1]**2.,
+                     annulus.patch_extents[m], annulus.patch_extents[m + 1])
+                    for annulus in disk.annuli
+                    for m in range(annulus.patch_number)
+                ]))
+        a, b = extents[0][:, np.newaxis], extents[1][np.newaxis]
+        areas_expected = 0.5 * np.maximum(
+            np.minimum(a[..., 1], b[..., 1]) -
+            np.maximum(a[..., 0], b[..., 0]), 0.) * np.maximum(
+                np.minimum(a[..., 3], b[..., 3]) -
+                np.maximum(a[..., 2], b[..., 2]), 0.)
+
+        areas = disks[0].overlap(disks[1])
+        self.assertTrue(np.allclose(areas.toarray(), areas_expected),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="overlap areas", seed=seed))
+
+        with self.assertRaises(ValueError):
+            disks[0].overlap(Disk(2. * radius, 10, 1.))
+
+
+class TestStrict(unittest.TestCase):
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand()
+        n_patches = np.random.randint(1, 5000)
+        patch_aspect = np.exp(np.random.uniform(np.log(0.1), np.log(50.0)))
+
+        disk = Disk(radius,
+                    n_patches,
+                    patch_aspect,
+                    analytic=True,
+                    strict=True)
+        numbers = disk._numbers
+        self.assertTrue(disk.patch_number == n_patches and np.all(numbers >= 1)
+                        and np.all(np.diff(disk._outer) < 0.0),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="strict patch number", seed=seed))
+
+        iterative = Disk(radius, n_patches, patch_aspect, strict=True)
+        self.assertTrue(np.array_equal(iterative._numbers, numbers)
+                        and np.array_equal(iterative._outer, disk._outer),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="strict iterative rings", seed=seed))
+
+        # Valid tessellations are left unchanged.
+        with np.errstate(all="ignore"):
+            plain = Disk(radius, n_patches, patch_aspect, analytic=True)
+        if np.all(plain._numbers >= 1):
+            self.assertTrue(
+                np.array_equal(plain._numbers, numbers)
+                and np.array_equal(plain._outer, disk._outer),
+                msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                    f="unchanged valid rings", seed=seed))
+
+        n_patches_new = np.random.randint(1, 5000)
+        disk.retessellate(n_patches_new)
+        self.assertTrue(disk.patch_number == n_patches_new
+                        and np.all(disk._numbers >= 1),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="strict retessellation", seed=seed))
+
+
+class TestDraw(unittest.TestCase):
+    """
+    Test `Disk.draw` function.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand() + 0.5
+        n_patches = np.random.randint(10, 100)
+
+        # Also draw tessellations with annuli holding no patches.
+        with np.errstate(all="ignore"):
+            disks = (Disk(radius, n_patches, 1.0), Disk(radius, 100, 4.0))
+        self.assertTrue(np.any(disks[-1].numbers < 1),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="annuli without patches", seed=seed))
+
+        with tempfile.TemporaryDirectory() as directory:
+            for i, disk in enumerate(disks):
+                name = os.path.join(directory, "disk" + str(i))
+                with np.errstate(all="ignore"):
+                    disk.draw(name)
+                self.assertTrue(
+                    os.path.isfile(name + ".pdf"),
+                    msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                        f="drawing of tessellation " + str(i), seed=seed))
+
+
 if __name__ == "__main__":
     unittest.main()
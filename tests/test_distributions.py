@@ -6,6 +6,9 @@ import unittest
 import numpy as np
 
 from spheal import distributions
+from spheal.distributions import metrics, randomization
+from spheal.euclidean import cartesian_from_spherical
+from spheal.hemisphere import Hemisphere
 
 
 class TestGeneralizedSpiral(unittest.TestCase):
@@ -25,12 +28,11 @@ class TestGeneralizedSpiral(unittest.TestCase):
                         msg="class member N differs from expected value. "
                         "RNG seed: {seed}.".format(seed=seed))
 
+        def h(k):
+            return -1.0 + 2.0 * (k - 1.0) / (N - 1.0)
+
         some_k = np.random.randint(2, N - 1)
-        hk = dis._h(some_k)
-        hk_expected = -1.0 + 2.0 * (some_k - 1.0) / (N - 1.0)
-        self.assertTrue(np.allclose(hk, hk_expected),
-                        msg="result of h_k differs from expected value. "
-                        "RNG seed: {seed}.".format(seed=seed))
+        hk = h(some_k)
 
         phase = dis._phase(hk)
         phase_expected = 3.6 / np.sqrt(N * (1.0 - hk**2))
@@ -40,11 +42,11 @@ class TestGeneralizedSpiral(unittest.TestCase):
 
         theta_expected = np.empty(N)
         for k in range(0, N):
-            theta_expected[k] = np.arccos(dis._h(k + 1))
+            theta_expected[k] = np.arccos(h(k + 1))
 
         phi_expected = np.zeros(N)
         for k in range(1, N - 1):
-            phi_expected[k] = phi_expected[k - 1] + dis._phase(dis._h(k + 1))
+            phi_expected[k] = phi_expected[k - 1] + dis._phase(h(k + 1))
 
         self.assertTrue(np.allclose(dis.theta, theta_expected),
                         msg="member theta differs from expected value. "
@@ -55,5 +57,282 @@ class TestGeneralizedSpiral(unittest.TestCase):
                         "RNG seed: {seed}.".format(seed=seed))
 
 
+class TestDistribution(unittest.TestCase):
+    """
+    Test the chunked computation of the angles in `Distribution` class.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        chunk = distributions.distribution.CHUNK_SIZE
+        N = np.random.randint(chunk + 1, 3 * chunk)
+        for f in (distributions.GeneralizedSpiral,
+                  distributions.FibonacciLattice, distributions.PatchCenters):
+            dis = f(N, dtype=np.float64)
+            msg = "\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                f=f.__name__, seed=seed)
+
+            self.assertTrue(np.all((dis.theta >= 0.0) & (dis.theta <= np.pi)),
+                            msg="theta out of range." + msg)
+
+            # The spiral carries its azimuthal angle across the chunks.
+            if f is distributions.GeneralizedSpiral:
+                h = -1.0 + 2.0 * np.arange(N) / (N - 1.0)
+                phi_expected = np.zeros(N)
+                phi_expected[1:N - 1] = np.cumsum(dis._phase(h[1:N - 1]))
+                self.assertTrue(np.array_equal(dis.phi, phi_expected),
+                                msg="phi differs across chunks." + msg)
+
+            # Casting chunk by chunk gives the angles in double precision
+            # rounded to single precision.
+            single = f(N, dtype=np.float32)
+            self.assertTrue(single.theta.dtype == np.float32
+                            and single.phi.dtype == np.float32,
+                            msg="angles not in single precision." + msg)
+            self.assertTrue(
+                np.array_equal(single.theta, dis.theta.astype(np.float32))
+                and np.array_equal(single.phi, dis.phi.astype(np.float32)),
+                msg="single precision angles differ from expected value." +
+                msg)
+
+
+class TestFibonacciLattice(unittest.TestCase):
+    """
+    Test functions in `FibonacciLattice` and `RandomizedFibonacciLattice`
+    classes.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        N = np.random.randint(4, 1000)
+        dis = distributions.FibonacciLattice(N)
+
+        self.assertTrue(N == dis.N,
+                        msg="class member N differs from expected value. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+        golden = 0.5 * (1.0 + np.sqrt(5.0))
+        theta_expected = np.empty(N)
+        phi_expected = np.empty(N)
+        for k in range(N):
+            theta_expected[k] = np.arccos(1.0 - (2.0 * k + 1.0) / N)
+            phi_expected[k] = 2.0 * np.pi * ((k / golden) % 1.0)
+
+        self.assertTrue(np.allclose(dis.theta, theta_expected),
+                        msg="member theta differs from expected value. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+        self.assertTrue(np.allclose(dis.phi, phi_expected),
+                        msg="member phi differs from expected value. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+        # Check random access to a subset of the particles.
+        k = np.random.randint(0, N, 10)
+        theta, phi = np.empty(10), np.empty(10)
+        dis.angles(theta, phi, k)
+        self.assertTrue(np.array_equal(theta, dis.theta[k])
+                        and np.array_equal(phi, dis.phi[k]),
+                        msg="random access differs from expected value. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+        with self.assertRaises(ValueError):
+            dis.angles(theta[:1], phi[:1], [N])
+
+        # The randomized lattice is reproducible and lies within the sphere.
+        randomized = distributions.RandomizedFibonacciLattice(
+            N, np.random.default_rng(seed))
+        randomized_again = distributions.RandomizedFibonacciLattice(
+            N, np.random.default_rng(seed))
+        self.assertTrue(np.array_equal(randomized.theta,
+                                       randomized_again.theta),
+                        msg="randomized lattice is not reproducible. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+        self.assertTrue(np.all((randomized.theta >= 0.0)
+                               & (randomized.theta <= np.pi)
+                               & (randomized.phi >= 0.0)
+                               & (randomized.phi < 2.0 * np.pi)),
+                        msg="randomized angles out of range. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+
+class TestPatchCenters(unittest.TestCase):
+    """
+    Test functions in `PatchCenters` class.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        N = np.random.randint(10, 1000)
+        patch_aspect = 0.5 + np.random.rand()
+        dis = distributions.PatchCenters(N, patch_aspect)
+
+        self.assertTrue(N == dis.N,
+                        msg="class member N differs from expected value. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+        # Every particle should lie in its own patch.
+        n_north = (N + 1) // 2
+        for hemisphere, theta, phi in (
+            (Hemisphere(1.0, n_north, patch_aspect,
+                        strict=True), dis.theta[:n_north], dis.phi[:n_north]),
+            (Hemisphere(1.0, N - n_north, patch_aspect, strict=True),
+             np.pi - dis.theta[n_north:], dis.phi[n_north:]),
+        ):
+            located = np.empty(theta.size, dtype=np.int64)
+            hemisphere.locate_patches(located, theta, phi)
+            self.assertTrue(np.array_equal(located, np.arange(theta.size)),
+                            msg="particles not at patch centers. "
+                            "RNG seed: {seed}.".format(seed=seed))
+
+        # Tessellations that would leave zones without patches near the poles
+        # are built in strict mode instead.
+        for N, patch_aspect in ((2, 1.0), (44, 6.0)):
+            with np.errstate(all="raise"):
+                dis = distributions.PatchCenters(N, patch_aspect)
+            msg = "\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                f="PatchCenters({}, {})".format(N, patch_aspect), seed=seed)
+            self.assertTrue(dis.theta.size == N and dis.phi.size == N,
+                            msg="wrong number of particles." + msg)
+            self.assertTrue(np.all((dis.theta >= 0.0) & (dis.theta <= np.pi)
+                                   & (dis.phi >= 0.0)
+                                   & (dis.phi < 2.0 * np.pi)),
+                            msg="angles out of range." + msg)
+
+        with self.assertRaises(ValueError):
+            distributions.PatchCenters(1)
+
+
+class TestMetrics(unittest.TestCase):
+    """
+    Test functions in `metrics` module.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        N = np.random.randint(10, 500)
+        theta = np.arccos(np.random.uniform(-1.0, 1.0, N))
+        phi = np.random.uniform(0.0, 2.0 * np.pi, N)
+
+        points = np.empty((N, 3))
+        cartesian_from_spherical(points, np.ones(N), theta, phi)
+        chords = np.sqrt(
+            np.sum((points[:, np.newaxis] - points[np.newaxis])**2, axis=2))
+        np.fill_diagonal(chords, np.inf)
+
+        distances = np.empty(N)
+        metrics.nearest_neighbor_distances(distances, theta, phi)
+        distances_expected = 2.0 * np.arcsin(0.5 * np.min(chords, axis=1))
+        self.assertTrue(np.allclose(distances, distances_expected),
+                        msg="nearest-neighbor distances differ from expected "
+                        "value. RNG seed: {seed}.".format(seed=seed))
+
+        self.assertAlmostEqual(metrics.minimum_separation(theta, phi),
+                               np.min(distances_expected),
+                               msg="minimum separation differs from expected "
+                               "value. RNG seed: {seed}.".format(seed=seed))
+
+        s = 0.5 + 2.0 * np.random.rand()
+        energy_expected = np.sum(chords**(-s))
+        self.assertTrue(np.isclose(
+            metrics.riesz_energy(theta, phi, s, cutoff=2.0), energy_expected),
+                        msg="exact Riesz energy differs from expected value. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+        self.assertTrue(np.isclose(metrics.riesz_energy(theta, phi, s),
+                                   energy_expected,
+                                   rtol=0.05),
+                        msg="estimated Riesz energy differs from expected "
+                        "value. RNG seed: {seed}.".format(seed=seed))
+
+        # Compare with caps bounded at, and just above, every point.
+        center = points[0]
+        heights = points @ center
+        discrepancy_expected = 0.0
+        for h in np.concatenate((heights, np.nextafter(heights, 2.0))):
+            inside = np.count_nonzero(heights >= h) / N
+            discrepancy_expected = max(discrepancy_expected,
+                                       abs(inside - 0.5 * (1.0 - h)))
+        discrepancy = metrics.cap_discrepancy(theta, phi, center[np.newaxis])
+        self.assertTrue(np.isclose(discrepancy, discrepancy_expected),
+                        msg="cap discrepancy differs from expected value. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+
+class TestRandomization(unittest.TestCase):
+    """
+    Test functions in `randomization` module.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        n_shells = np.random.randint(2, 50)
+        rotations = np.empty((n_shells, 3, 3))
+        randomization.random_rotations(
+            rotations, randomization.shell_generators(seed, range(n_shells)))
+        self.assertTrue(np.allclose(
+            np.matmul(rotations, rotations.transpose(0, 2, 1)), np.eye(3))
+                        and np.allclose(np.linalg.det(rotations), 1.0),
+                        msg="random rotations are not rotations. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+        # Every shell gets the same rotation however the shells are split.
+        shells = np.random.choice(n_shells, n_shells // 2, replace=False)
+        subset = np.empty((shells.size, 3, 3))
+        randomization.random_rotations(
+            subset, randomization.shell_generators(seed, shells))
+        self.assertTrue(np.array_equal(subset, rotations[shells]),
+                        msg="random rotations depend on the split of shells. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+        offsets = np.empty(n_shells)
+        randomization.random_azimuths(
+            offsets,
+            randomization.shell_generators(seed, range(n_shells), stream=1))
+        self.assertTrue(np.all((offsets >= 0.0) & (offsets < 2.0 * np.pi)),
+                        msg="random azimuths out of range. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+        # Uniform rotations take the pole anywhere on average.
+        many = np.empty((4096, 3, 3))
+        randomization.random_rotations(
+            many, randomization.shell_generators(seed, range(4096)))
+        self.assertTrue(np.allclose(np.mean(many[:, :, 2], axis=0),
+                                    0.0,
+                                    atol=0.1),
+                        msg="random rotations are not uniform. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+        # Rotating angles preserves the distances within a shell.
+        spiral = distributions.GeneralizedSpiral(np.random.randint(10, 100))
+        theta, phi = spiral.theta.copy(), spiral.phi.copy()
+        frames = np.full(spiral.N, np.random.randint(n_shells))
+        randomization.rotate_angles(theta, phi, rotations, frames)
+
+        points = np.empty((spiral.N, 3))
+        cartesian_from_spherical(points, np.ones(spiral.N), spiral.theta,
+                                 spiral.phi)
+        rotated = np.empty((spiral.N, 3))
+        cartesian_from_spherical(rotated, np.ones(spiral.N), theta, phi)
+        self.assertTrue(np.allclose(rotated, points @ rotations[frames[0]].T),
+                        msg="rotated angles differ from expected value. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -98,5 +98,76 @@ class TestRotateAbout(unittest.TestCase):
                         "RNG seed: {seed}.".format(seed=seed))
 
 
+class TestFrameRotations(unittest.TestCase):
+    """
+    Test `frame_rotations` and `rotate` functions.
+    """
+
+    def test(self):
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        M = np.random.randint(4, 10)
+        normals = np.random.randn(M, 3)
+        normals[0] = (0.0, 0.0, 1.0)
+        normals[1] = (0.0, 0.0, -1.0)
+        normals[2] = (1e-9, -1e-9, -1.0)
+        normals /= np.sqrt(np.sum(normals * normals, axis=1))[:, np.newaxis]
+
+        rotations = np.empty((M, 3, 3))
+        euclidean.frame_rotations(rotations, normals)
+
+        self.assertTrue(np.allclose(
+            np.matmul(rotations, rotations.transpose(0, 2, 1)), np.eye(3))
+                        and np.allclose(np.linalg.det(rotations), 1.0),
+                        msg="frame_rotations not giving rotation matrices. "
+                        "RNG seed: {seed}.".format(seed=seed))
+        self.assertTrue(np.allclose(rotations[:, :, 2], normals),
+                        msg="frame_rotations not taking z onto normals. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+        # Compare with the single-vector rotation about z x n.
+        k = np.cross((0.0, 0.0, 1.0), normals[3])
+        angle = np.arcsin(np.sqrt(np.dot(k, k)))
+        if normals[3, 2] < 0.0:
+            angle = np.pi - angle
+        v = np.random.randn(3)
+        v_expected = v.copy()
+        euclidean.rotate_about(v_expected, k / np.sqrt(np.dot(k, k)), angle)
+
+        N = np.random.randint(4, 10)
+        frames = np.random.randint(0, M, N)
+        frames[0] = 3
+        vectors = np.random.randn(N, 3)
+        vectors[0] = v
+        rotated = np.empty((N, 3))
+        euclidean.rotate(rotated, vectors, rotations, frames)
+        self.assertTrue(np.allclose(rotated[0], v_expected),
+                        msg="rotate not matching rotate_about. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+        restored = np.empty((N, 3))
+        euclidean.rotate(restored, rotated, rotations, frames, inverse=True)
+        self.assertTrue(np.allclose(restored, vectors),
+                        msg="rotate not inverted by its inverse. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+        # Long runs of vectors sharing a frame are rotated run by run.
+        frames = np.sort(np.random.randint(0, M, 1000))
+        vectors = np.random.randn(frames.size, 3)
+        rotated = vectors.copy()
+        euclidean.rotate(rotated, rotated, rotations, frames)
+        expected = np.empty_like(vectors)
+        euclidean.rotate(expected, vectors, rotations[frames])
+        self.assertTrue(np.allclose(rotated, expected),
+                        msg="rotate by runs not matching rotate. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+        euclidean.rotate(rotated, rotated, rotations, frames, inverse=True)
+        self.assertTrue(np.allclose(rotated, vectors),
+                        msg="rotate by runs not inverted by its inverse. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+
 if __name__ == "__main__":
     unittest.main()
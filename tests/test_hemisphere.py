@@ -1,10 +1,13 @@
 # Distributed under the MIT License.
 # See LICENSE for details.
 
+import os
+import tempfile
 import unittest
 
 import numpy as np
 
+from spheal.euclidean import spherical_from_cartesian
 from spheal.hemisphere import Hemisphere
 
 
@@ -35,6 +38,26 @@ class TestHemisphere(unittest.TestCase):
                          msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
                              f="patch number", seed=seed))
 
+        # Check that the offsets of the rings match their numbers of patches.
+        self.assertEqual(
+            list(hemisphere.offsets), [0] +
+            list(np.cumsum([ring.patch_number for ring in hemisphere.zones])),
+            msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(f="offsets",
+                                                                  seed=seed))
+
+        # Check that the ring arrays match the rings and are read-only.
+        self.assertTrue(
+            np.array_equal(hemisphere.numbers,
+                           [ring.patch_number for ring in hemisphere.zones])
+            and np.allclose(
+                np.stack((hemisphere.inner, hemisphere.outer), axis=1),
+                [ring.extents for ring in hemisphere.zones])
+            and not any(a.flags.writeable
+                        for a in (hemisphere.inner, hemisphere.outer,
+                                  hemisphere.numbers, hemisphere.offsets)),
+            msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                f="ring arrays", seed=seed))
+
         # Issue #1: area test not passing. Likely related to not being able to
         # reproduce Table 6, line 5 (zenithal angles).
 
@@ -53,6 +76,21 @@ class TestHemisphere(unittest.TestCase):
         #         msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
         #             f="area within theta = {}".format(str(theta_sub)), seed=seed))
 
+        # Check that the closed-form solver gives the same tessellation.
+        n_patches_large = np.random.randint(1000, 100000)
+        hemisphere_analytic = Hemisphere(radius,
+                                         n_patches_large,
+                                         patch_aspect,
+                                         analytic=True)
+        hemisphere_iterative = Hemisphere(radius, n_patches_large,
+                                          patch_aspect)
+        self.assertEqual([(zone.extents, zone.patch_number)
+                          for zone in hemisphere_analytic.zones],
+                         [(zone.extents, zone.patch_number)
+                          for zone in hemisphere_iterative.zones],
+                         msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                             f="analytic ring computation", seed=seed))
+
         def get_partial_numbers(hemisphere):
             patch_numbers = []
             partial_number = 0
@@ -80,5 +118,454 @@ class TestHemisphere(unittest.TestCase):
                              f="comparison with BB12 Table 6", seed=seed))
 
 
+class TestSearchAspect(unittest.TestCase):
+    """
+    Test `Hemisphere.search_aspect` function.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand()
+        n_patches = np.random.randint(100, 10000)
+        bounds = (0.5, 4.)
+
+        for objective in ("aspect_deviation", "area_error"):
+            hemisphere, quality = Hemisphere.search_aspect(radius,
+                                                           n_patches,
+                                                           bounds=bounds,
+                                                           objective=objective)
+
+            self.assertEqual(
+                hemisphere.patch_number,
+                n_patches,
+                msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                    f="patch number with best " + objective, seed=seed))
+
+            self.assertTrue(
+                bounds[0] <= quality["patch_aspect"] <= bounds[1],
+                msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                    f="bounds of best aspect for " + objective, seed=seed))
+
+            # The bounds are sampled, so the best aspect ratio must beat them.
+            for patch_aspect in bounds:
+                try:
+                    _, other_quality = Hemisphere.search_aspect(
+                        radius,
+                        n_patches,
+                        bounds=(patch_aspect, patch_aspect),
+                        objective=objective,
+                        samples=1,
+                        refinements=0)
+                except ValueError:
+                    continue
+                self.assertLessEqual(
+                    quality[objective],
+                    other_quality[objective] + 1.e-12,
+                    msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                        f="optimality of best aspect for " + objective,
+                        seed=seed))
+
+        with self.assertRaises(ValueError):
+            Hemisphere.search_aspect(radius, n_patches, objective="unknown")
+
+
+class TestPatchQuality(unittest.TestCase):
+    """
+    Test `Hemisphere.patch_quality` function.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand()
+        n_patches = np.random.randint(100, 10000)
+        patch_aspect = 0.5 + np.random.rand()
+
+        hemisphere = Hemisphere(radius, n_patches, patch_aspect)
+        quality = hemisphere.patch_quality()
+
+        area_expected, aspect_expected = [], []
+        for zone in hemisphere.zones:
+            ri, ro = zone.extents
+            n = zone.patch_number
+            area = 2. * np.pi * radius**2. * (np.cos(ri) - np.cos(ro)) / n
+            area_expected += [area] * n
+            aspect_expected += [area / (radius * (ro - ri))**2.] * n
+
+        self.assertTrue(np.allclose(quality["area"], area_expected),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="patch areas", seed=seed))
+
+        self.assertTrue(np.allclose(quality["aspect"], aspect_expected),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="patch aspect ratios", seed=seed))
+
+        deviation_expected = np.array(aspect_expected) / patch_aspect - 1.
+        deviation_expected[-1] = np.nan
+        self.assertTrue(np.allclose(quality["deviation"],
+                                    deviation_expected,
+                                    equal_nan=True),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="patch aspect deviations", seed=seed))
+
+        self.assertAlmostEqual(
+            quality["max_aspect_deviation"],
+            np.nanmax(np.abs(deviation_expected)),
+            msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                f="maximum aspect deviation", seed=seed))
+
+        # Rings holding no patches are left out of the summaries, and rings
+        # holding a negative number of patches are refused.
+        with np.errstate(all="ignore"):
+            empty, negative = Hemisphere(radius, 44,
+                                         4.0), Hemisphere(radius, 100, 6.0)
+        with np.errstate(all="raise"):
+            quality = empty.patch_quality()
+        self.assertTrue(np.any(empty.numbers == 0) and np.all(
+            np.isfinite([
+                quality[key]
+                for key in ("aspect_deviation", "area_error",
+                            "max_aspect_deviation", "max_area_error")
+            ])) and quality["area"].size == empty.patch_number,
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="quality of empty zones", seed=seed))
+
+        with self.assertRaises(ValueError):
+            negative.patch_quality()
+
+
+class TestSamplePatches(unittest.TestCase):
+    """
+    Test `Hemisphere.sample_patches` function.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand()
+        n_patches = np.random.randint(100, 1000)
+        patch_aspect = 0.5 + np.random.rand()
+
+        hemisphere = Hemisphere(radius, n_patches, patch_aspect)
+        counts = np.random.randint(0, 5, n_patches)
+        points = np.empty((np.sum(counts), 3))
+        hemisphere.sample_patches(points, counts, np.random.default_rng(seed))
+
+        r = np.sqrt(np.sum(points**2., axis=1))
+        self.assertTrue(np.allclose(r, radius),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="radius of sampled points", seed=seed))
+
+        theta, phi = np.empty_like(r), np.empty_like(r)
+        spherical_from_cartesian(theta, phi, points[:, 0], points[:, 1],
+                                 points[:, 2], r)
+        phi = phi % (2. * np.pi)
+
+        # Check that every point lies within the patch it was drawn for.
+        eps = 1.e-12
+        offsets = np.append(0, np.cumsum(counts))
+        p = 0
+        for zone in hemisphere.zones:
+            lower, upper = zone.extents
+            for m in range(zone.patch_number):
+                drawn = slice(offsets[p], offsets[p + 1])
+                inside = (theta[drawn] >= lower - eps) & (theta[drawn]
+                                                          <= upper + eps)
+                if zone.patch_number > 1:
+                    inside &= phi[drawn] >= zone.patch_extents[m] - eps
+                    inside &= phi[drawn] <= zone.patch_extents[m + 1] + eps
+                self.assertTrue(
+                    np.all(inside),
+                    msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                        f="points in patch " + str(p), seed=seed))
+                p += 1
+
+        with self.assertRaises(ValueError):
+            hemisphere.sample_patches(np.empty((1, 3)), 2)
+
+        with np.errstate(all="ignore"):
+            negative = Hemisphere(radius, 100, 6.0)
+        with self.assertRaises(ValueError):
+            negative.sample_patches(np.empty((negative.patch_number, 3)), 1)
+
+
+class TestAdjacency(unittest.TestCase):
+    """
+    Test `Hemisphere.adjacency` and `Hemisphere.locate_patches` functions.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand()
+        n_patches = np.random.randint(10, 300)
+        patch_aspect = 0.5 + np.random.rand()
+
+        hemisphere = Hemisphere(radius, n_patches, patch_aspect)
+
+        # Brute-force check of every pair of patches, also with a zone
+        # without patches, whose neighbors border each other across it.
+        with np.errstate(all="ignore"):
+            empty = Hemisphere(radius, 44, 4.0)
+        self.assertTrue(np.any(empty._numbers == 0),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="zone without patches", seed=seed))
+        for tessellation in (hemisphere, empty):
+            nonempty = [
+                zone for zone in tessellation.zones if zone.patch_number > 0
+            ]
+            patches = [(zone_index, m, zone.patch_extents[m],
+                        zone.patch_extents[m + 1])
+                       for zone_index, zone in enumerate(nonempty)
+                       for m in range(zone.patch_number)]
+            numbers = [zone.patch_number for zone in nonempty]
+
+            indptr, indices = tessellation.adjacency
+            for p, (l, m, start, stop) in enumerate(patches):
+                expected = []
+                for q, (l_other, m_other, start_other,
+                        stop_other) in enumerate(patches):
+                    if l == l_other:
+                        if numbers[l] > 1 and (m - m_other) % numbers[l] in (
+                                1, numbers[l] - 1):
+                            expected.append(q)
+                    elif abs(l - l_other) == 1:
+                        if max(start,
+                               start_other) < min(stop, stop_other) - 1.e-12:
+                            expected.append(q)
+
+                self.assertEqual(
+                    list(indices[indptr[p]:indptr[p + 1]]),
+                    expected,
+                    msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                        f="neighbors of patch " + str(p), seed=seed))
+
+        # Zones with a negative number of patches have no adjacency.
+        with np.errstate(all="ignore"):
+            negative = Hemisphere(radius, 100, 6.0)
+        with self.assertRaises(ValueError):
+            negative.adjacency
+
+        # Locate one point drawn within every patch.
+        points = np.empty((n_patches, 3))
+        hemisphere.sample_patches(points, 1, np.random.default_rng(seed))
+        theta, phi = np.empty(n_patches), np.empty(n_patches)
+        spherical_from_cartesian(theta, phi, points[:, 0], points[:, 1],
+                                 points[:, 2])
+
+        located = np.empty(n_patches, dtype=np.int64)
+        hemisphere.locate_patches(located, theta, phi)
+        self.assertTrue(np.array_equal(located, np.arange(n_patches)),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="patch location", seed=seed))
+
+
+class TestRetessellate(unittest.TestCase):
+    """
+    Test `Hemisphere.retessellate` function.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand()
+        n_patches = np.random.randint(100, 10000)
+        patch_aspect = 0.5 + np.random.rand()
+
+        hemisphere = Hemisphere(radius, n_patches, patch_aspect)
+        old = [(ring.extents, ring.patch_number) for ring in hemisphere.zones]
+        theta, phi = np.empty(n_patches), np.empty(n_patches)
+        hemisphere.patch_centers(theta, phi)
+
+        # The centers of a subset of the patches match those of every patch.
+        patches = np.random.randint(0, theta.size, 10)
+        theta_subset, phi_subset = np.empty(10), np.empty(10)
+        hemisphere.patch_centers(theta_subset, phi_subset, patches)
+        self.assertTrue(np.array_equal(theta_subset, theta[patches])
+                        and np.array_equal(phi_subset, phi[patches]),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="patch_centers of a subset", seed=seed))
+
+        n_patches_new = n_patches + np.random.randint(-n_patches // 10,
+                                                      n_patches // 10)
+        old_to_new = hemisphere.retessellate(n_patches_new)
+
+        expected = Hemisphere(radius, n_patches_new, patch_aspect)
+        self.assertEqual([(ring.extents, ring.patch_number)
+                          for ring in hemisphere.zones],
+                         [(ring.extents, ring.patch_number)
+                          for ring in expected.zones],
+                         msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                             f="new tessellation", seed=seed))
+
+        # The center of every old patch lies within the new patch it maps to.
+        p = 0
+        for (lower, upper), n in old:
+            for m in range(n):
+                self.assertTrue(
+                    lower <= theta[p] <= upper
+                    and (n == 1 or 2. * np.pi * m / n <= phi[p] <= 2. * np.pi *
+                         (m + 1) / n),
+                    msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                        f="center of patch " + str(p), seed=seed))
+                p += 1
+
+        located = np.empty(n_patches, dtype=np.int64)
+        expected.locate_patches(located, theta, phi)
+        self.assertTrue(np.array_equal(old_to_new, located),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="mapping of old patches", seed=seed))
+
+        # Nothing changes without a new number of patches.
+        zones, adjacency = list(hemisphere.zones), hemisphere.adjacency
+        old_to_new = hemisphere.retessellate(n_patches_new)
+        self.assertTrue(np.array_equal(old_to_new, np.arange(n_patches_new))
+                        and all(a is b
+                                for a, b in zip(zones, hemisphere.zones))
+                        and hemisphere.adjacency is adjacency,
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="unchanged tessellation", seed=seed))
+
+        # Patches cannot be mapped to a tessellation without zones.
+        with self.assertRaises(ValueError):
+            hemisphere.retessellate(1)
+        self.assertEqual(hemisphere.patch_number,
+                         n_patches_new,
+                         msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                             f="tessellation without zones", seed=seed))
+
+
+class TestOverlap(unittest.TestCase):
+    """
+    Test `Hemisphere.overlap` function.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand()
+        hemispheres = [
+            Hemisphere(radius, np.random.randint(10, 300),
+                       0.5 + np.random.rand()) for _ in range(2)
+        ]
+
+        # Brute-force intersection of every pair of patches.
+        extents = []
+        for hemisphere in hemispheres:
+            extents.append(
+                np.array([(-np.cos(zone.extents[0]), -np.cos(zone.extents[1]),
+                           zone.patch_extents[m], zone.patch_extents[m + 1])
+                          for zone in hemisphere.zones
+                          for m in range(zone.patch_number)]))
+        a, b = extents[0][:, np.newaxis], extents[1][np.newaxis]
+        areas_expected = radius**2. * np.maximum(
+            np.minimum(a[..., 1], b[..., 1]) -
+            np.maximum(a[..., 0], b[..., 0]), 0.) * np.maximum(
+                np.minimum(a[..., 3], b[..., 3]) -
+                np.maximum(a[..., 2], b[..., 2]), 0.)
+
+        areas = hemispheres[0].overlap(hemispheres[1])
+        self.assertTrue(np.allclose(areas.toarray(), areas_expected),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="overlap areas", seed=seed))
+
+        with self.assertRaises(ValueError):
+            hemispheres[0].overlap(Hemisphere(2. * radius, 10, 1.))
+
+
+class TestStrict(unittest.TestCase):
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand()
+        n_patches = np.random.randint(1, 5000)
+        patch_aspect = np.exp(np.random.uniform(np.log(0.1), np.log(50.0)))
+
+        hemisphere = Hemisphere(radius,
+                                n_patches,
+                                patch_aspect,
+                                analytic=True,
+                                strict=True)
+        numbers = hemisphere._numbers
+        self.assertTrue(hemisphere.patch_number == n_patches
+                        and np.all(numbers >= 1)
+                        and np.all(np.diff(hemisphere._outer) < 0.0),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="strict patch number", seed=seed))
+
+        iterative = Hemisphere(radius, n_patches, patch_aspect, strict=True)
+        self.assertTrue(
+            np.array_equal(iterative._numbers, numbers)
+            and np.array_equal(iterative._outer, hemisphere._outer),
+            msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                f="strict iterative rings", seed=seed))
+
+        # Valid tessellations are left unchanged.
+        with np.errstate(all="ignore"):
+            plain = Hemisphere(radius, n_patches, patch_aspect, analytic=True)
+        if np.all(plain._numbers >= 1):
+            self.assertTrue(
+                np.array_equal(plain._numbers, numbers)
+                and np.array_equal(plain._outer, hemisphere._outer),
+                msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                    f="unchanged valid rings", seed=seed))
+
+        n_patches_new = np.random.randint(1, 5000)
+        hemisphere.retessellate(n_patches_new)
+        self.assertTrue(hemisphere.patch_number == n_patches_new
+                        and np.all(hemisphere._numbers >= 1),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="strict retessellation", seed=seed))
+
+
+class TestDraw(unittest.TestCase):
+    """
+    Test `Hemisphere.draw_lambert_proj` function.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand() + 0.5
+        n_patches = np.random.randint(10, 100)
+
+        # Also draw tessellations with zones holding no patches.
+        with np.errstate(all="ignore"):
+            hemispheres = (Hemisphere(radius, n_patches,
+                                      1.0), Hemisphere(radius, 44, 4.0),
+                           Hemisphere(radius, 100, 6.0))
+        self.assertTrue(np.any(hemispheres[-1].numbers < 1),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="zones without patches", seed=seed))
+
+        with tempfile.TemporaryDirectory() as directory:
+            for i, hemisphere in enumerate(hemispheres):
+                name = os.path.join(directory, "hemisphere" + str(i))
+                with np.errstate(all="ignore"):
+                    hemisphere.draw_lambert_proj(name)
+                self.assertTrue(
+                    os.path.isfile(name + ".pdf"),
+                    msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                        f="drawing of tessellation " + str(i), seed=seed))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,72 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+
+import unittest
+
+import numpy as np
+
+from spheal.hierarchy import Hierarchy
+
+
+class TestHierarchy(unittest.TestCase):
+    """
+    Test `Hierarchy` class.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand()
+        patch_aspect = 0.5 + np.random.rand()
+        base = np.random.randint(10, 100)
+        n_patches = [base * 4**l for l in range(3)]
+        hierarchy = Hierarchy(radius, n_patches, patch_aspect)
+
+        self.assertEqual([level.patch_number for level in hierarchy.levels],
+                         sorted(n_patches, reverse=True),
+                         msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                             f="order of levels", seed=seed))
+
+        def areas(level):
+            return hierarchy.levels[level].patch_quality()["area"]
+
+        # Averages conserve integrals and constant values across levels.
+        values = np.random.randn(n_patches[2], 2)
+        coarse = hierarchy.restrict(values, 0, 2)
+        self.assertTrue(np.allclose(areas(0) @ values,
+                                    areas(2) @ coarse),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="conservation of restriction", seed=seed))
+
+        fine = hierarchy.prolong(coarse, 2, 2)
+        self.assertTrue(np.allclose(areas(0) @ fine,
+                                    areas(2) @ coarse),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="conservation of prolongation", seed=seed))
+
+        constant = np.random.randn()
+        self.assertTrue(np.allclose(
+            hierarchy.restrict(np.full(n_patches[2], constant)), constant)
+                        and np.allclose(
+                            hierarchy.prolong(np.full(n_patches[0], constant),
+                                              2), constant),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="constant values", seed=seed))
+
+        with self.assertRaises(ValueError):
+            hierarchy.restrict(values, 1, 2)
+
+        # A level with a zone holding no patches still covers the hemisphere.
+        hierarchy = Hierarchy(radius, [500, 200, 44], 4.0)
+        self.assertTrue(
+            np.any(hierarchy.levels[2].numbers == 0)
+            and np.allclose(hierarchy.prolong(np.ones(44), 2), 1.0)
+            and np.allclose(hierarchy.restrict(np.ones(200), 1), 1.0),
+            msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                f="levels with empty zones", seed=seed))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+
+import unittest
+
+import numpy as np
+
+from spheal.euclidean import cartesian_from_spherical
+from spheal.index import ParticleIndex
+
+
+class TestParticleIndex(unittest.TestCase):
+    """
+    Test `ParticleIndex` class.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        # Particles on a few concentric shells.
+        N = np.random.randint(100, 2000)
+        particles = np.empty((N, 3))
+        cartesian_from_spherical(particles,
+                                 np.random.randint(1, 4, N).astype(float),
+                                 np.arccos(np.random.uniform(-1.0, 1.0, N)),
+                                 np.random.uniform(0.0, 2.0 * np.pi, N))
+        index = ParticleIndex(particles)
+
+        M = np.random.randint(1, 300)
+        probes = 2.0 * np.random.randn(M, 3)
+        distances = np.sqrt(
+            np.sum((probes[:, np.newaxis] - particles[np.newaxis])**2, axis=2))
+
+        radius = np.random.rand()
+        indptr, indices, found = index.query_radius(probes, radius)
+        for i in range(M):
+            expected = np.flatnonzero(distances[i] <= radius)
+            self.assertTrue(
+                np.array_equal(indices[indptr[i]:indptr[i + 1]], expected)
+                and np.allclose(found[indptr[i]:indptr[i + 1]],
+                                distances[i, expected]),
+                msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                    f="radius query of probe " + str(i), seed=seed))
+
+        k = np.random.randint(1, 20)
+        indices, found = index.query_knn(probes, k)
+        self.assertTrue(np.allclose(found,
+                                    np.sort(distances, axis=1)[:, :k]),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="distances of nearest neighbors", seed=seed))
+        self.assertTrue(np.allclose(
+            np.take_along_axis(distances, indices, axis=1), found),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="indices of nearest neighbors", seed=seed))
+
+        pairs = set()
+        for i, j, _ in index.query_pairs(radius):
+            pairs.update(zip(np.minimum(i, j), np.maximum(i, j)))
+        among = np.sqrt(
+            np.sum((particles[:, np.newaxis] - particles[np.newaxis])**2,
+                   axis=2))
+        i, j = np.nonzero(np.triu(among <= radius, 1))
+        self.assertEqual(pairs,
+                         set(zip(i, j)),
+                         msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                             f="pairs of particles", seed=seed))
+
+        with self.assertRaises(ValueError):
+            index.query_knn(probes, N + 1)
+
+        with self.assertRaises(ValueError):
+            ParticleIndex(np.empty((N, 2)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+
+import unittest
+
+import numpy as np
+
+from spheal import integration
+from spheal.hemisphere import Hemisphere
+from spheal.oriented import OrientedHemispheres
+
+
+class TestIntegration(unittest.TestCase):
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        n_patches = np.random.randint(10, 500)
+        hemisphere = Hemisphere(np.random.rand() + 0.5,
+                                n_patches,
+                                1.0,
+                                analytic=True)
+        P = hemisphere.patch_number
+
+        omega, factors = np.empty(P), np.empty(P)
+        integration.solid_angles(omega, hemisphere)
+        integration.view_factors(factors, hemisphere)
+        self.assertTrue(np.isclose(np.sum(omega), 2.0 * np.pi)
+                        and np.isclose(np.sum(factors), 1.0),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="total solid angle and view factor", seed=seed))
+
+        order = np.random.randint(1, 5)
+        quadrature = integration.PatchQuadrature(hemisphere, order)
+        self.assertTrue(
+            np.allclose(np.sum(quadrature.weights, axis=1), omega)
+            and np.allclose(np.sum(quadrature.directions**2.0, axis=-1), 1.0),
+            msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                f="quadrature nodes", seed=seed))
+
+        # The cosine weight is linear in cos(theta), so it is exact.
+        integrals = quadrature.integrate(
+            lambda directions: np.ones(directions.shape[:-1]), cosine=True)
+        self.assertTrue(np.allclose(integrals / np.pi, factors),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="cosine-weighted integral", seed=seed))
+
+        # Powers of cos(theta) of degree lower than 2 order are exact.
+        k = np.random.randint(0, 2 * order)
+        u_inner = np.cos(hemisphere._inner)**(k + 1.0)
+        u_outer = np.cos(hemisphere._outer)**(k + 1.0)
+        rings = np.repeat(np.arange(hemisphere._numbers.size),
+                          hemisphere._numbers)
+        expected = (2.0 * np.pi * (u_inner - u_outer) /
+                    ((k + 1.0) * hemisphere._numbers))[rings]
+        self.assertTrue(np.allclose(
+            quadrature.integrate(lambda directions: directions[..., 2]**k),
+            expected),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="polynomial integrand", seed=seed))
+
+        # The cosine to the normal of oriented copies is their view factor.
+        M = np.random.randint(1, 20)
+        oriented = OrientedHemispheres(hemisphere, np.random.randn(M, 3))
+        integrals = quadrature.integrate(lambda directions, frames: np.sum(
+            directions * oriented.normals[frames], axis=-1),
+                                         oriented=oriented,
+                                         chunk=np.random.randint(1, 8))
+        self.assertTrue(np.allclose(integrals / np.pi,
+                                    np.broadcast_to(factors, (M, P))),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="oriented integral", seed=seed))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+
+import unittest
+
+import numpy as np
+
+from spheal.hemisphere import Hemisphere
+from spheal.oriented import OrientedHemispheres
+
+
+class TestOrientedHemispheres(unittest.TestCase):
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand() + 0.5
+        n_patches = np.random.randint(10, 200)
+        hemisphere = Hemisphere(radius, n_patches, 1.0, analytic=True)
+        P = hemisphere.patch_number
+
+        M = np.random.randint(1, 50)
+        normals = np.random.randn(M, 3)
+        oriented = OrientedHemispheres(hemisphere, 2.0 * normals)
+        self.assertTrue(np.allclose(
+            oriented.normals,
+            normals / np.sqrt(np.sum(normals * normals, axis=1))[:, None]),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="normalized normals", seed=seed))
+
+        counts = np.random.randint(0, 3, (M, P))
+        points = np.empty((np.sum(counts), 3))
+        oriented.sample_patches(points,
+                                counts,
+                                rng=np.random.default_rng(seed))
+
+        frames = np.repeat(np.arange(M), np.sum(counts, axis=1))
+        expected = np.concatenate(
+            [np.repeat(np.arange(P), counts[f]) for f in range(M)])
+
+        # Every point lies on the hemisphere of its copy.
+        heights = np.sum(points * oriented.normals[frames], axis=1)
+        self.assertTrue(
+            np.allclose(np.sqrt(np.sum(points * points, axis=1)), radius)
+            and np.all(heights >= -1e-12 * radius),
+            msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                f="sampled points", seed=seed))
+
+        # Every point is located in the patch it was drawn in.
+        patches = np.empty(points.shape[0], dtype=np.int64)
+        oriented.locate_patches(patches, points, frames)
+        self.assertTrue(np.array_equal(patches, expected),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="located patches", seed=seed))
+
+        # Local coordinates match the unrotated tessellation.
+        local = np.empty_like(points)
+        oriented.to_local(local, points, frames)
+        theta = np.arccos(np.clip(local[:, 2] / radius, -1.0, 1.0))
+        phi = np.arctan2(local[:, 1], local[:, 0])
+        located = np.empty(points.shape[0], dtype=np.int64)
+        hemisphere.locate_patches(located, theta, phi)
+        self.assertTrue(np.array_equal(located, expected),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="local coordinates", seed=seed))
+
+        with self.assertRaises(ValueError):
+            OrientedHemispheres(hemisphere, np.zeros((1, 3)))
+
+
+if __name__ == "__main__":
+    unittest.main()
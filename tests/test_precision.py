@@ -0,0 +1,67 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+
+import unittest
+
+import numpy as np
+
+from spheal import distributions, precision
+from spheal.disk import Disk
+from spheal.hemisphere import Hemisphere
+
+
+class TestPrecision(unittest.TestCase):
+    """
+    Test functions in `precision` module.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        N = np.random.randint(4, 100)
+
+        self.assertEqual(precision.default_dtype(),
+                         np.float64,
+                         msg="default type differs from expected value. "
+                         "RNG seed: {seed}.".format(seed=seed))
+
+        with self.assertRaises(TypeError):
+            precision.float_dtype(np.int32)
+
+        dis64 = distributions.GeneralizedSpiral(N)
+        dis32 = distributions.GeneralizedSpiral(N, dtype=np.float32)
+        self.assertTrue(dis32.theta.dtype == np.float32
+                        and dis32.phi.dtype == np.float32,
+                        msg="explicit type not used by GeneralizedSpiral. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+        # Single precision results are rounded double precision ones.
+        self.assertTrue(np.array_equal(dis32.phi,
+                                       dis64.phi.astype(np.float32)),
+                        msg="GeneralizedSpiral not computed in double "
+                        "precision. RNG seed: {seed}.".format(seed=seed))
+
+        precision.set_default_dtype(np.float32)
+        try:
+            self.assertEqual(distributions.GeneralizedSpiral(N).theta.dtype,
+                             np.float32,
+                             msg="default type not used by GeneralizedSpiral. "
+                             "RNG seed: {seed}.".format(seed=seed))
+
+            for tessellation in (Disk(1., 10 * N,
+                                      1.), Hemisphere(1., 10 * N, 1.)):
+                quality = tessellation.patch_quality()
+                self.assertTrue(
+                    all(quality[key].dtype == np.float32
+                        for key in ("area", "aspect", "deviation")),
+                    msg="default type not used by {t}. "
+                    "RNG seed: {seed}.".format(t=type(tessellation).__name__,
+                                               seed=seed))
+        finally:
+            precision.set_default_dtype(np.float64)
+
+
+if __name__ == "__main__":
+    unittest.main()
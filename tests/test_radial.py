@@ -6,6 +6,7 @@ import unittest
 import numpy as np
 
 from spheal import radial
+from spheal.radial import profile as profile_module
 
 
 class TestRadial(unittest.TestCase):
@@ -37,6 +38,67 @@ class TestRadial(unittest.TestCase):
         test(radial.Exponential(), lambda r: 1.0 - np.exp(-2.0 * r) *
              (1.0 + 2.0 * r + 2.0 * r**2), 2.661160168917105)
 
+        # Number density of the exponential profile, tabulated.
+        radii = np.linspace(0.0, 30.0, 100001)
+        test(radial.Tabulated(radii,
+                              np.exp(-2.0 * radii) / np.pi),
+             lambda r: 1.0 - np.exp(-2.0 * r) * (1.0 + 2.0 * r + 2.0 * r**2),
+             2.661160168917105)
+
+        with self.assertRaises(ValueError):
+            radial.Tabulated(radii[::-1], np.ones_like(radii))
+
+
+class TestQuantileRadius(unittest.TestCase):
+    """
+    Test `quantile_radius` function of radial profiles.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        N = np.random.randint(2, 10)
+        radii = np.linspace(0.0, 30.0, 100001)
+
+        for profile in (radial.Exponential(),
+                        radial.Tabulated(radii,
+                                         np.exp(-2.0 * radii) / np.pi)):
+            q = np.random.rand(N)
+            r = profile.quantile_radius(q)
+            self.assertTrue(
+                np.allclose(profile.particle_number(r), q),
+                msg="quantile radius for {profile} not giving expected result. "
+                "RNG seed: {seed}.".format(profile=type(profile).__name__,
+                                           seed=seed))
+
+            self.assertTrue(
+                np.allclose(profile.quantile_radius(0.9), profile.r90),
+                msg="quantile radius for {profile} not giving R_90. "
+                "RNG seed: {seed}.".format(profile=type(profile).__name__,
+                                           seed=seed))
+
+            with self.assertRaises(ValueError):
+                profile.quantile_radius(1.5)
+
+        # Only small queries are cached, and only up to a bounded number.
+        profile = radial.Exponential()
+        q = np.random.rand(profile_module.MAX_CACHED_FRACTIONS + 1)
+        self.assertTrue(np.allclose(
+            profile.particle_number(profile.quantile_radius(q)), q),
+                        msg="large query not giving expected result. "
+                        "RNG seed: {seed}.".format(seed=seed))
+        for x in np.random.rand(profile_module.MAX_CACHED_QUERIES + 1):
+            self.assertEqual(profile.quantile_radius(x),
+                             profile.quantile_radius(x),
+                             msg="cached quantile radius differing. "
+                             "RNG seed: {seed}.".format(seed=seed))
+        self.assertEqual(len(profile._quantile_radii),
+                         profile_module.MAX_CACHED_QUERIES,
+                         msg="quantile radius cache not bounded. "
+                         "RNG seed: {seed}.".format(seed=seed))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,76 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+
+import unittest
+
+import numpy as np
+
+from spheal.disk import Disk
+from spheal.hemisphere import Hemisphere
+from spheal.remap import Remapper
+
+
+class TestRemapper(unittest.TestCase):
+    """
+    Test `Remapper` class.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand()
+        source = Disk(radius, np.random.randint(100, 1000),
+                      0.5 + np.random.rand())
+        target = Disk(radius, np.random.randint(100, 1000),
+                      0.5 + np.random.rand())
+        remapper = Remapper(source, target)
+
+        source_areas = source.patch_quality()["area"]
+        target_areas = target.patch_quality()["area"]
+
+        averages = np.random.randn(source.patch_number, 2)
+        remapped = remapper.remap(averages)
+        self.assertTrue(np.allclose(target_areas @ remapped,
+                                    source_areas @ averages),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="conservation of averages", seed=seed))
+
+        constant = np.random.randn()
+        self.assertTrue(np.allclose(
+            remapper.remap(np.full(source.patch_number, constant)), constant),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="constant averages", seed=seed))
+
+        totals = np.random.rand(source.patch_number)
+        self.assertTrue(np.allclose(
+            remapper.remap_totals(totals),
+            target_areas * remapper.remap(totals / source_areas)),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="remapping of totals", seed=seed))
+
+        self.assertTrue(np.allclose(
+            Remapper(source, source).remap(averages), averages),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="remapping to the same disk", seed=seed))
+
+        # Source rings holding no patches cover no area.
+        for source, target in ((Disk(radius, 100,
+                                     4.0), target), (Hemisphere(1.0, 44, 4.0),
+                                                     Hemisphere(1.0, 200,
+                                                                4.0))):
+            remapper = Remapper(source, target)
+            averages = np.random.randn(source.patch_number)
+            self.assertTrue(
+                np.any(source.numbers == 0) and np.allclose(
+                    remapper.remap(np.ones(source.patch_number)), 1.0)
+                and np.allclose(
+                    target.patch_quality()["area"] @ remapper.remap(averages),
+                    source.patch_quality()["area"] @ averages),
+                msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                    f="source with empty rings", seed=seed))
+
+
+if __name__ == "__main__":
+    unittest.main()
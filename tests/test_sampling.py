@@ -0,0 +1,129 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+
+import unittest
+
+import numpy as np
+
+from spheal.hemisphere import Hemisphere
+from spheal.sampling import PatchSampler, _alias_tables
+
+
+class TestPatchSampler(unittest.TestCase):
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        radius = np.random.rand() + 0.5
+        n_patches = np.random.randint(10, 100)
+        hemisphere = Hemisphere(radius, n_patches, 1.0, analytic=True)
+        P = hemisphere.patch_number
+
+        weights = np.random.rand(P)**4
+        weights[np.random.rand(P) < 0.2] = 0.0
+        weights[0] = 1.0
+        sampler = PatchSampler(hemisphere, weights)
+
+        samples = 400000
+        points = np.empty((samples, 3))
+        patches = np.empty(samples, dtype=np.int64)
+        sampler.sample(points, patches, rng=np.random.default_rng(seed))
+
+        # Patches are drawn in proportion to their weights, within a generous
+        # multiple of the standard deviation of their counts.
+        expected = samples * weights / np.sum(weights)
+        counts = np.bincount(patches, minlength=P)
+        self.assertTrue(
+            np.all(np.abs(counts - expected) <= 6.0 * np.sqrt(expected) + 1.0)
+            and np.all(counts[weights == 0.0] == 0),
+            msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                f="sampled patches", seed=seed))
+
+        # Every point lies in the patch it was drawn in.
+        theta = np.arccos(np.clip(points[:, 2] / radius, -1.0, 1.0))
+        phi = np.arctan2(points[:, 1], points[:, 0])
+        located = np.empty(samples, dtype=np.int64)
+        hemisphere.locate_patches(located, theta, phi)
+        self.assertTrue(np.array_equal(located, patches),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="sampled points", seed=seed))
+
+        # Updating some weights draws as a sampler built from scratch.
+        changed = np.random.choice(P, np.random.randint(1, P), replace=False)
+        weights[changed] = np.random.rand(changed.size)
+        sampler.update(changed, weights[changed])
+        rebuilt = PatchSampler(hemisphere, weights)
+        for f in ("_prob", "_alias", "_zone_prob", "_zone_alias"):
+            self.assertTrue(
+                np.allclose(getattr(sampler, f),
+                            getattr(rebuilt, f),
+                            rtol=0.0,
+                            atol=1e-12),
+                msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                    f="update of " + f, seed=seed))
+
+        # The tables draw every patch with its normalized weight, also with
+        # integer and tied weights, whose cumulative sums meet exactly.
+        numbers = hemisphere.numbers
+        rings = np.repeat(np.arange(numbers.size), numbers)
+        for f, w in (("random weights", np.random.rand(P)**4),
+                     ("integer weights", np.random.randint(0, 3, P) * 1.0),
+                     ("tied weights", np.ones(P))):
+            w[0] += 1.0
+            tables = PatchSampler(hemisphere, w)
+            zones = tables._zone_prob.copy()
+            np.add.at(zones, tables._zone_alias, 1.0 - tables._zone_prob)
+            implied = tables._prob.copy()
+            np.add.at(implied, tables._alias, 1.0 - tables._prob)
+            implied *= zones[rings] / (numbers.size * numbers[rings])
+            self.assertTrue(
+                np.allclose(implied, w / np.sum(w), rtol=0.0, atol=1e-12),
+                msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                    f=f, seed=seed))
+
+        # Ties between the cumulative deficits and excesses are common with
+        # small integer weights, e.g. with scaled weights of exactly one.
+        sizes = np.random.randint(1, 8, 200)
+        offsets = np.append(0, np.cumsum(sizes))
+        for f, w, offsets in (("tied alias tables",
+                               np.array([1.0, 0.0, 2.0, 1.0,
+                                         1.0]), np.array([0, 5])),
+                              ("integer alias tables",
+                               np.random.randint(0, 3, offsets[-1]) * 1.0,
+                               offsets)):
+            prob, alias = _alias_tables(w, offsets)
+            implied = prob.copy()
+            np.add.at(implied, alias, 1.0 - prob)
+            segments = np.repeat(np.arange(offsets.size - 1), np.diff(offsets))
+            totals = np.bincount(segments, weights=w)
+            expected = np.where(totals[segments] > 0.0,
+                                w / np.maximum(totals[segments], 1.0),
+                                1.0 / np.diff(offsets)[segments])
+            self.assertTrue(
+                np.allclose(implied / np.diff(offsets)[segments],
+                            expected,
+                            rtol=0.0,
+                            atol=1e-12),
+                msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                    f=f, seed=seed))
+
+        # The densities integrate to one over the hemisphere.
+        densities = np.empty(P)
+        sampler.densities(densities, np.arange(P))
+        omega = 2.0 * np.pi * (np.cos(hemisphere._inner) -
+                               np.cos(hemisphere._outer)) / hemisphere._numbers
+        self.assertTrue(np.isclose(
+            np.sum(densities * np.repeat(omega, hemisphere._numbers)), 1.0),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="densities", seed=seed))
+
+        with self.assertRaises(ValueError):
+            sampler.update(np.arange(P), 0.0)
+        with self.assertRaises(ValueError):
+            sampler.update(np.array([0]), -1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
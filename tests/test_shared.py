@@ -0,0 +1,75 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+
+import concurrent.futures
+import pickle
+import unittest
+
+import numpy as np
+
+from spheal.disk import Disk
+from spheal.hemisphere import Hemisphere
+from spheal.shared import SharedTessellation
+
+
+def _locate(shared, theta, phi):
+    tessellation = shared.attach()
+    patches = np.empty(theta.size, dtype=np.int64)
+    tessellation.locate_patches(patches, theta, phi)
+    return patches
+
+
+class TestSharedTessellation(unittest.TestCase):
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        n_patches = np.random.randint(10, 10000)
+        for tessellation in (Disk(np.random.rand(), n_patches, 1.0),
+                             Hemisphere(np.random.rand(),
+                                        n_patches,
+                                        1.0,
+                                        dtype=np.float32)):
+            with SharedTessellation(tessellation, adjacency=True) as shared:
+                # The handle does not carry the arrays.
+                self.assertTrue(
+                    len(pickle.dumps(shared)) < 1024,
+                    msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                        f="size of the handle", seed=seed))
+
+                attached = pickle.loads(pickle.dumps(shared)).attach()
+                rings = ("annuli"
+                         if isinstance(tessellation, Disk) else "zones")
+                self.assertTrue(
+                    attached.patch_number == tessellation.patch_number and [
+                        (ring.extents, ring.patch_number)
+                        for ring in getattr(attached, rings)
+                    ] == [(ring.extents, ring.patch_number)
+                          for ring in getattr(tessellation, rings)] and all(
+                              np.array_equal(a, b) for a, b in zip(
+                                  attached.adjacency, tessellation.adjacency)),
+                    msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                        f="attached " + type(tessellation).__name__,
+                        seed=seed))
+
+                with self.assertRaises(ValueError):
+                    attached._numbers[0] = 0
+
+                theta = 0.5 * np.pi * np.random.rand(100)
+                phi = 2.0 * np.pi * np.random.rand(100)
+                expected = np.empty(100, dtype=np.int64)
+                tessellation.locate_patches(expected, theta, phi)
+                with concurrent.futures.ProcessPoolExecutor(1) as executor:
+                    patches = executor.submit(_locate, shared, theta,
+                                              phi).result()
+                self.assertTrue(
+                    np.array_equal(patches, expected),
+                    msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                        f="tessellation in a worker", seed=seed))
+                del attached
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -40,5 +40,74 @@ class TestParticleNumber(unittest.TestCase):
                         "RNG seed: {seed}.".format(seed=seed))
 
 
+class TestRadii(unittest.TestCase):
+    """
+    Test `radii` function.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        N = np.random.randint(100, 1000)
+        nshells = np.random.randint(3, 10)
+
+        profile = Exponential()
+        r = np.empty(nshells + 1)
+        numbers = np.empty(nshells, dtype=np.uint32)
+
+        # Equal split by default.
+        shell.radii(r, profile, N)
+        shell.particle_number(numbers, profile, N, r)
+        self.assertTrue(numbers.max() - numbers.min() <= 1
+                        and np.sum(numbers) == N,
+                        msg="equal-count shells not giving expected result. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+        numbers_expected = np.random.randint(1, N // nshells, nshells)
+        shell.radii(r, profile, N, numbers_expected)
+        shell.particle_number(numbers, profile, N, r)
+        self.assertTrue(np.array_equal(numbers, numbers_expected),
+                        msg="target-count shells not giving expected result. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+        with self.assertRaises(ValueError):
+            shell.radii(r, profile, N, np.full(nshells, N))
+
+
+class TestSpacedRadii(unittest.TestCase):
+    """
+    Test `spaced_radii` function.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        N = np.random.randint(10**5, 10**6)
+        spacing = 0.5 + np.random.rand()
+
+        r = shell.spaced_radii(Exponential(), N, spacing)
+
+        # Compare widths with the spacing at the middle of each shell, using
+        # the number density of the exponential profile.
+        midpoints = 0.5 * (r[1:] + r[:-1])
+        widths = r[:-1] - r[1:]
+        local_spacing = (N * np.exp(-2.0 * midpoints) / np.pi)**(-1.0 / 3.0)
+
+        self.assertTrue(np.all(np.diff(r) < 0.0) and r[-1] == 0.0,
+                        msg="spaced shells not in decreasing order. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+        inner = midpoints < Exponential().r90
+        self.assertTrue(np.allclose(widths[inner] / local_spacing[inner],
+                                    spacing,
+                                    rtol=0.05),
+                        msg="spaced shells not giving expected widths. "
+                        "RNG seed: {seed}.".format(seed=seed))
+
+
 if __name__ == "__main__":
     unittest.main()
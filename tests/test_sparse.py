@@ -0,0 +1,74 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+
+import unittest
+
+import numpy as np
+
+from spheal.sparse import CSRMatrix
+
+
+class TestCSRMatrix(unittest.TestCase):
+    """
+    Test `CSRMatrix` class.
+    """
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        shape = tuple(np.random.randint(1, 50, 2))
+        nnz = np.random.randint(0, 200)
+        rows = np.random.randint(0, shape[0], nnz)
+        columns = np.random.randint(0, shape[1], nnz)
+        data = np.random.randn(nnz)
+
+        dense = np.zeros(shape)
+        np.add.at(dense, (rows, columns), data)
+        matrix = CSRMatrix.from_coo(rows, columns, data, shape)
+
+        self.assertTrue(np.allclose(matrix.toarray(), dense),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="construction from entries", seed=seed))
+
+        for row in range(shape[0]):
+            entries = matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]]
+            self.assertTrue(
+                np.all(np.diff(entries) > 0),
+                msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                    f="order of columns", seed=seed))
+
+        x = np.random.randn(shape[1])
+        self.assertTrue(np.allclose(matrix @ x, dense @ x),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="product with a vector", seed=seed))
+
+        x = np.random.randn(shape[1], 3)
+        self.assertTrue(np.allclose(matrix @ x, dense @ x),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="product with a matrix", seed=seed))
+
+        self.assertTrue(np.allclose(matrix.T.toarray(), dense.T),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="transpose", seed=seed))
+
+        factors = np.random.randn(shape[0])
+        self.assertTrue(np.allclose(
+            matrix.scale_rows(factors).toarray(),
+            factors[:, np.newaxis] * dense),
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="scaling of rows", seed=seed))
+
+        for axis in (0, 1):
+            self.assertTrue(
+                np.allclose(matrix.sum(axis), dense.sum(axis)),
+                msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                    f="sum along axis " + str(axis), seed=seed))
+
+        with self.assertRaises(ValueError):
+            CSRMatrix(np.zeros(2, dtype=int), [], [], (3, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
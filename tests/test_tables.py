@@ -0,0 +1,53 @@
+# Distributed under the MIT License.
+# See LICENSE for details.
+
+import unittest
+
+import numpy as np
+
+from spheal import tables
+from spheal.annulus import Annulus
+from spheal.zone import Zone
+
+
+class TestTables(unittest.TestCase):
+
+    def test(self):
+
+        seed = np.random.randint(0, 1e6)
+        np.random.seed(seed)
+
+        n_patches = np.random.randint(1, 100)
+        phi = 2.0 * np.pi * np.arange(n_patches + 1) / n_patches
+        table = tables.boundary_table(n_patches)
+        self.assertTrue(np.allclose(table, (np.cos(phi), np.sin(phi)))
+                        and not table.flags.writeable,
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="boundary table", seed=seed))
+
+        # Rings with the same number of patches share their table.
+        zone = Zone((0.1, 0.2), n_patches)
+        annulus = Annulus((0.3, 0.4), np.int64(n_patches))
+        self.assertTrue(zone.patch_boundaries is table
+                        and annulus.patch_boundaries is table,
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="shared tables", seed=seed))
+
+        for n in range(1, tables.MAX_TABLES + 10):
+            tables.boundary_table(n)
+        self.assertTrue(
+            tables._boundary_table.cache_info().currsize == tables.MAX_TABLES,
+            msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                f="cache size", seed=seed))
+
+        tables.clear_tables()
+        self.assertTrue(tables._boundary_table.cache_info().currsize == 0,
+                        msg="\n\nwhen testing {f}.\nRNG seed: {seed}.".format(
+                            f="cleared cache", seed=seed))
+
+        with self.assertRaises(ValueError):
+            tables.boundary_table(0)
+
+
+if __name__ == "__main__":
+    unittest.main()